@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+지연 예산 기반 적응형 마이크로 배치 저장 (asyncio)
+- 레코드를 모아 크기(batch_size) 또는 마감(가장 오래된 레코드 대기 시간) 기준으로 플러시
+- 배치 크기 자동 조정: 쓰기 지연이 예산의 write_share 이하면 증가, 초과하면 절반으로 감소
+  (배치가 클수록 쓰기 효율은 높아지지만 지연이 늘어나므로 예산 안에서 가장 큰 배치를 찾음)
+- 마감 = 지연 예산 - 최근 쓰기 지연 (EWMA): 대기 + 쓰기가 예산을 넘지 않도록
+- 동시 쓰기 수 상한 (세마포어), 상한에 걸리면 add() 가 대기해 앞 단계로 역압 전달
+- 쓰기 함수는 동기 함수 (InfluxDB SYNCHRONOUS write_api 등), 기본 실행기 스레드에서 호출
+- 스풀(WriteAheadSpool) 지정 시 쓰기 실패 배치는 디스크에 기록하고 스풀 모드로 전환
+  스풀 모드에서는 새 배치도 저장소를 거치지 않고 스풀 뒤에 추가 (차량별 순서 보존, 장애 중 대기 없음)
+  스풀 사용 시 동시 쓰기는 1개로 제한 (실패 배치보다 뒤 배치가 먼저 기록되는 순서 역전 방지)
+  재생 태스크가 replay_rate (레코드/초) 이하로 적체를 저장소에 다시 쓰고, 비면 정상 모드로 복귀
+  재생 실패 시 retry_interval 부터 max_retry_interval 까지 지수 백오프
+- 오류 분류 (is_retryable): 연결 / 시간 초과 / HTTP 408·429·5xx 는 재시도, 그 외는 영구 오류
+  (HTTP 4xx 스키마 충돌, 레코드 필드 누락 KeyError 등: 재시도해도 같은 결과)
+  실시간 쓰기의 영구 오류는 스풀 모드로 전환하지 않고 바로 격리(dead letter), 스풀이 없으면 유실 집계
+  재생 중 영구 오류는 max_attempts 회 시도 후 격리하고 재생 위치를 넘김 (뒤 배치가 막히지 않음)
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from urllib3.exceptions import HTTPError as TransportError
+except ImportError:
+    TransportError = OSError
+
+from latency_metrics import LatencyHistogram
+
+# 재시도할 HTTP 상태 (그 밖의 상태 코드는 영구 오류)
+RETRYABLE_STATUS = (408, 429)
+
+
+def is_retryable(error):
+    """저장 오류 분류: 일시 장애(연결 / 시간 초과 / 408·429·5xx) 면 True"""
+    status = getattr(error, "status", None)
+    if isinstance(status, int) and status > 0:
+        return status in RETRYABLE_STATUS or status >= 500
+    return isinstance(error, (ConnectionError, TimeoutError, OSError, TransportError))
+
+
+class InfluxRecordWriter:
+    """레코드 dict 배치 -> 라인 프로토콜 -> InfluxDB 동기 쓰기 (스키마는 직렬화기 기준)"""
+
+    def __init__(self, write_api, bucket, org, serializer):
+        self.write_api = write_api
+        self.bucket = bucket
+        self.org = org
+        self.serializer = serializer
+
+    def __call__(self, records):
+        serializer = self.serializer
+        tag_keys = serializer.tag_keys
+        lines = [serializer.line_from_record([record.get(key) for key in tag_keys], record, record["timestamp"])
+                 for record in records]
+        self.write_api.write(bucket=self.bucket, org=self.org, record=lines)
+
+
+class AdaptiveBatchStore:
+    """적응형 배치 저장 단계"""
+
+    def __init__(self, write_fn, latency_budget=2.0, initial_batch=1000, min_batch=100, max_batch=50000,
+                 max_in_flight=2, write_share=0.5, increase=1.25, decrease=0.5, ewma_alpha=0.3,
+                 min_wait=0.01, spool=None, replay_rate=20000.0, retry_interval=1.0, max_retry_interval=30.0,
+                 max_attempts=3):
+        self.write_fn = write_fn
+        self.latency_budget = latency_budget
+        self.batch_size = initial_batch
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        # 스풀 사용 시 쓰기는 한 번에 1개: 동시 쓰기 중 앞 배치가 실패해 스풀로 가는 사이 뒤 배치가 먼저
+        # 기록되면 차량별 순서가 뒤집힘 (처리량은 배치 크기 조정으로 확보)
+        self.max_in_flight = 1 if spool is not None else max_in_flight
+        self.write_share = write_share
+        self.increase = increase
+        self.decrease = decrease
+        self.ewma_alpha = ewma_alpha
+        self.min_wait = min_wait
+        self.spool = spool
+        self.replay_rate = replay_rate
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.max_attempts = max_attempts
+
+        self.write_latency = None  # 쓰기 지연 EWMA (초)
+        self.last_error = None
+        self._buffer = []
+        # 버퍼 레코드의 도착 시각 (add 단위 [건수, monotonic]), 앞 항목 = 버퍼 첫 레코드
+        self._arrivals = deque()
+        self._semaphore = None
+        self._in_flight = set()
+        self._writing = 0
+        self._wakeup = None
+        self._timer_task = None
+        # 스풀 입출력은 단일 스레드 실행기 (제출 순서 = 기록 순서)
+        self._spool_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spool") if spool is not None else None
+        self._spooling = bool(spool is not None and spool.pending_records)
+        self._appending = 0
+        self._replay_wakeup = None
+        self._replay_task = None
+
+        # 레코드가 버퍼에 들어온 뒤 쓰기 완료까지 (레코드 건수 가중)
+        self.commit_latency = LatencyHistogram()
+        self.stats = {
+            "records": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "size_flushes": 0,
+            "deadline_flushes": 0,
+            "write_errors": 0,
+            "in_flight_waits": 0,
+            "peak_in_flight": 0,
+            "spooled": 0,
+            "replayed": 0,
+            "replay_errors": 0,
+            "recoveries": 0,
+            "dead_lettered": 0,
+        }
+
+    def max_wait(self):
+        """현재 마감: 예산에서 예상 쓰기 지연을 뺀 대기 허용 시간"""
+        expected = self.write_latency if self.write_latency is not None else 0.0
+        return max(self.latency_budget - expected, self.min_wait)
+
+    async def start(self):
+        """마감 타이머 시작 (실행 중인 이벤트 루프에서 호출)"""
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._wakeup = asyncio.Event()
+        self._timer_task = asyncio.create_task(self._deadline_timer())
+        if self.spool is not None:
+            self._replay_wakeup = asyncio.Event()
+            self._replay_task = asyncio.create_task(self._replay_loop())
+
+    async def add(self, records):
+        """레코드 배치 추가 (배치 크기 도달 시 플러시, 동시 쓰기 상한이면 대기)"""
+        if not records:
+            return
+        if self._timer_task is None:
+            await self.start()
+        if not self._buffer:
+            self._wakeup.set()
+        self._arrivals.append([len(records), time.monotonic()])
+        self._buffer.extend(records)
+        self.stats["records"] += len(records)
+        while len(self._buffer) >= self.batch_size:
+            self.stats["size_flushes"] += 1
+            await self._dispatch()
+
+    async def _deadline_timer(self):
+        """가장 오래된 레코드가 마감에 도달하면 플러시"""
+        while True:
+            if not self._buffer:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            remaining = self._arrivals[0][1] + self.max_wait() - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            self.stats["deadline_flushes"] += 1
+            await self._dispatch()
+
+    async def _dispatch(self):
+        """버퍼 앞부분(최대 batch_size) 을 쓰기 태스크로 분리"""
+        if self._semaphore.locked():
+            self.stats["in_flight_waits"] += 1
+        await self._semaphore.acquire()
+        if not self._buffer:
+            self._semaphore.release()
+            return
+        batch = self._buffer[:self.batch_size]
+        del self._buffer[:len(batch)]
+        oldest = self._take_arrivals(len(batch))
+        self._writing += 1
+        if self._writing > self.stats["peak_in_flight"]:
+            self.stats["peak_in_flight"] = self._writing
+        task = asyncio.create_task(self._write(batch, oldest))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    def _take_arrivals(self, count):
+        """버퍼 앞 count 건의 도착 기록 제거 -> 그중 가장 이른 도착 시각 (남은 레코드는 자기 도착 시각 유지)"""
+        arrivals = self._arrivals
+        oldest = arrivals[0][1]
+        while count > 0:
+            if arrivals[0][0] > count:
+                arrivals[0][0] -= count
+                break
+            count -= arrivals.popleft()[0]
+        return oldest
+
+    async def _write(self, batch, oldest):
+        """배치 1회 쓰기 + 지연 측정 + 배치 크기 조정 (스풀 모드 / 쓰기 실패 시 스풀에 기록)"""
+        try:
+            if self._spooling:
+                await self._spool(batch)
+                return
+            started = time.perf_counter()
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.write_fn, batch)
+            except Exception as e:
+                self.stats["write_errors"] += 1
+                self.last_error = str(e)
+                if self.spool is None:
+                    self.stats["failed"] += len(batch)
+                elif is_retryable(e):
+                    self._spooling = True
+                    await self._spool(batch)
+                else:
+                    await self._dead_letter(batch, e)
+                return
+            latency = time.perf_counter() - started
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+            self.commit_latency.record(time.monotonic() - oldest, len(batch))
+            self._adjust(latency, len(batch))
+        finally:
+            self._writing -= 1
+            self._semaphore.release()
+
+    async def _spool(self, batch):
+        """배치를 스풀 뒤에 추가 (디스크 기록까지 실패하면 유실로 집계)"""
+        self._appending += 1
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._spool_executor, self.spool.append, batch)
+            self.stats["spooled"] += len(batch)
+        except Exception as e:
+            self.stats["failed"] += len(batch)
+            self.last_error = f"스풀 기록 실패: {e}"
+        finally:
+            self._appending -= 1
+        self._replay_wakeup.set()
+
+    async def _dead_letter(self, batch, error, position=None):
+        """영구 오류 배치 격리 (position 지정 시 재생 위치도 넘김)"""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._spool_executor, self.spool.dead_letter, batch, error)
+            self.stats["dead_lettered"] += len(batch)
+        except Exception as e:
+            self.stats["failed"] += len(batch)
+            self.last_error = f"격리 기록 실패: {e}"
+        if position is not None:
+            await loop.run_in_executor(self._spool_executor, self.spool.commit, position)
+
+    async def _replay_loop(self):
+        """스풀 적체를 오래된 순으로 저장소에 재기록 (속도 제한 + 실패 시 백오프, 영구 오류는 격리)"""
+        loop = asyncio.get_running_loop()
+        delay = self.retry_interval
+        attempts = 0  # 현재 항목의 영구 오류 횟수
+        while True:
+            if not self._spooling:
+                self._replay_wakeup.clear()
+                await self._replay_wakeup.wait()
+                continue
+            entry = await loop.run_in_executor(self._spool_executor, self.spool.peek)
+            if entry is None:
+                # 추가 중인 배치가 없고 적체가 비었을 때만 정상 모드 복귀 (순서 역전 방지)
+                if self._appending == 0 and self.spool.pending_records == 0:
+                    self._spooling = False
+                    self.stats["recoveries"] += 1
+                else:
+                    await asyncio.sleep(self.min_wait)
+                continue
+            records, position = entry
+            started = time.perf_counter()
+            try:
+                await loop.run_in_executor(None, self.write_fn, records)
+            except Exception as e:
+                self.stats["replay_errors"] += 1
+                self.last_error = str(e)
+                if not is_retryable(e):
+                    # 복구 직후 일시적인 4xx 일 수 있어 몇 번은 재시도, 이후 격리하고 다음 항목으로
+                    attempts += 1
+                    if attempts >= self.max_attempts:
+                        attempts = 0
+                        await self._dead_letter(records, e, position)
+                        continue
+                    await asyncio.sleep(self.retry_interval)
+                    continue
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_interval)
+                continue
+            delay = self.retry_interval
+            attempts = 0
+            await loop.run_in_executor(self._spool_executor, self.spool.commit, position)
+            self.stats["replayed"] += len(records)
+            if self.replay_rate:
+                pause = len(records) / self.replay_rate - (time.perf_counter() - started)
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+    def _adjust(self, latency, size):
+        """쓰기 지연 EWMA 갱신 및 배치 크기 조정 (가득 찬 배치의 지연만 증가 판단에 사용)"""
+        if self.write_latency is None:
+            self.write_latency = latency
+        else:
+            self.write_latency += self.ewma_alpha * (latency - self.write_latency)
+        target = self.latency_budget * self.write_share
+        if self.write_latency > target:
+            self.batch_size = max(int(self.batch_size * self.decrease), self.min_batch)
+        elif size >= self.batch_size and self.write_latency < target * 0.7:
+            self.batch_size = min(int(self.batch_size * self.increase) + 1, self.max_batch)
+
+    async def close(self):
+        """남은 버퍼 플러시 후 진행 중인 쓰기 완료 대기 (스풀 적체는 디스크에 남겨 다음 실행에서 재생)"""
+        while self._buffer:
+            await self._dispatch()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+            self._timer_task = None
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            await asyncio.gather(self._replay_task, return_exceptions=True)
+            self._replay_task = None
+        if self.spool is not None:
+            await asyncio.get_running_loop().run_in_executor(self._spool_executor, self.spool.close)
+            self._spool_executor.shutdown()
+
+    def snapshot(self):
+        """배치 크기 / 쓰기 지연 / 처리량 / 커밋 지연 요약"""
+        stats = dict(self.stats)
+        stats["batch_size"] = self.batch_size
+        stats["write_latency"] = self.write_latency
+        stats["max_wait"] = self.max_wait()
+        stats["buffered"] = len(self._buffer)
+        stats["in_flight"] = self._writing
+        stats["commit_latency"] = self.commit_latency.snapshot()
+        if self.spool is not None:
+            stats["spooling"] = self._spooling
+            stats["spool"] = self.spool.snapshot()
+        return stats
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+배치 비동기 InfluxDB 전송기
+- 시뮬레이터 틱 경로에서는 버퍼에 적재만 수행 (마이크로초 단위)
+- 배치 크기 / 플러시 주기 기준 백그라운드 스레드 전송
+- 버퍼 상한 초과 시 생산자 대기 (backpressure), 시간 초과 또는 대기 중 종료(close) 시 폐기 집계
+- 처리량 / 지연시간 카운터 제공
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class BatchedInfluxWriter:
+    """시뮬레이터 공용 배치 전송기"""
+
+    def __init__(self, write_api, bucket, org, batch_size=5000, flush_interval=1.0,
+                 max_buffer=200000, block_timeout=5.0):
+        self.write_api = write_api
+        self.bucket = bucket
+        self.org = org
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.block_timeout = block_timeout
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+
+        # 카운터
+        self.stats = {
+            "points_enqueued": 0,
+            "points_written": 0,
+            "points_dropped": 0,
+            "batches_written": 0,
+            "write_errors": 0,
+            "backpressure_waits": 0,
+            "last_flush_latency": 0.0,
+            "max_flush_latency": 0.0,
+            "total_flush_latency": 0.0,
+        }
+        self._started_at = time.time()
+
+        self._thread = threading.Thread(target=self._run, name="influx-batch-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, records):
+        """레코드(단일 또는 리스트) 버퍼 적재 - 전송은 백그라운드에서 수행"""
+        if not isinstance(records, list):
+            records = [records]
+        if not records:
+            return 0
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchedInfluxWriter 가 이미 종료되었습니다")
+
+            # 버퍼 상한 초과 시 플러시될 때까지 대기
+            if len(self._buffer) + len(records) > self.max_buffer:
+                self.stats["backpressure_waits"] += 1
+                self._not_empty.notify()
+                deadline = time.monotonic() + self.block_timeout
+                while len(self._buffer) + len(records) > self.max_buffer and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["points_dropped"] += len(records)
+                        return 0
+                    self._not_full.wait(remaining)
+                # 대기 중 close(): 종료 후 적재하면 전송되지 않으므로 폐기로 집계
+                if self._closed:
+                    self.stats["points_dropped"] += len(records)
+                    return 0
+
+            self._buffer.extend(records)
+            self.stats["points_enqueued"] += len(records)
+            if len(self._buffer) >= self.batch_size:
+                self._not_empty.notify()
+        return len(records)
+
+    def _take_batch(self):
+        """버퍼에서 배치 하나 분리 (lock 보유 상태에서 호출)"""
+        count = min(self.batch_size, len(self._buffer))
+        batch = [self._buffer.popleft() for _ in range(count)]
+        self._not_full.notify_all()
+        return batch
+
+    def _run(self):
+        """백그라운드 플러시 루프"""
+        while True:
+            with self._lock:
+                if len(self._buffer) < self.batch_size and not self._closed:
+                    self._not_empty.wait(self.flush_interval)
+                if not self._buffer:
+                    if self._closed:
+                        return
+                    continue
+                batch = self._take_batch()
+            self._send(batch)
+
+    def _send(self, batch):
+        """배치 1회 전송 및 지연시간 기록"""
+        start = time.perf_counter()
+        try:
+            self.write_api.write(bucket=self.bucket, org=self.org, record=batch)
+        except Exception as e:
+            with self._lock:
+                self.stats["write_errors"] += 1
+                self.stats["points_dropped"] += len(batch)
+            print(f"⚠️ 배치 전송 오류 ({len(batch)}개): {e}")
+            return
+        latency = time.perf_counter() - start
+
+        # 카운터는 생산자 스레드와 같은 lock 으로 갱신
+        with self._lock:
+            self.stats["points_written"] += len(batch)
+            self.stats["batches_written"] += 1
+            self.stats["last_flush_latency"] = latency
+            self.stats["total_flush_latency"] += latency
+            self.stats["max_flush_latency"] = max(self.stats["max_flush_latency"], latency)
+
+    def pending(self):
+        """전송 대기 중인 레코드 수"""
+        return len(self._buffer)
+
+    def snapshot(self):
+        """처리량 / 지연시간 요약"""
+        elapsed = max(time.time() - self._started_at, 1e-9)
+        with self._lock:
+            stats = dict(self.stats)
+        batches = stats["batches_written"]
+        stats["pending"] = self.pending()
+        stats["throughput"] = stats["points_written"] / elapsed
+        stats["avg_flush_latency"] = stats["total_flush_latency"] / batches if batches else 0.0
+        return stats
+
+    def close(self, timeout=30.0):
+        """남은 버퍼 전송 후 종료"""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+벡터화 차량군 엔진 (Struct-of-Arrays)
+- 차량별 dict 리스트 대신 NumPy 배열로 차량군 상태 보관
+- 구간 제한속도 / 교통량 / 날씨 / 사고 구간 물리 규칙을 차량군 전체에 한 번에 적용
+- 단일 코어에서 틱당 10만 대 이상 처리 목표
+"""
+
+import zlib
+
+import numpy as np
+
+from road_index import RoadAttributeIndex
+
+
+class FleetState:
+    """차량군 상태 배열 (차량 1대 = 인덱스 1개)"""
+
+    def __init__(self, size):
+        self.size = size
+        self.vehicle_ids = []
+        self.highway_idx = np.zeros(size, dtype=np.int16)
+        self.type_idx = np.zeros(size, dtype=np.int16)
+        self.position_km = np.zeros(size, dtype=np.float64)
+        self.speed = np.zeros(size, dtype=np.float64)
+        self.direction = np.ones(size, dtype=np.int8)
+        self.cargo_weight = np.zeros(size, dtype=np.float64)
+        self.fuel_consumed = np.zeros(size, dtype=np.float64)
+        self.total_distance = np.zeros(size, dtype=np.float64)
+        self.start_time = np.zeros(size, dtype=np.float64)
+
+    def __len__(self):
+        return self.size
+
+    def select(self, mask):
+        """마스크에 해당하는 차량만 남긴 새 상태"""
+        keep = np.flatnonzero(mask)
+        state = FleetState(len(keep))
+        state.vehicle_ids = [self.vehicle_ids[i] for i in keep.tolist()]
+        for name in ("highway_idx", "type_idx", "position_km", "speed", "direction",
+                     "cargo_weight", "fuel_consumed", "total_distance", "start_time"):
+            setattr(state, name, getattr(self, name)[keep])
+        return state
+
+
+class VectorizedFleetEngine:
+    """고속도로 차량군 벡터화 물리 엔진"""
+
+    def __init__(self, highways, vehicle_types, weather_conditions, road_index=None, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.road_index = road_index if road_index is not None else RoadAttributeIndex(highways)
+
+        # 고속도로 테이블
+        self.highway_names = list(highways.keys())
+        self.highway_ids = [highways[name]["id"] for name in self.highway_names]
+        self.highway_length = np.array(
+            [highways[name]["total_distance"] for name in self.highway_names], dtype=np.float64
+        )
+
+        # 차량 유형 테이블 (유형 인덱스 -> 제원)
+        self.type_names = list(vehicle_types.keys())
+        self.type_tonnage = np.array([vehicle_types[t]["tonnage"] for t in self.type_names], dtype=np.float64)
+        self.type_max_speed = np.array([vehicle_types[t]["max_speed"] for t in self.type_names], dtype=np.float64)
+        self.type_fuel_efficiency = np.array(
+            [vehicle_types[t]["fuel_efficiency"] for t in self.type_names], dtype=np.float64
+        )
+        self.type_empty_weight = np.array(
+            [vehicle_types[t]["empty_weight"] for t in self.type_names], dtype=np.float64
+        )
+        self.type_co2_factor = np.array([vehicle_types[t]["co2_factor"] for t in self.type_names], dtype=np.float64)
+
+        # 날씨 테이블 (날씨 인덱스 -> 계수)
+        self.weather_names = list(weather_conditions.keys())
+        self.weather_speed_factor = np.array(
+            [weather_conditions[w]["speed_factor"] for w in self.weather_names], dtype=np.float64
+        )
+        self.weather_safety_penalty = np.array(
+            [weather_conditions[w]["safety_penalty"] for w in self.weather_names], dtype=np.float64
+        )
+
+        self.state = FleetState(0)
+
+    def spawn(self, counts, start_time=0.0):
+        """고속도로별 차량 수(dict: 고속도로명 -> 대수)만큼 차량군 생성"""
+        total = sum(counts.get(name, 0) for name in self.highway_names)
+        state = FleetState(total)
+        rng = self.rng
+
+        offset = 0
+        for h, name in enumerate(self.highway_names):
+            n = counts.get(name, 0)
+            if n == 0:
+                continue
+            end = offset + n
+            state.highway_idx[offset:end] = h
+            state.position_km[offset:end] = rng.uniform(0, self.highway_length[h], n)
+            state.vehicle_ids.extend(f"{self.highway_ids[h]}_vehicle_{i + 1}" for i in range(n))
+            offset = end
+
+        state.type_idx[:] = rng.integers(0, len(self.type_names), total)
+        state.speed[:] = rng.uniform(70, 90, total)
+        state.cargo_weight[:] = self.type_tonnage[state.type_idx] * rng.uniform(0.3, 0.9, total) * 1000
+        state.direction[:] = rng.choice(np.array([1, -1], dtype=np.int8), total)
+        state.start_time[:] = start_time
+
+        self.state = state
+        return state
+
+    def partition(self, shard_id, num_shards):
+        """차량 ID 해시 기준 분할 중 shard_id 에 해당하는 차량만 유지"""
+        owners = np.array([zlib.crc32(v.encode("utf-8")) % num_shards for v in self.state.vehicle_ids],
+                          dtype=np.int64)
+        self.state = self.state.select(owners == shard_id)
+        return self.state
+
+    def highway_counts(self):
+        """고속도로별 운행 차량 수"""
+        counts = np.bincount(self.state.highway_idx, minlength=len(self.highway_names))
+        return {name: int(counts[h]) for h, name in enumerate(self.highway_names) if counts[h]}
+
+    def section_names(self, section_ids):
+        """전역 구간 ID 배열 -> 구간명 리스트"""
+        return self.road_index.names_for(section_ids)
+
+    def step(self, traffic_factors, dt=1.0):
+        """차량군 전체 1틱 진행 (traffic_factors: 고속도로 인덱스별 교통량 계수 배열)"""
+        st = self.state
+        n = st.size
+        rng = self.rng
+
+        section_idx, base_speed_limit = self.road_index.lookup_sections(st.highway_idx, st.position_km)
+        weather_idx = rng.integers(0, len(self.weather_names), n)
+
+        # 제한속도와 교통량 고려
+        traffic_factor = np.asarray(traffic_factors, dtype=np.float64)[st.highway_idx]
+        effective_speed_limit = base_speed_limit * traffic_factor * self.weather_speed_factor[weather_idx]
+
+        # 목표 속도 설정
+        target_speed = np.minimum(effective_speed_limit, self.type_max_speed[st.type_idx])
+
+        # 사고 다발 지역에서는 속도 감소
+        in_accident_zone = self.road_index.accident_zone_mask(st.highway_idx, st.position_km)
+        target_speed = np.where(in_accident_zone, target_speed * 0.8, target_speed)
+
+        # 속도 조정
+        acceleration = np.clip((target_speed - st.speed) * 0.3, -3.0, 2.0)
+        np.maximum(st.speed + acceleration * dt, 0, out=st.speed)
+
+        # 위치 업데이트
+        st.position_km += (st.speed / 3600) * dt * st.direction
+
+        # 경계 처리
+        length = self.highway_length[st.highway_idx]
+        past_end = st.position_km >= length
+        past_start = ~past_end & (st.position_km <= 0)
+        st.position_km[past_end] = length[past_end] - 1
+        st.direction[past_end] = -1
+        st.position_km[past_start] = 1
+        st.direction[past_start] = 1
+
+        # 연료 소비 계산
+        tonnage = self.type_tonnage[st.type_idx]
+        load_factor = st.cargo_weight / (tonnage * 1000)
+        fuel_efficiency = self.type_fuel_efficiency[st.type_idx] * (1 - load_factor * 0.2)
+        safe_efficiency = np.where(fuel_efficiency > 0, fuel_efficiency, 1.0)
+        fuel_rate = np.where(fuel_efficiency > 0, st.speed / safe_efficiency, 0.0)
+        st.fuel_consumed += (fuel_rate / 3600) * dt
+
+        # CO2 배출량
+        co2_emission = (fuel_rate / 3600) * self.type_co2_factor[st.type_idx] * 60
+
+        # 안전 점수 계산
+        safety_score = np.full(n, 100.0)
+        safety_score -= np.where(st.speed > base_speed_limit, 20, 0)
+        safety_score -= np.where(np.abs(acceleration) > 2.5, 10, 0)
+        safety_score -= self.weather_safety_penalty[weather_idx]
+        np.maximum(safety_score, 0, out=safety_score)
+
+        return {
+            "acceleration": acceleration,
+            "fuel_rate": fuel_rate,
+            "fuel_efficiency": fuel_efficiency,
+            "co2_emission": co2_emission,
+            "safety_score": safety_score,
+            "weather_idx": weather_idx,
+            "section_idx": section_idx,
+            "traffic_factor": traffic_factor,
+            "total_weight": self.type_empty_weight[st.type_idx] + st.cargo_weight,
+        }
+
+
+def classify_urgency(safety_score):
+    """안전 점수 배열 -> 긴급도 수준 배열"""
+    return np.select(
+        [safety_score < 60, safety_score < 75, safety_score < 85],
+        ["CRITICAL", "HIGH", "MEDIUM"],
+        default="NORMAL",
+    )
@@ -7,16 +7,23 @@
 import time
 import random
 import math
+import argparse
 import numpy as np
 from datetime import datetime, timezone
-from influxdb_client import InfluxDBClient, Point, WritePrecision
-from influxdb_client.client.write_api import SYNCHRONOUS
+
+from fleet_engine import VectorizedFleetEngine, classify_urgency
+from line_protocol import LineProtocolSerializer
+from output_sinks import RecordBatch, add_sink_arguments, create_sink
+from road_index import RoadAttributeIndex
+from sim_clock import WallClock, add_clock_arguments, make_clock
+from tick_scheduler import TickScheduler
 
 # InfluxDB 설정
 INFLUXDB_URL = "http://localhost:8086"
 INFLUXDB_TOKEN = "glec-admin-token-123456789"
 INFLUXDB_ORG = "glec"
 INFLUXDB_BUCKET = "dtg_metrics"
+INFLUXDB_CONFIG = {"url": INFLUXDB_URL, "token": INFLUXDB_TOKEN, "org": INFLUXDB_ORG, "bucket": INFLUXDB_BUCKET}
 
 # 고속도로별 구간 데이터
 HIGHWAYS = {
@@ -100,6 +107,18 @@ HIGHWAYS = {
     }
 }
 
+# 구간 / 사고 다발 지역 조회 인덱스 (시작 시 1회 구축)
+ROAD_INDEX = RoadAttributeIndex(HIGHWAYS)
+
+# dtg_metrics 라인 프로토콜 스키마
+DTG_METRICS_SERIALIZER = LineProtocolSerializer(
+    "dtg_metrics",
+    tag_keys=["vehicle_id", "vehicle_type", "highway", "highway_id", "section", "weather", "urgency_level"],
+    field_keys=["vehicle_speed", "position_km", "acceleration", "fuel_rate", "fuel_efficiency_kmpl",
+                "co2_emission", "safety_score", "cargo_weight", "traffic_factor", "total_weight"],
+    significant_digits=10
+)
+
 # 차량 유형
 VEHICLE_TYPES = {
     "대형트럭": {
@@ -142,85 +161,72 @@ WEATHER_CONDITIONS = {
 }
 
 class HighwaySimulator:
-    def __init__(self):
+    def __init__(self, highway_names=None, clock=None, seed=None, sink=None):
         print("🚛 고속도로별 시뮬레이터 초기화...")
         
-        # InfluxDB 클라이언트
-        self.influx_client = InfluxDBClient(
-            url=INFLUXDB_URL,
-            token=INFLUXDB_TOKEN,
-            org=INFLUXDB_ORG
-        )
-        self.write_api = self.influx_client.write_api(write_options=SYNCHRONOUS)
+        # 시계 (기본: 실제 시간) 및 난수원 (같은 시드 = 같은 출력)
+        self.clock = clock if clock is not None else WallClock()
+        self.seed = seed
+        self.random = random.Random(seed)
+        
+        # 담당 고속도로 (기본: 전체, 샤드 모드에서는 일부)
+        if highway_names is None:
+            self.highways = HIGHWAYS
+            road_index = ROAD_INDEX
+        else:
+            self.highways = {name: HIGHWAYS[name] for name in highway_names}
+            road_index = RoadAttributeIndex(self.highways)
+        
+        # 출력 싱크 (기본: InfluxDB 배치 비동기 전송)
+        self.sink = sink if sink is not None else create_sink("influx", influx=INFLUXDB_CONFIG)
         
         self.is_running = False
-        self.simulation_vehicles = []
+        self.scheduler = None
+        
+        # 차량군 상태는 배열(Struct-of-Arrays)로 보관
+        self.fleet_engine = VectorizedFleetEngine(self.highways, VEHICLE_TYPES, WEATHER_CONDITIONS,
+                                                  road_index=road_index, rng=np.random.default_rng(seed))
+        self.static_tags = None
         
         print("✅ 초기화 완료")
     
-    def initialize_vehicles(self):
-        """각 고속도로에 차량 배치"""
-        self.simulation_vehicles = []
+    def initialize_vehicles(self, vehicles_per_highway=None, partition=None):
+        """각 고속도로에 차량 배치 (기본: 고속도로당 10-20대, partition=(샤드 번호, 샤드 수))"""
+        counts = {
+            highway_name: vehicles_per_highway or self.random.randint(10, 20)
+            for highway_name in self.highways
+        }
+        engine = self.fleet_engine
+        fleet = engine.spawn(counts, start_time=self.clock.now().timestamp())
+        if partition is not None:
+            fleet = engine.partition(*partition)
+            # 샤드마다 독립적이면서 재현 가능한 틱 난수열
+            if self.seed is not None:
+                engine.rng = np.random.default_rng([self.seed, partition[0]])
         
-        for highway_name, highway_data in HIGHWAYS.items():
-            # 고속도로당 10-20대 차량 생성
-            num_vehicles = random.randint(10, 20)
-            
-            for i in range(num_vehicles):
-                vehicle_type = random.choice(list(VEHICLE_TYPES.keys()))
-                vehicle_spec = VEHICLE_TYPES[vehicle_type]
-                
-                # 차량 초기 위치 랜덤 설정
-                initial_position = random.uniform(0, highway_data["total_distance"])
-                
-                vehicle = {
-                    "id": f"{highway_data['id']}_vehicle_{i+1}",
-                    "highway": highway_name,
-                    "highway_id": highway_data["id"],
-                    "type": vehicle_type,
-                    "spec": vehicle_spec,
-                    "position_km": initial_position,
-                    "speed": random.uniform(70, 90),
-                    "cargo_weight": vehicle_spec["tonnage"] * random.uniform(0.3, 0.9) * 1000,
-                    "fuel_consumed": 0,
-                    "total_distance": 0,
-                    "start_time": time.time(),
-                    "direction": random.choice([1, -1])  # 1: 정방향, -1: 역방향
-                }
-                
-                self.simulation_vehicles.append(vehicle)
+        # 틱마다 변하지 않는 태그 값
+        self.static_tags = (
+            [engine.type_names[t] for t in fleet.type_idx.tolist()],
+            [engine.highway_names[h] for h in fleet.highway_idx.tolist()],
+            [engine.highway_ids[h] for h in fleet.highway_idx.tolist()],
+        )
         
-        print(f"✅ {len(self.simulation_vehicles)}대 차량 생성 완료")
+        print(f"✅ {len(fleet)}대 차량 생성 완료")
     
     def get_current_section(self, highway_name, position_km):
         """현재 위치의 구간 정보 반환"""
-        highway = HIGHWAYS[highway_name]
-        
-        for section in highway["sections"]:
-            if section["start_km"] <= position_km <= section["end_km"]:
-                return section
-        
-        # 범위 벗어난 경우 첫/마지막 구간 반환
-        if position_km < 0:
-            return highway["sections"][0]
-        else:
-            return highway["sections"][-1]
+        return ROAD_INDEX.section(highway_name, position_km)
     
     def is_in_accident_zone(self, highway_name, position_km):
         """사고 다발 지역 여부 확인"""
-        highway = HIGHWAYS[highway_name]
-        
-        for zone_start, zone_end in highway.get("accident_zones", []):
-            if zone_start <= position_km <= zone_end:
-                return True
-        return False
+        return ROAD_INDEX.in_accident_zone(highway_name, position_km)
     
     def get_traffic_factor(self, highway_name):
         """현재 시간대의 교통량 계수"""
         highway = HIGHWAYS[highway_name]
         patterns = highway.get("traffic_patterns", {})
         
-        current_hour = datetime.now().hour
+        current_hour = self.clock.local_now().hour
         current_time = f"{current_hour:02d}:00"
         
         # 시간대별 패턴 확인
@@ -236,143 +242,77 @@ class HighwaySimulator:
         
         return patterns.get("normal", {}).get("default", 0.9)
     
-    def calculate_vehicle_physics(self, vehicle, dt=1.0):
-        """차량 물리 계산"""
-        current_section = self.get_current_section(vehicle["highway"], vehicle["position_km"])
-        weather = random.choice(list(WEATHER_CONDITIONS.keys()))
-        weather_data = WEATHER_CONDITIONS[weather]
+    def get_traffic_factors(self):
+        """고속도로 인덱스 순서의 교통량 계수 배열"""
+        return np.array([self.get_traffic_factor(name) for name in self.fleet_engine.highway_names])
+    
+    def simulate_tick(self, current_time, dt=1.0):
+        """차량군 1틱 진행 후 전송 버퍼 적재, 적재된 레코드 수 반환"""
+        engine = self.fleet_engine
+        fleet = engine.state
+        type_tags, highway_tags, highway_id_tags = self.static_tags
         
-        # 제한속도와 교통량 고려
-        traffic_factor = self.get_traffic_factor(vehicle["highway"])
-        base_speed_limit = current_section["speed_limit"]
-        effective_speed_limit = base_speed_limit * traffic_factor * weather_data["speed_factor"]
+        # 차량군 전체 물리 계산 (벡터화)
+        physics = engine.step(self.get_traffic_factors(), dt)
+        urgency = classify_urgency(physics["safety_score"])
+        section_names = engine.section_names(physics["section_idx"])
+        weather_tags = [engine.weather_names[w] for w in physics["weather_idx"].tolist()]
         
-        # 목표 속도 설정
-        target_speed = min(
-            effective_speed_limit,
-            vehicle["spec"]["max_speed"]
+        # 컬럼형 배치로 싱크에 전달 (직렬화 방식은 싱크가 결정)
+        batch = RecordBatch(
+            DTG_METRICS_SERIALIZER,
+            [fleet.vehicle_ids, type_tags, highway_tags, highway_id_tags,
+             section_names, weather_tags, urgency.tolist()],
+            [fleet.speed, fleet.position_km, physics["acceleration"], physics["fuel_rate"],
+             physics["fuel_efficiency"], physics["co2_emission"], physics["safety_score"],
+             fleet.cargo_weight, physics["traffic_factor"], physics["total_weight"]],
+            current_time
         )
+        return self.sink.write(batch)
+    
+    def print_status(self):
+        """시뮬레이션 상태 출력"""
+        print(f"\n📊 시뮬레이션 상태 ({datetime.now().strftime('%H:%M:%S')})")
         
-        # 사고 다발 지역에서는 속도 감소
-        if self.is_in_accident_zone(vehicle["highway"], vehicle["position_km"]):
-            target_speed *= 0.8
-        
-        # 속도 조정
-        speed_diff = target_speed - vehicle["speed"]
-        acceleration = np.clip(speed_diff * 0.3, -3.0, 2.0)
-        vehicle["speed"] = max(0, vehicle["speed"] + acceleration * dt)
-        
-        # 위치 업데이트
-        distance_delta = (vehicle["speed"] / 3600) * dt * vehicle["direction"]
-        vehicle["position_km"] += distance_delta
-        
-        # 경계 처리
-        highway = HIGHWAYS[vehicle["highway"]]
-        if vehicle["position_km"] >= highway["total_distance"]:
-            vehicle["position_km"] = highway["total_distance"] - 1
-            vehicle["direction"] = -1
-        elif vehicle["position_km"] <= 0:
-            vehicle["position_km"] = 1
-            vehicle["direction"] = 1
-        
-        # 연료 소비 계산
-        load_factor = vehicle["cargo_weight"] / (vehicle["spec"]["tonnage"] * 1000)
-        fuel_efficiency = vehicle["spec"]["fuel_efficiency"] * (1 - load_factor * 0.2)
-        fuel_rate = vehicle["speed"] / fuel_efficiency if fuel_efficiency > 0 else 0
-        vehicle["fuel_consumed"] += (fuel_rate / 3600) * dt
-        
-        # CO2 배출량
-        co2_emission = (fuel_rate / 3600) * vehicle["spec"]["co2_factor"] * 60
+        # 고속도로별 차량 수 집계
+        for highway, count in self.fleet_engine.highway_counts().items():
+            print(f"  {highway}: {count}대 운행 중")
         
-        # 안전 점수 계산
-        safety_score = 100
-        if vehicle["speed"] > base_speed_limit:
-            safety_score -= 20
-        if abs(acceleration) > 2.5:
-            safety_score -= 10
-        safety_score -= weather_data["safety_penalty"]
-        safety_score = max(0, safety_score)
+        stats = self.sink.snapshot()
+        print(f"  [{stats['sink']}] 전송: {stats['points_written']}개 | 대기: {stats['pending']}개 | "
+              f"평균 배치 지연: {stats['avg_flush_latency'] * 1000:.1f}ms | "
+              f"폐기: {stats['points_dropped']}개")
         
-        return {
-            "acceleration": acceleration,
-            "fuel_rate": fuel_rate,
-            "fuel_efficiency": fuel_efficiency,
-            "co2_emission": co2_emission,
-            "safety_score": safety_score,
-            "weather": weather,
-            "section_name": current_section["name"],
-            "traffic_factor": traffic_factor
-        }
+        if self.scheduler is not None:
+            ticks = self.scheduler.snapshot()
+            print(f"  틱: {ticks['ticks']}회 | 마감 초과: {ticks['overruns']}회 | "
+                  f"건너뛴 틱: {ticks['skipped_ticks']}회 | 최대 지연: {ticks['max_lateness'] * 1000:.1f}ms")
     
-    def run_simulation(self):
-        """시뮬레이션 실행"""
+    def run_simulation(self, vehicles_per_highway=None, tick_rate=1.0):
+        """시뮬레이션 실행 (tick_rate: 초당 틱 수)"""
         print("\n🚀 고속도로별 시뮬레이션 시작...")
         
         # 차량 초기화
-        self.initialize_vehicles()
+        self.initialize_vehicles(vehicles_per_highway)
+        
+        # 절대 마감 시각 기준 틱 (처리 시간이 주기에 누적되지 않음)
+        self.scheduler = TickScheduler.from_rate(tick_rate, clock=self.clock)
+        status_every = max(1, round(10 * tick_rate))
         
         self.is_running = True
         iteration = 0
+        self.scheduler.start()
         
         while self.is_running:
             try:
-                current_time = datetime.now(timezone.utc)
-                
-                # 모든 차량 업데이트
-                for vehicle in self.simulation_vehicles:
-                    # 물리 계산
-                    physics = self.calculate_vehicle_physics(vehicle)
-                    
-                    # 긴급도 수준 계산
-                    if physics["safety_score"] < 60:
-                        urgency = "CRITICAL"
-                    elif physics["safety_score"] < 75:
-                        urgency = "HIGH"
-                    elif physics["safety_score"] < 85:
-                        urgency = "MEDIUM"
-                    else:
-                        urgency = "NORMAL"
-                    
-                    # InfluxDB로 데이터 전송
-                    point = Point("dtg_metrics") \
-                        .tag("vehicle_id", vehicle["id"]) \
-                        .tag("vehicle_type", vehicle["type"]) \
-                        .tag("highway", vehicle["highway"]) \
-                        .tag("highway_id", vehicle["highway_id"]) \
-                        .tag("section", physics["section_name"]) \
-                        .tag("weather", physics["weather"]) \
-                        .tag("urgency_level", urgency) \
-                        .field("vehicle_speed", float(vehicle["speed"])) \
-                        .field("position_km", float(vehicle["position_km"])) \
-                        .field("acceleration", float(physics["acceleration"])) \
-                        .field("fuel_rate", float(physics["fuel_rate"])) \
-                        .field("fuel_efficiency_kmpl", float(physics["fuel_efficiency"])) \
-                        .field("co2_emission", float(physics["co2_emission"])) \
-                        .field("safety_score", float(physics["safety_score"])) \
-                        .field("cargo_weight", float(vehicle["cargo_weight"])) \
-                        .field("traffic_factor", float(physics["traffic_factor"])) \
-                        .field("total_weight", float(vehicle["spec"]["empty_weight"] + vehicle["cargo_weight"])) \
-                        .time(current_time, WritePrecision.NS)
-                    
-                    self.write_api.write(INFLUXDB_BUCKET, INFLUXDB_ORG, point)
+                self.simulate_tick(self.clock.now(), dt=self.scheduler.period)
                 
                 # 상태 출력 (10초마다)
-                if iteration % 10 == 0:
-                    print(f"\n📊 시뮬레이션 상태 ({datetime.now().strftime('%H:%M:%S')})")
-                    
-                    # 고속도로별 차량 수 집계
-                    highway_counts = {}
-                    for vehicle in self.simulation_vehicles:
-                        highway = vehicle["highway"]
-                        if highway not in highway_counts:
-                            highway_counts[highway] = 0
-                        highway_counts[highway] += 1
-                    
-                    for highway, count in highway_counts.items():
-                        print(f"  {highway}: {count}대 운행 중")
+                if iteration % status_every == 0:
+                    self.print_status()
                 
                 iteration += 1
-                time.sleep(1)
+                self.scheduler.wait()
                 
             except KeyboardInterrupt:
                 print("\n\n⚠️ 사용자 중단")
@@ -386,16 +326,34 @@ class HighwaySimulator:
     def stop(self):
         """시뮬레이터 정지"""
         self.is_running = False
-        self.influx_client.close()
+        self.sink.close()
         print("🛑 시뮬레이터 정지")
 
 
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="한국 고속도로별 DTG 시뮬레이터")
+    parser.add_argument("--vehicles-per-highway", type=int, default=None,
+                        help="고속도로당 차량 수 (기본: 10-20대 랜덤)")
+    add_clock_arguments(parser)
+    add_sink_arguments(parser)
+    return parser.parse_args()
+
+
+def build_sink(args, prefix="highway"):
+    """명령행 옵션 -> 출력 싱크"""
+    return create_sink(args.sink, influx=INFLUXDB_CONFIG, output_dir=args.output_dir, prefix=prefix,
+                       rotate_mb=args.rotate_mb, compress=args.compress)
+
+
 def main():
     """메인 실행 함수"""
-    simulator = HighwaySimulator()
+    args = parse_args()
+    simulator = HighwaySimulator(clock=make_clock(args.speed, args.start), seed=args.seed,
+                                 sink=build_sink(args))
     
     try:
-        simulator.run_simulation()
+        simulator.run_simulation(args.vehicles_per_highway, args.tick_rate)
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
         simulator.stop()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+지연시간 지표
+- HDR 방식 로그-선형 히스토그램: 2의 거듭제곱 구간마다 선형 하위 구간 (상대 오차 ~1%)
+  기록은 정수 연산 + 리스트 증가 1회, 메모리는 범위와 무관하게 수천 칸 고정
+- SLO 추적: 목표 지연 이내 비율 (objective) 대비 오류 예산 소진율 (burn rate) 을 여러 시간 창으로 계산
+"""
+
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+SNAPSHOT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """로그-선형 버킷 지연시간 히스토그램 (초 단위 기록)"""
+
+    def __init__(self, lowest=1e-6, highest=60.0, significant_digits=2):
+        self.unit = lowest
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.max_units = max(int(highest / lowest), self.sub_bucket_count)
+        # 기록 경로는 파이썬 리스트 증가 (NumPy 스칼라 증가보다 수 배 빠름), 요약 시에만 배열 변환
+        self.counts = [0] * (self._index(self.max_units) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, units):
+        """정수 단위값 -> 버킷 번호"""
+        if units < self.sub_bucket_count:
+            return units
+        shift = units.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (units >> shift) - self.half_count
+
+    def _bucket_value(self, index):
+        """버킷 번호 -> 구간 중간값 (초)"""
+        if index < self.sub_bucket_count:
+            return (index + 0.5) * self.unit
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        sub = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return ((sub << shift) + (1 << (shift - 1))) * self.unit
+
+    def record(self, value, count=1):
+        """지연 1건 (또는 같은 값 count 건) 기록, 범위 밖 값은 양끝 버킷에 포함"""
+        units = min(max(int(value / self.unit), 0), self.max_units)
+        self.counts[self._index(units)] += count
+        self.total += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def _percentile(self, q, cumulative):
+        rank = max(math.ceil(q / 100.0 * self.total), 1)
+        index = int(np.searchsorted(cumulative, rank))
+        return min(self._bucket_value(index), self.max)
+
+    def percentile(self, q):
+        """q 백분위 지연 (초), 기록이 없으면 0"""
+        if not self.total:
+            return 0.0
+        return self._percentile(q, np.cumsum(self.counts))
+
+    def merge(self, other):
+        """같은 설정의 히스토그램 합산"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def snapshot(self):
+        """건수 / 평균 / 최소 / 최대 / 주요 백분위 요약"""
+        if not self.total:
+            return {"count": 0}
+        cumulative = np.cumsum(self.counts)
+        stats = {"count": self.total, "mean": self.sum / self.total, "min": self.min, "max": self.max}
+        for q in SNAPSHOT_PERCENTILES:
+            stats[f"p{q:g}"] = self._percentile(q, cumulative)
+        return stats
+
+
+class SLOTracker:
+    """지연 SLO: target 초 이내 처리 비율 목표 대비 오류 예산 소진율
+
+    burn rate 1.0 = 창 전체 기간 동안 오류 예산을 정확히 다 쓰는 속도, 14.4 이상(1시간 창)이면 긴급
+    """
+
+    def __init__(self, target=5.0, objective=0.99, windows=(60, 300, 3600)):
+        self.target = target
+        self.objective = objective
+        self.windows = tuple(sorted(windows))
+        # 초 단위 버킷: [초, 전체 건수, 목표 초과 건수]
+        self._buckets = deque()
+        self.total = 0
+        self.violations = 0
+
+    def record(self, latency, count=1, now=None):
+        """지연 기록 (count 건이 같은 지연)"""
+        second = int(time.time() if now is None else now)
+        buckets = self._buckets
+        if not buckets or buckets[-1][0] != second:
+            buckets.append([second, 0, 0])
+            horizon = second - self.windows[-1]
+            while buckets[0][0] <= horizon:
+                buckets.popleft()
+        bucket = buckets[-1]
+        bucket[1] += count
+        self.total += count
+        if latency > self.target:
+            bucket[2] += count
+            self.violations += count
+
+    def burn_rate(self, window, now=None):
+        """최근 window 초의 오류 예산 소진율"""
+        horizon = int(time.time() if now is None else now) - window
+        total = bad = 0
+        for second, count, violations in reversed(self._buckets):
+            if second <= horizon:
+                break
+            total += count
+            bad += violations
+        if not total:
+            return 0.0
+        return (bad / total) / (1.0 - self.objective)
+
+    def snapshot(self, now=None):
+        """목표 / 누적 준수율 / 창별 소진율"""
+        compliance = 1.0 - self.violations / self.total if self.total else 1.0
+        return {
+            "target": self.target,
+            "objective": self.objective,
+            "total": self.total,
+            "violations": self.violations,
+            "compliance": compliance,
+            "burn_rates": {f"{window}s": self.burn_rate(window, now) for window in self.windows},
+        }
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+InfluxDB 라인 프로토콜 직렬화기
+- 태그/필드 구성을 미리 컴파일하여 Point 객체 생성 없이 라인 프로토콜 직접 생성
+- NumPy 배열 배치 단위 직렬화 지원
+  significant_digits <= 10 이면 태그 / 필드 / 타임스탬프를 컬럼 단위로 바이트 행렬에 조립 (값별 문자열 포맷 없음)
+  결과는 행 단위 '%.Ng' 포맷과 같음: 지수 표기가 필요한 값 (|x| < 1e-4, |x| >= 10**N) / NaN / Inf,
+  반올림 경계 (가수 소수부가 0.5 에 근접해 float 곱셈 오차로 결과가 갈릴 수 있는 값) 가 있는 행만 행 단위 포맷
+- 측정값 이름 / 태그 / 필드 키의 줄바꿈은 백슬래시 + n 으로 이스케이프 (라인 구분자가 값 안에 들어가지 않도록)
+- gzip 압축 페이로드 지원
+"""
+
+import gzip
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# 벡터화 숫자 포맷: 0000 ~ 9999 -> ASCII 4바이트 (uint32 1개로 한 번에 조회), 4자리 단위 끝 0 개수
+_DIGIT_WORDS = np.array([int.from_bytes(b"%04d" % i, "little") for i in range(10000)], dtype="<u4")
+_TRAILING_ZEROS = np.array([len(b"%04d" % i) - len((b"%04d" % i).rstrip(b"0")) for i in range(10000)], dtype=np.int64)
+_FAST_MAX_DIGITS = 10
+_POWER_OFFSET = 20
+_POWERS = 10.0 ** np.arange(-_POWER_OFFSET, _POWER_OFFSET + 1)
+_INT_POWERS = 10 ** np.arange(19, dtype=np.int64)
+_SPACE = np.frombuffer(b" ", dtype=np.uint8)
+_NEWLINE = np.frombuffer(b"\n", dtype=np.uint8)
+_CHUNK_ROWS = 4096
+_TIE_TOLERANCE = 2.0 ** -48
+_KEEP_TABLES = {}
+
+
+def escape_measurement(name):
+    """측정값 이름 이스케이프 (쉼표, 공백, 줄바꿈)"""
+    return name.replace("\\", "\\\\").replace(",", "\\,").replace(" ", "\\ ").replace("\n", "\\n")
+
+
+def escape_key(value):
+    """태그 키/값, 필드 키 이스케이프 (쉼표, 등호, 공백, 줄바꿈)"""
+    return (str(value).replace("\\", "\\\\").replace(",", "\\,")
+            .replace("=", "\\=").replace(" ", "\\ ").replace("\n", "\\n"))
+
+
+def to_timestamp_ns(value):
+    """datetime / 초 단위 float -> 나노초 정수"""
+    if isinstance(value, datetime):
+        delta = value - _EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+    if isinstance(value, float):
+        return int(round(value * 1_000_000_000))
+    return int(value)
+
+
+def _digit_words(numbers, count):
+    """음이 아닌 int64 -> 4자리 단위 정수 (행, count), 앞자리부터"""
+    words = np.empty((numbers.shape[0], count), dtype=np.int64)
+    rest = numbers
+    for j in range(count - 1, -1, -1):
+        rest, words[:, j] = np.divmod(rest, 10000)
+    return words
+
+
+def _keep_table(width):
+    """[시작, 끝) 열 마스크 조회표 (시작, 끝, 열)"""
+    table = _KEEP_TABLES.get(width)
+    if table is None:
+        bounds = np.arange(width + 1)
+        columns = np.arange(width)
+        table = _KEEP_TABLES[width] = ((columns >= bounds[:, None, None]) & (columns < bounds[None, :, None]))
+    return table
+
+
+def fixed_digits(values, precision):
+    """'%.{precision}g' 의 고정 소수점 표기를 컬럼 단위로 생성
+
+    반환: (ASCII 행렬, 출력 마스크, 사용 가능 여부), 행 i 의 문자열 = 행렬[i][마스크[i]]
+    행렬 폭은 컬럼의 최대 정수부 / 소수부 자리 수에 맞춤 ([부호][정수부][.][소수부])
+    지수 표기가 필요한 값 (|x| < 1e-4, 반올림 후 |x| >= 10**precision) 과 NaN / Inf 는 사용 불가 (호출 측에서 % 포맷)
+    반올림 경계 값도 사용 불가: 확대한 가수의 소수부가 0.5 에서 몇 ulp 이내면 np.rint (곱셈 오차 + 짝수 반올림) 가
+    '%g' 의 정확한 십진 반올림과 다를 수 있음
+    """
+    magnitude = np.abs(values)
+    nonzero = magnitude > 0
+    with np.errstate(invalid="ignore"):
+        ok = np.isfinite(magnitude) & (~nonzero | ((magnitude >= 1e-4) & (magnitude < 10.0 ** precision)))
+    nonzero &= ok
+    safe = np.where(nonzero, magnitude, 1.0)
+    exponent = np.floor(np.log10(safe)).astype(np.int64)
+    # log10 반올림 오차 보정 (10 의 거듭제곱 경계)
+    exponent -= safe < _POWERS[exponent + _POWER_OFFSET]
+    exponent += safe >= _POWERS[exponent + 1 + _POWER_OFFSET]
+    decimals = np.where(nonzero, precision - 1 - exponent, 0)
+    scaled = safe * _POWERS[decimals + _POWER_OFFSET]
+    # 10**decimals (decimals <= 13) 는 정확하므로 곱셈 오차는 0.5 ulp 이내, 여유를 두고 경계 판정
+    ok &= ~nonzero | (np.abs(scaled - np.floor(scaled) - 0.5) > scaled * _TIE_TOLERANCE)
+    mantissa = np.rint(scaled).astype(np.int64) * nonzero
+    # 가수 < 2**53 이므로 float 나눗셈 후 floor 도 정확 (정수 나눗셈보다 빠름)
+    integer = np.floor(mantissa / _POWERS[decimals + _POWER_OFFSET]).astype(np.int64)
+    fraction = mantissa - integer * _INT_POWERS[decimals]
+    # 반올림으로 자리가 올라 10**precision 에 도달하면 '%g' 는 지수 표기
+    ok &= integer < _INT_POWERS[precision]
+    integer *= ok
+
+    # 정수부 자리 수 = 지수 + 1 (최소 1), 반올림 올림이면 1 자리 추가
+    int_length = np.maximum(exponent + 1, 1) * nonzero + ~nonzero
+    int_length += integer >= _INT_POWERS[int_length]
+    int_words = -(-int(int_length.max(initial=1)) // 4)
+    frac_words = -(-int(decimals.max(initial=0)) // 4)
+    int_width = int_words * 4
+    fraction = fraction * _INT_POWERS[frac_words * 4 - decimals]
+    words = _digit_words(fraction, frac_words)
+    # 소수부 길이 = 마지막 0 아닌 자리 (4자리 단위 끝 0 개수 조회)
+    frac_length = np.zeros(values.shape[0], dtype=np.int64)
+    for j in range(frac_words):
+        word = words[:, j]
+        np.maximum(frac_length, (word != 0) * (4 * (j + 1) - _TRAILING_ZEROS[word]), out=frac_length)
+
+    width = int_width + frac_words * 4 + 2
+    digits = np.empty((values.shape[0], width), dtype=np.uint8)
+    digits[:, 1:int_width + 1] = _DIGIT_WORDS[_digit_words(integer, int_words)].view(np.uint8)
+    digits[:, int_width + 1] = ord(".")
+    digits[:, int_width + 2:] = _DIGIT_WORDS[words].view(np.uint8)
+    negative = np.signbit(values) & ok
+    start = int_width + 1 - int_length - negative
+    rows = np.flatnonzero(negative)
+    digits[rows, start[rows]] = ord("-")
+    end = int_width + 1 + np.where(frac_length > 0, frac_length + 1, 0)
+    return digits, _keep_table(width)[start, end], ok
+
+
+def _integer_digits(numbers):
+    """음이 아닌 int64 (나노초 타임스탬프 등) -> (ASCII 행렬, 출력 마스크)"""
+    digits = _DIGIT_WORDS[_digit_words(numbers, 5)].view(np.uint8)
+    length = np.searchsorted(_INT_POWERS[1:], numbers, side="right") + 1
+    return digits, np.arange(20) >= (20 - length)[:, None]
+
+
+def _pack(items):
+    """문자열 목록 -> (UTF-8 바이트 조회표 (개수, 최대 길이), 길이)"""
+    encoded = [item.encode("utf-8") for item in items]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    width = int(lengths.max(initial=0))
+    flat = np.frombuffer(b"".join(encoded) + bytes(width), dtype=np.uint8)
+    offsets = np.cumsum(lengths) - lengths
+    return flat[offsets[:, None] + np.arange(width)], lengths
+
+
+def _assemble(pieces, rows):
+    """행별 조각 (상수 바이트 / (바이트 행렬, 출력 마스크)) -> 한 행렬에 배치, 마스크 밖 바이트 제거 후 한 번에 디코딩
+
+    마지막 조각은 줄바꿈으로 끝나야 함, 반환: 행별 문자열
+    """
+    width = sum(piece.size if isinstance(piece, np.ndarray) else piece[0].shape[1] for piece in pieces)
+    text = np.empty((rows, width), dtype=np.uint8)
+    mask = np.empty((rows, width), dtype=bool)
+    column = 0
+    for piece in pieces:
+        block, keep = (piece, True) if isinstance(piece, np.ndarray) else piece
+        size = block.shape[-1]
+        text[:, column:column + size] = block
+        mask[:, column:column + size] = keep
+        column += size
+    return str(np.compress(mask.ravel(), text.ravel()).data, "utf-8").split("\n")[:-1]
+
+
+class LineProtocolSerializer:
+    """스키마 컴파일형 라인 프로토콜 직렬화기 (필드는 float 로 기록)
+
+    significant_digits 를 지정하면 repr 대신 '%.Ng' 로 포맷 (대량 배치에서 약 4배 빠름)
+    significant_digits <= 10 이면 batch 는 컬럼 단위로 직렬화 (차량 고정 태그 컬럼은 배치 간 코드 재사용)
+    """
+
+    def __init__(self, measurement, tag_keys, field_keys, significant_digits=None):
+        self.measurement = measurement
+        self.tag_keys = list(tag_keys)
+        self.field_keys = list(field_keys)
+
+        self._prefix = escape_measurement(measurement)
+        # InfluxDB 권장에 따라 태그는 키 순으로 기록
+        self._tag_order = sorted(range(len(self.tag_keys)), key=lambda i: self.tag_keys[i])
+        self._tag_prefixes = [f",{escape_key(self.tag_keys[i])}=" for i in self._tag_order]
+        self._field_names = [escape_key(key) for key in self.field_keys]
+        self._float_format = "%r" if significant_digits is None else f"%.{significant_digits}g"
+        self._field_template = ",".join(f"{name}={self._float_format}" for name in self._field_names)
+        # 컬럼 단위 직렬화 (significant_digits <= 10)
+        self._columnar = significant_digits is not None and 0 < significant_digits <= _FAST_MAX_DIGITS
+        self._precision = significant_digits
+        self._prefix_bytes = np.frombuffer(self._prefix.encode("utf-8"), dtype=np.uint8)
+        self._field_prefixes = [np.frombuffer(f"{',' if i else ''}{name}=".encode("utf-8"), dtype=np.uint8)
+                                for i, name in enumerate(self._field_names)]
+        self._tag_cache = {}
+        self._tag_codes_cache = {}
+
+    def _escape_tag_value(self, value):
+        """태그 값 이스케이프 (반복 값 캐시)"""
+        escaped = self._tag_cache.get(value)
+        if escaped is None:
+            escaped = escape_key(value)
+            if len(self._tag_cache) < 100000:
+                self._tag_cache[value] = escaped
+        return escaped
+
+    def _tag_section(self, tags):
+        """태그 값 시퀀스 -> 'measurement,k=v,...' (빈 태그 생략)"""
+        parts = [self._prefix]
+        for prefix, i in zip(self._tag_prefixes, self._tag_order):
+            value = tags[i]
+            if value is None or value == "":
+                continue
+            parts.append(prefix)
+            parts.append(self._escape_tag_value(value))
+        return "".join(parts)
+
+    def _field_section(self, values):
+        """필드 값 시퀀스 -> 'k=v,...' (NaN/Inf 필드 생략)"""
+        if all(math.isfinite(v) for v in values):
+            return self._field_template % tuple(values)
+        return ",".join(
+            f"{name}={self._float_format % value}" for name, value in zip(self._field_names, values)
+            if math.isfinite(value)
+        )
+
+    def line(self, tags, fields, timestamp):
+        """단일 레코드 직렬화 (tags/fields 는 스키마 순서의 값 시퀀스)"""
+        values = tuple(float(v) for v in fields)
+        return f"{self._tag_section(tags)} {self._field_section(values)} {to_timestamp_ns(timestamp)}"
+
+    def line_from_record(self, tags, record, timestamp):
+        """dict 레코드에서 스키마 필드만 골라 직렬화"""
+        return self.line(tags, [record[key] for key in self.field_keys], timestamp)
+
+    def batch(self, tag_columns, field_columns, timestamps):
+        """컬럼 배치 직렬화 (태그: 리스트 컬럼, 필드: 배열 컬럼, 타임스탬프: 단일값 또는 배열)"""
+        fields = np.column_stack([np.asarray(col, dtype=np.float64) for col in field_columns])
+        n = fields.shape[0]
+
+        if self._columnar and n:
+            if np.ndim(timestamps) == 0:
+                return self._batch_columnar(tag_columns, fields, to_timestamp_ns(timestamps), None)
+            stamps = np.array([to_timestamp_ns(t) for t in np.asarray(timestamps).tolist()], dtype=np.int64)
+            if stamps.min() >= 0:
+                return self._batch_columnar(tag_columns, fields, None, stamps)
+
+        if np.ndim(timestamps) == 0:
+            ts = [str(to_timestamp_ns(timestamps))] * n
+        else:
+            ts = [str(to_timestamp_ns(t)) for t in np.asarray(timestamps).tolist()]
+
+        # 태그 컬럼별로 고유 값만 이스케이프 후 행 단위 결합
+        tag_parts = []
+        for prefix, i in zip(self._tag_prefixes, self._tag_order):
+            column = tag_columns[i]
+            mapping = {
+                value: "" if value is None or value == "" else prefix + self._escape_tag_value(value)
+                for value in set(column)
+            }
+            tag_parts.append([mapping[value] for value in column])
+        heads = [self._prefix + "".join(row) for row in zip(*tag_parts)] if tag_parts else [self._prefix] * n
+
+        finite = np.isfinite(fields).all(axis=1)
+        template = self._field_template
+
+        if finite.all():
+            return [f"{head} {template % tuple(values)} {stamp}"
+                    for head, values, stamp in zip(heads, fields.tolist(), ts)]
+
+        lines = []
+        for head, values, ok, stamp in zip(heads, fields.tolist(), finite.tolist(), ts):
+            field_section = template % tuple(values) if ok else self._field_section(values)
+            if field_section:
+                lines.append(f"{head} {field_section} {stamp}")
+        return lines
+
+    def _tag_codes(self, prefix, i, column):
+        """태그 컬럼 -> (고유 값 바이트 조회표, 길이, 행별 코드), 직전 배치와 같은 컬럼이면 재사용 (차량 고정 태그)"""
+        cached = self._tag_codes_cache.get(i) if isinstance(column, list) else None
+        if cached is not None and cached[0] == column:
+            return cached[1]
+        index = {value: code for code, value in enumerate(set(column))}
+        table, lengths = _pack(["" if value is None or value == "" else prefix + self._escape_tag_value(value)
+                                for value in index])
+        codes = (table, lengths, np.fromiter(map(index.__getitem__, column), dtype=np.intp, count=len(column)))
+        if isinstance(column, list):
+            self._tag_codes_cache[i] = (list(column), codes)
+        return codes
+
+    def _batch_columnar(self, tag_columns, fields, stamp, stamps):
+        """컬럼 단위 직렬화: 태그 (고유 값 조회표) / 필드 (fixed_digits) / 타임스탬프를 바이트 행렬로 조립
+
+        지수 표기 / 반올림 경계 값이나 NaN / Inf 가 있는 행만 행 단위로 다시 포맷 (결과는 행 단위 직렬화와 같음)
+        """
+        n = fields.shape[0]
+        tags = [self._tag_codes(prefix, i, tag_columns[i]) for prefix, i in zip(self._tag_prefixes, self._tag_order)]
+        tail = None if stamp is None else np.frombuffer(f" {stamp}\n".encode(), dtype=np.uint8)
+
+        lines = []
+        for start in range(0, n, _CHUNK_ROWS):
+            stop = min(start + _CHUNK_ROWS, n)
+            pieces = [self._prefix_bytes]
+            for table, lengths, codes in tags:
+                chunk = codes[start:stop]
+                pieces.append((table[chunk], np.arange(table.shape[1]) < lengths[chunk][:, None]))
+            pieces.append(_SPACE)
+            usable = np.ones(stop - start, dtype=bool)
+            for prefix, column in zip(self._field_prefixes, fields[start:stop].T):
+                digits, keep, ok = fixed_digits(column, self._precision)
+                pieces += [prefix, (digits, keep)]
+                usable &= ok
+            pieces += [tail] if tail is not None else [_SPACE, _integer_digits(stamps[start:stop]), _NEWLINE]
+            chunk_lines = _assemble(pieces, stop - start)
+
+            for row in np.flatnonzero(~usable).tolist():
+                values = fields[start + row].tolist()
+                field_section = self._field_section(values)
+                if field_section:
+                    head = self._tag_section([column[start + row] for column in tag_columns])
+                    stamp_text = stamp if stamps is None else stamps[start + row]
+                    chunk_lines[row] = f"{head} {field_section} {stamp_text}"
+                else:
+                    chunk_lines[row] = None
+            if usable.all():
+                lines += chunk_lines
+            else:
+                lines += [line for line in chunk_lines if line is not None]
+        return lines
+
+    @staticmethod
+    def encode(lines, compress=False, compresslevel=6):
+        """라인 리스트 -> 전송용 바이트 (선택적 gzip)"""
+        payload = "\n".join(lines).encode("utf-8")
+        if compress:
+            return gzip.compress(payload, compresslevel=compresslevel)
+        return payload
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+시뮬레이터 출력 싱크
+- influx : InfluxDB 배치 비동기 전송 (기존 동작)
+- file   : 회전형 라인 프로토콜 파일 (선택적 gzip)
+- parquet: 컬럼형 Parquet 파일 (row group 단위 배치 기록, pyarrow 필요)
+- queue  : 프로세스 내 asyncio.Queue (시뮬레이터 -> 파이프라인 직결)
+- null   : 기록 없이 집계만 (부하 측정용)
+시뮬레이터는 틱마다 컬럼형 RecordBatch 하나를 싱크에 넘긴다.
+"""
+
+import asyncio
+import gzip
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from batch_writer import BatchedInfluxWriter
+from line_protocol import to_timestamp_ns
+
+SINK_TYPES = ("influx", "file", "parquet", "queue", "null")
+# 큐 싱크가 레코드에 붙이는 생산자 컬럼 출처 키: (컬럼 블록, 행) -> 소비자가 꺼내 쓰고 제거
+COLUMN_SOURCE_KEY = "_columns"
+
+
+class RecordBatch:
+    """틱 1회분 컬럼형 레코드 (태그: 리스트 컬럼, 필드: 배열 컬럼)"""
+
+    def __init__(self, serializer, tag_columns, field_columns, timestamp):
+        self.serializer = serializer
+        self.tag_columns = tag_columns
+        self.field_columns = [np.asarray(col, dtype=np.float64) for col in field_columns]
+        self.timestamp = timestamp
+        self._lines = None
+
+    @classmethod
+    def from_records(cls, serializer, tag_rows, records, timestamp):
+        """레코드 dict 리스트 -> 배치 (스키마 필드만 사용)"""
+        tag_columns = [list(col) for col in zip(*tag_rows)] if tag_rows else []
+        field_columns = [
+            np.fromiter((float(record[key]) for record in records), dtype=np.float64, count=len(records))
+            for key in serializer.field_keys
+        ]
+        return cls(serializer, tag_columns, field_columns, timestamp)
+
+    @property
+    def measurement(self):
+        return self.serializer.measurement
+
+    def __len__(self):
+        return len(self.field_columns[0]) if self.field_columns else 0
+
+    def timestamps_ns(self):
+        """레코드별 나노초 타임스탬프 배열"""
+        if np.ndim(self.timestamp) == 0:
+            return np.full(len(self), to_timestamp_ns(self.timestamp), dtype=np.int64)
+        return np.array([to_timestamp_ns(t) for t in np.asarray(self.timestamp).tolist()], dtype=np.int64)
+
+    def to_lines(self):
+        """라인 프로토콜 (1회만 직렬화)"""
+        if self._lines is None:
+            self._lines = self.serializer.batch(self.tag_columns, self.field_columns, self.timestamp)
+        return self._lines
+
+    def to_columns(self):
+        """컬럼 dict (태그 / 필드 / time)"""
+        columns = {"time": self.timestamps_ns()}
+        for key, col in zip(self.serializer.tag_keys, self.tag_columns):
+            columns[key] = col
+        for key, col in zip(self.serializer.field_keys, self.field_columns):
+            columns[key] = col
+        return columns
+
+    def column_block(self, fields):
+        """필드 이름 목록 -> (필드 수, 레코드 수) float64 블록 (스키마에 없는 필드는 NaN)"""
+        block = np.full((len(fields), len(self)), np.nan)
+        index = {key: i for i, key in enumerate(self.serializer.field_keys)}
+        for row, field in zip(block, fields):
+            if field in index:
+                row[:] = self.field_columns[index[field]]
+        return block
+
+    def to_records(self):
+        """레코드 dict 리스트 (measurement / timestamp 포함)"""
+        keys = ["timestamp"] + self.serializer.tag_keys + self.serializer.field_keys
+        rows = zip(self.timestamps_ns().tolist(), *self.tag_columns, *[col.tolist() for col in self.field_columns])
+        measurement = self.measurement
+        records = []
+        for row in rows:
+            record = dict(zip(keys, row))
+            record["measurement"] = measurement
+            records.append(record)
+        return records
+
+
+class OutputSink:
+    """출력 싱크 기본 클래스"""
+
+    name = "base"
+
+    def __init__(self):
+        self.stats = {
+            "points_written": 0,
+            "points_dropped": 0,
+            "batches_written": 0,
+            "write_errors": 0,
+            "total_write_latency": 0.0,
+            "max_write_latency": 0.0,
+        }
+        self._started_at = time.time()
+
+    def write(self, batch):
+        """배치 기록, 기록된 레코드 수 반환"""
+        start = time.perf_counter()
+        try:
+            written = self._write(batch)
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            self.stats["points_dropped"] += len(batch)
+            print(f"⚠️ {self.name} 싱크 기록 오류 ({len(batch)}개): {e}")
+            return 0
+        latency = time.perf_counter() - start
+        self.stats["points_written"] += written
+        self.stats["points_dropped"] += len(batch) - written
+        self.stats["batches_written"] += 1
+        self.stats["total_write_latency"] += latency
+        self.stats["max_write_latency"] = max(self.stats["max_write_latency"], latency)
+        return written
+
+    def _write(self, batch):
+        raise NotImplementedError
+
+    def snapshot(self):
+        """처리량 / 지연시간 요약 (BatchedInfluxWriter.snapshot 과 같은 키)"""
+        elapsed = max(time.time() - self._started_at, 1e-9)
+        stats = dict(self.stats)
+        batches = stats["batches_written"]
+        stats["sink"] = self.name
+        stats["pending"] = 0
+        stats["throughput"] = stats["points_written"] / elapsed
+        stats["avg_flush_latency"] = stats["total_write_latency"] / batches if batches else 0.0
+        return stats
+
+    def close(self):
+        """자원 정리"""
+
+
+class NullSink(OutputSink):
+    """기록 없이 집계만 수행"""
+
+    name = "null"
+
+    def _write(self, batch):
+        return len(batch)
+
+
+class InfluxSink(OutputSink):
+    """InfluxDB 배치 비동기 전송 싱크"""
+
+    name = "influx"
+
+    def __init__(self, url, token, org, bucket, **writer_options):
+        super().__init__()
+        from influxdb_client import InfluxDBClient
+        from influxdb_client.client.write_api import SYNCHRONOUS
+
+        self.client = InfluxDBClient(url=url, token=token, org=org, enable_gzip=True)
+        self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+        self.writer = BatchedInfluxWriter(self.write_api, bucket, org, **writer_options)
+
+    def write(self, batch):
+        """직렬화 후 전송 버퍼 적재 (전송은 백그라운드)"""
+        return self.writer.write(batch.to_lines())
+
+    def snapshot(self):
+        stats = self.writer.snapshot()
+        stats["sink"] = self.name
+        return stats
+
+    def close(self):
+        self.writer.close()
+        self.client.close()
+
+
+class LineProtocolFileSink(OutputSink):
+    """회전형 라인 프로토콜 파일 싱크"""
+
+    name = "file"
+
+    def __init__(self, directory="lp_output", prefix="dtg", max_bytes=256 * 1024 * 1024, compress=False):
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+        self._sequence = 0
+        self._file = None
+        self._bytes = 0
+        self.files = []
+
+    def _open_next(self):
+        """다음 파일 열기"""
+        if self._file is not None:
+            self._file.close()
+        self._sequence += 1
+        suffix = ".lp.gz" if self.compress else ".lp"
+        path = self.directory / f"{self.prefix}-{self._run_id}-{self._sequence:04d}{suffix}"
+        self._file = gzip.open(path, "wb") if self.compress else open(path, "wb")
+        self._bytes = 0
+        self.files.append(path)
+
+    def _write(self, batch):
+        lines = batch.to_lines()
+        if not lines:
+            return 0
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        if self._file is None or self._bytes >= self.max_bytes:
+            self._open_next()
+        self._file.write(payload)
+        self._bytes += len(payload)
+        return len(lines)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ParquetSink(OutputSink):
+    """컬럼형 Parquet 싱크 (measurement 별 파일, row group 단위 기록)"""
+
+    name = "parquet"
+
+    def __init__(self, directory="parquet_output", prefix="dtg", row_group_size=100000,
+                 rows_per_file=5000000, compression="zstd"):
+        super().__init__()
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("parquet 싱크에는 pyarrow 가 필요합니다 (pip install pyarrow)") from e
+        self._pa = pa
+        self._pq = pq
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.row_group_size = row_group_size
+        self.rows_per_file = rows_per_file
+        self.compression = compression
+        self._run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+
+        # measurement 별 상태: 버퍼 청크, 버퍼 행 수, writer, 파일 행 수, 파일 순번
+        self._tables = {}
+        self.files = []
+
+    def _state(self, batch):
+        state = self._tables.get(batch.measurement)
+        if state is None:
+            state = {"serializer": batch.serializer, "chunks": [], "rows": 0,
+                     "writer": None, "file_rows": 0, "sequence": 0}
+            self._tables[batch.measurement] = state
+        return state
+
+    def _write(self, batch):
+        state = self._state(batch)
+        state["chunks"].append(batch.to_columns())
+        state["rows"] += len(batch)
+        if state["rows"] >= self.row_group_size:
+            self._flush(batch.measurement, state)
+        return len(batch)
+
+    def _flush(self, measurement, state):
+        """버퍼를 row group 하나로 기록"""
+        if not state["rows"]:
+            return
+        pa = self._pa
+        serializer = state["serializer"]
+        chunks = state["chunks"]
+
+        arrays = {"time": pa.array(np.concatenate([c["time"] for c in chunks]), type=pa.timestamp("ns", tz="UTC"))}
+        for key in serializer.tag_keys:
+            values = [v for c in chunks for v in c[key]]
+            arrays[key] = pa.array(values, type=pa.string()).dictionary_encode()
+        for key in serializer.field_keys:
+            arrays[key] = pa.array(np.concatenate([c[key] for c in chunks]), type=pa.float64())
+        table = pa.table(arrays)
+
+        if state["writer"] is None or state["file_rows"] >= self.rows_per_file:
+            if state["writer"] is not None:
+                state["writer"].close()
+            state["sequence"] += 1
+            path = self.directory / f"{self.prefix}-{measurement}-{self._run_id}-{state['sequence']:04d}.parquet"
+            state["writer"] = self._pq.ParquetWriter(path, table.schema, compression=self.compression)
+            state["file_rows"] = 0
+            self.files.append(path)
+
+        state["writer"].write_table(table, row_group_size=len(table))
+        state["file_rows"] += len(table)
+        state["chunks"] = []
+        state["rows"] = 0
+
+    def close(self):
+        for measurement, state in self._tables.items():
+            self._flush(measurement, state)
+            if state["writer"] is not None:
+                state["writer"].close()
+                state["writer"] = None
+
+
+class AsyncQueueSink(OutputSink):
+    """프로세스 내 asyncio.Queue 싱크 (레코드 dict 단위, 가득 차면 폐기)
+
+    시뮬레이터가 다른 스레드에서 돌면 이벤트 루프로 call_soon_threadsafe 전달
+    큐에서 폐기한 건수는 루프 스레드 전용 카운터 (queue_dropped) 에만 기록, snapshot() 에서 합산
+    레코드마다 큐 적재 시각 (enqueued_at, monotonic) 을 기록 -> 소비자가 입력 큐 대기를 지연에 포함
+    column_fields 지정 시 생산자 스레드에서 해당 필드 컬럼 블록을 만들어 레코드마다 (블록, 행) 을
+    COLUMN_SOURCE_KEY 로 붙임 -> 소비자가 레코드 dict 를 다시 훑지 않고 컬럼을 슬라이스로 모음
+    (블록은 직렬화 불가: 소비자가 꺼낸 뒤 저장 / 스풀로 넘겨야 함)
+    """
+
+    name = "queue"
+
+    def __init__(self, queue=None, loop=None, maxsize=100000, drop_oldest=True, column_fields=None):
+        super().__init__()
+        self.queue = queue if queue is not None else asyncio.Queue(maxsize=maxsize)
+        if loop is None:
+            # 이벤트 루프 안에서 생성되면 그 루프를 기본 전달 대상으로 사용
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+        self.loop = loop
+        self.drop_oldest = drop_oldest
+        self.column_fields = tuple(column_fields) if column_fields else None
+        # 이벤트 루프 스레드만 갱신 (stats 는 write() 를 호출하는 스레드 소유)
+        self.queue_dropped = 0
+
+    def _put_many(self, records):
+        """이벤트 루프 스레드에서 큐 적재"""
+        dropped = 0
+        enqueued_at = time.monotonic()
+        for record in records:
+            record["enqueued_at"] = enqueued_at
+            if self.queue.full():
+                if not self.drop_oldest:
+                    dropped += 1
+                    continue
+                self.queue.get_nowait()
+                dropped += 1
+            self.queue.put_nowait(record)
+        if dropped:
+            self.queue_dropped += dropped
+
+    def snapshot(self):
+        """큐 폐기분을 전달 건수에서 빼고 폐기 건수에 더한 요약"""
+        queue_dropped = self.queue_dropped
+        stats = super().snapshot()
+        stats["queue_dropped"] = queue_dropped
+        stats["points_written"] -= queue_dropped
+        stats["points_dropped"] += queue_dropped
+        elapsed = max(time.time() - self._started_at, 1e-9)
+        stats["throughput"] = stats["points_written"] / elapsed
+        return stats
+
+    def _write(self, batch):
+        records = batch.to_records()
+        if self.column_fields is not None:
+            block = batch.column_block(self.column_fields)
+            for row, record in enumerate(records):
+                record[COLUMN_SOURCE_KEY] = (block, row)
+        loop = self.loop
+        if loop is None:
+            self._put_many(records)
+            return len(records)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._put_many(records)
+        else:
+            loop.call_soon_threadsafe(self._put_many, records)
+        return len(records)
+
+
+def create_sink(kind, influx=None, output_dir=None, prefix="dtg", rotate_mb=256, compress=False, **options):
+    """싱크 종류 이름 -> 싱크 인스턴스 (influx: url/token/org/bucket dict)"""
+    if kind == "influx":
+        if influx is None:
+            raise ValueError("influx 싱크에는 접속 설정이 필요합니다")
+        return InfluxSink(**influx, **options)
+    if kind == "file":
+        return LineProtocolFileSink(output_dir or "lp_output", prefix=prefix,
+                                    max_bytes=int(rotate_mb * 1024 * 1024), compress=compress)
+    if kind == "parquet":
+        return ParquetSink(output_dir or "parquet_output", prefix=prefix, **options)
+    if kind == "queue":
+        return AsyncQueueSink(**options)
+    if kind == "null":
+        return NullSink()
+    raise ValueError(f"지원하지 않는 싱크: {kind}")
+
+
+def add_sink_arguments(parser, default="influx"):
+    """싱크 관련 명령행 옵션 등록 (queue 싱크는 프로세스 내 소비자가 필요해 API 전용)"""
+    parser.add_argument("--sink", choices=["influx", "file", "parquet", "null"], default=default,
+                        help="출력 싱크 (기본: influx)")
+    parser.add_argument("--output-dir", type=str, default=None,
+                        help="file/parquet 싱크 출력 디렉터리")
+    parser.add_argument("--rotate-mb", type=float, default=256,
+                        help="file 싱크 파일 회전 크기 (MB)")
+    parser.add_argument("--compress", action="store_true",
+                        help="file 싱크 gzip 압축")
+    return parser
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+테이블 기반 벡터화 물리 커널
+- calculate_physics_based_data (ultimate_comprehensive_simulator) 의 배열 버전
+- 기어: 속도 구간 경계 배열에 np.searchsorted, 기어비: 인덱스 조회 테이블
+- 대규모 차량군 시뮬레이션과 물리 검증(속도-RPM 관계)에서 공통 사용
+- 물리 검증 규칙 / 기준값 (VALIDATION_RULES, PHYSICAL_CONSTANTS) 공용 정의
+"""
+
+import math
+
+import numpy as np
+
+# 물리 상수 (15개 요구사항)
+DIESEL_CO2_FACTOR = 3.2  # kgCO2e/L (Well-to-Wheel)
+AIR_DENSITY = 1.225  # kg/m³
+DRAG_COEFFICIENT = 0.7  # 화물차 공기저항계수
+ROLLING_RESISTANCE = 0.008  # 구름저항계수
+GRAVITY = 9.81  # m/s²
+
+# 변속 테이블 (속도 km/h 가 경계 이상이면 다음 단)
+GEAR_SPEED_BREAKPOINTS = np.array([30.0, 50.0, 70.0, 90.0])
+GEAR_NUMBERS = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+GEAR_RATIOS = np.array([4.5, 2.8, 1.8, 1.3, 1.0])
+FINAL_DRIVE = 3.5
+WHEEL_RADIUS = 0.5  # m
+ENGINE_RPM_RANGE = (800, 2500)
+MAX_SPEED_KMH = 110
+
+# 물리 검증 규칙 / 기준값 (PhysicsValidationEngine 과 ProcessOffload 검증 커널이 공통 사용)
+VALIDATION_RULES = {
+    "speed_acceleration": {
+        "name": "속도-가속도 일관성",
+        "description": "v = u + at 법칙 검증",
+        "tolerance": 5.0,  # 허용 오차 (%)
+        "critical": False,
+    },
+    "fuel_speed_correlation": {
+        "name": "연비-속도 상관관계",
+        "description": "속도와 연비의 물리적 관계 검증",
+        "tolerance": 15.0,
+        "critical": True,
+    },
+    "weight_acceleration": {
+        "name": "중량-가속도 관계",
+        "description": "F = ma 기반 중량과 가속도 관계",
+        "tolerance": 10.0,
+        "critical": True,
+    },
+    "co2_fuel_consistency": {
+        "name": "CO2-연료소모 일치성",
+        "description": "연료소모량과 CO2 배출량 비례 관계",
+        "tolerance": 8.0,
+        "critical": True,
+    },
+    "speed_rpm_correlation": {
+        "name": "속도-RPM 상관관계",
+        "description": "차량 속도와 엔진 RPM의 기계적 관계",
+        "tolerance": 12.0,
+        "critical": False,
+    },
+    "temperature_performance": {
+        "name": "온도-성능 상관관계",
+        "description": "엔진온도와 성능지표의 열역학적 관계",
+        "tolerance": 20.0,
+        "critical": False,
+    },
+}
+PHYSICAL_CONSTANTS = {
+    "co2_per_liter_diesel": 2.68,  # kg CO2/L 디젤
+    "truck_mass_range": (5000, 40000),  # kg (5톤-40톤)
+    "max_acceleration": 3.0,  # m/s² (화물차 최대 가속도)
+    "optimal_speed_range": (70, 90),  # km/h (연비 최적 속도)
+    "rpm_speed_ratio_range": (25, 45),  # RPM당 km/h
+}
+
+
+def gear_index(speed_kmh):
+    """속도 배열 -> 변속 테이블 인덱스 (GEAR_NUMBERS / GEAR_RATIOS 조회용)"""
+    return np.searchsorted(GEAR_SPEED_BREAKPOINTS, speed_kmh, side="right")
+
+
+def engine_rpm(speed_ms, gear_idx):
+    """바퀴 회전수 x 기어비 x 종감속비 -> 엔진 RPM (ENGINE_RPM_RANGE 로 제한)"""
+    wheel_rpm = (np.asarray(speed_ms) * 60) / (2 * math.pi * WHEEL_RADIUS)
+    return np.clip(wheel_rpm * GEAR_RATIOS[gear_idx] * FINAL_DRIVE, *ENGINE_RPM_RANGE)
+
+
+def expected_engine_rpm(speed_kmh):
+    """기록된 속도(km/h)만으로 기대 엔진 RPM 계산 (검증용)"""
+    speed_kmh = np.asarray(speed_kmh, dtype=np.float64)
+    return engine_rpm(speed_kmh / 3.6, gear_index(speed_kmh))
+
+
+def physics_batch(speed_kmh, cargo_weight, empty_weight, tonnage, fuel_eff, max_cargo, target_speed_kmh, dt=1.0):
+    """차량군 물리 데이터 계산 (인자는 차량별 배열 또는 스칼라, 결과는 필드별 배열 dict)
+
+    target_speed_kmh 를 외부에서 받으므로 같은 목표 속도면 스칼라 버전과 같은 결과
+    """
+    speed_ms = np.asarray(speed_kmh, dtype=np.float64) / 3.6
+    cargo_weight = np.asarray(cargo_weight, dtype=np.float64)
+    total_weight = np.asarray(empty_weight, dtype=np.float64) + cargo_weight
+
+    # 뉴턴 제2법칙: F = ma
+    target_speed_ms = np.asarray(target_speed_kmh, dtype=np.float64) / 3.6
+    acceleration = np.clip((target_speed_ms - speed_ms) * 0.1, -3.0, 2.0)
+
+    # 공기저항력과 구름저항력
+    frontal_area = np.asarray(tonnage, dtype=np.float64) * 2.5 + 8.0
+    drag_force = 0.5 * AIR_DENSITY * DRAG_COEFFICIENT * frontal_area * speed_ms ** 2
+    rolling_force = ROLLING_RESISTANCE * total_weight * GRAVITY
+
+    # 새로운 속도 / 기어 / RPM
+    new_speed_ms = speed_ms + acceleration * dt
+    new_speed_kmh = np.clip(new_speed_ms * 3.6, 0, MAX_SPEED_KMH)
+    gear_idx = gear_index(new_speed_kmh)
+    rpm = engine_rpm(new_speed_ms, gear_idx)
+
+    # 연료 소비 (적재 / 고속 페널티)
+    weight_penalty = (cargo_weight / max_cargo) * 0.2
+    speed_penalty = np.maximum(0, (new_speed_kmh - 80) / 20) * 0.15
+    actual_fuel_eff = np.asarray(fuel_eff, dtype=np.float64) * (1 - weight_penalty - speed_penalty)
+
+    # CO2 배출량 (Well-to-Wheel)
+    co2_emission = (new_speed_kmh / actual_fuel_eff / 3600) * DIESEL_CO2_FACTOR  # kgCO2e/s
+    moving = new_speed_kmh > 0
+    co2_per_km = np.where(moving, co2_emission * 3600 / np.where(moving, new_speed_kmh, 1.0), 0.0)
+
+    return {
+        "vehicle_speed": new_speed_kmh,
+        "vehicle_rpm": rpm,
+        "gear": GEAR_NUMBERS[gear_idx],
+        "acceleration": acceleration,
+        "fuel_efficiency_kmpl": actual_fuel_eff,
+        "co2_emission": co2_emission * 60,  # kg/min
+        "co2_per_km": co2_per_km,
+        "total_weight": total_weight,
+        "drag_force": drag_force,
+        "rolling_force": rolling_force,
+    }
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+CPU 연산 단계 프로세스 풀 오프로드 (물리 검증 / 시급성 분류)
+- 레코드 dict 배치 -> 공유 메모리 NumPy 버퍼 (필드 x 행, float64) 에 컬럼으로 기록
+- 작업 프로세스에는 (커널 이름, 공유 메모리 이름, 행 수) 만 전달 (레코드 pickle 없음)
+  작업 프로세스는 버퍼를 이름으로 한 번만 붙이고 (캐시) 결과를 같은 버퍼의 마지막 행에 기록
+- 버퍼는 시작 시 workers x 2 개를 미리 할당해 재사용, 배치가 capacity 보다 크면 나눠서 동시 제출
+- 검증 허용 오차는 VALIDATION_RULES / PHYSICAL_CONSTANTS (PhysicsValidationEngine 과 같은 정의) 에서 읽어
+  풀 initializer 로 작업 프로세스에 한 번 전달
+- 이벤트 루프는 컬럼 추출만 수행하므로 검증이 무거워져도 수집 경로 지연이 늘지 않음
+  생산자가 만든 컬럼 블록 (AsyncQueueSink column_fields=OFFLOAD_FIELDS) 을 넘기면 레코드 dict 순회 없이 슬라이스 복사
+- 호출자가 취소돼도 공유 버퍼는 작업 프로세스 실행이 끝난 뒤에 반납
+- workers=0 (기본) 이거나 풀 / 공유 메모리를 쓸 수 없으면 같은 커널을 호출한 자리에서 실행 (inline)
+  inline 은 컬럼 추출과 커널 연산이 모두 이벤트 루프에서 실행됨 (루프 밖으로 옮기려면 workers >= 1)
+  실행 중 작업 프로세스가 죽으면 (BrokenProcessPool) inline 으로 전환하고 fallbacks 집계
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from physics_kernel import DIESEL_CO2_FACTOR, MAX_SPEED_KMH, PHYSICAL_CONSTANTS, VALIDATION_RULES, expected_engine_rpm
+from ultimate_comprehensive_simulator import urgency_index
+
+# 커널 입력 컬럼 (버퍼 행 순서), 없는 필드는 NaN
+OFFLOAD_FIELDS = (
+    "vehicle_speed", "vehicle_rpm", "acceleration", "fuel_efficiency_kmpl", "co2_per_km",
+    "total_weight", "cargo_weight", "safety_score", "accident_risk",
+)
+
+# 물리 검증 위반 비트
+VIOLATION_SPEED_RANGE = 1
+VIOLATION_RPM_MISMATCH = 2
+VIOLATION_WEIGHT_ACCELERATION = 4
+VIOLATION_CO2_FUEL = 8
+VIOLATION_WEIGHT = 16
+VIOLATION_NAMES = {
+    VIOLATION_SPEED_RANGE: "speed_range",
+    VIOLATION_RPM_MISMATCH: "speed_rpm_correlation",
+    VIOLATION_WEIGHT_ACCELERATION: "weight_acceleration",
+    VIOLATION_CO2_FUEL: "co2_fuel_consistency",
+    VIOLATION_WEIGHT: "weight",
+}
+
+
+def validation_thresholds(rules=None, constants=None):
+    """검증 규칙 / 기준값 -> 커널 임계값 dict (기본: physics_kernel 공용 정의)"""
+    rules = VALIDATION_RULES if rules is None else rules
+    constants = PHYSICAL_CONSTANTS if constants is None else constants
+    return {
+        "rpm_tolerance": rules["speed_rpm_correlation"]["tolerance"],
+        "co2_tolerance": rules["co2_fuel_consistency"]["tolerance"],
+        "weight_acceleration_tolerance": rules["weight_acceleration"]["tolerance"],
+        "max_acceleration": constants["max_acceleration"],
+    }
+
+
+def validate_kernel(columns, thresholds):
+    """물리 개연성 검증 -> 레코드별 위반 비트 (float 배열, NaN 입력은 위반 아님)"""
+    speed = columns["vehicle_speed"]
+    flags = np.zeros(speed.shape[0])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        flags += VIOLATION_SPEED_RANGE * ((speed < 0) | (speed > MAX_SPEED_KMH * 1.1))
+
+        rpm = columns["vehicle_rpm"]
+        expected = expected_engine_rpm(np.nan_to_num(speed))
+        moving = (speed > 0) & (rpm > 0)
+        flags += VIOLATION_RPM_MISMATCH * (moving & (np.abs(rpm - expected) / expected * 100
+                                                     > thresholds["rpm_tolerance"]))
+
+        # 중량 기반 최대 가속도 (10톤 기준 max_acceleration, 무거울수록 낮음)
+        weight = columns["total_weight"]
+        acceleration = np.abs(columns["acceleration"])
+        max_expected = thresholds["max_acceleration"] * (10000 / weight)
+        flags += VIOLATION_WEIGHT_ACCELERATION * (
+            (weight > 0) & (acceleration > 0.1)
+            & (acceleration > max_expected * (1 + thresholds["weight_acceleration_tolerance"] / 100)))
+
+        # kgCO2e/km = CO2 계수 / 연비
+        efficiency = columns["fuel_efficiency_kmpl"]
+        co2 = columns["co2_per_km"]
+        expected_co2 = DIESEL_CO2_FACTOR / efficiency
+        flags += VIOLATION_CO2_FUEL * ((speed > 0) & (efficiency > 0) & (co2 > 0)
+                                       & (np.abs(co2 - expected_co2) / expected_co2 * 100
+                                          > thresholds["co2_tolerance"]))
+
+        flags += VIOLATION_WEIGHT * ((columns["cargo_weight"] < 0) | (columns["cargo_weight"] > weight))
+    return flags
+
+
+def urgency_kernel(columns, thresholds):
+    """시급성 분류 (시뮬레이터와 같은 urgency_index) -> URGENCY_LEVELS 인덱스, 안전 점수 없는 레코드는 NaN"""
+    safety_score = columns["safety_score"]
+    with np.errstate(invalid="ignore"):
+        levels = urgency_index(safety_score, columns["vehicle_speed"], columns["accident_risk"] / 100)
+    return np.where(np.isnan(safety_score), np.nan, levels)
+
+
+KERNELS = {"validate": validate_kernel, "urgency": urgency_kernel}
+
+# 작업 프로세스 측 공유 메모리 캐시 (이름 -> SharedMemory), 임계값 (initializer 가 설정)
+_attached = {}
+_thresholds = None
+
+
+def _init_worker(thresholds):
+    """작업 프로세스 initializer: 검증 임계값 설정"""
+    global _thresholds
+    _thresholds = thresholds
+
+
+def _run_kernel(kernel, name, capacity, count):
+    """작업 프로세스: 공유 버퍼의 앞 count 행으로 커널 실행, 결과를 마지막 행에 기록"""
+    shm = _attached.get(name)
+    if shm is None:
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    block = np.ndarray((len(OFFLOAD_FIELDS) + 1, capacity), dtype=np.float64, buffer=shm.buf)
+    block[-1, :count] = KERNELS[kernel](dict(zip(OFFLOAD_FIELDS, block[:-1, :count])), _thresholds)
+    return count
+
+
+def fill_columns(block, records):
+    """레코드 dict -> 버퍼 컬럼 (block[필드, 행], 수치가 아니거나 없는 값은 NaN)"""
+    count = len(records)
+    for row, field in zip(block, OFFLOAD_FIELDS):
+        values = [record.get(field) for record in records]
+        try:
+            row[:count] = values
+        except (TypeError, ValueError):
+            row[:count] = [value if isinstance(value, (int, float)) else np.nan for value in values]
+
+
+def gather_columns(sources):
+    """레코드별 (생산자 컬럼 블록, 행) 목록 -> (OFFLOAD_FIELDS, 레코드) 블록, 출처 없는 레코드가 있으면 None
+
+    같은 블록의 연속 행은 슬라이스 한 번으로 복사 (생산자 배치 경계 / 큐 폐기로 끊긴 곳에서만 나눔)
+    """
+    count = len(sources)
+    block = np.empty((len(OFFLOAD_FIELDS), count))
+    start = 0
+    while start < count:
+        source = sources[start]
+        if source is None:
+            return None
+        owner, first = source
+        row = first + 1
+        stop = start + 1
+        while stop < count:
+            source = sources[stop]
+            if source is None or source[0] is not owner or source[1] != row:
+                break
+            row += 1
+            stop += 1
+        block[:, start:stop] = owner[:, first:row]
+        start = stop
+    return block
+
+
+class ProcessOffload:
+    """공유 메모리 버퍼 + 프로세스 풀 커널 실행기 (workers=0: inline, 이벤트 루프에서 실행)
+
+    rules / constants: PhysicsValidationEngine.validation_rules / physical_constants 형식 (기본: 공용 정의)
+    """
+
+    def __init__(self, workers=0, capacity=4096, rules=None, constants=None):
+        self.workers = workers
+        self.capacity = capacity
+        self.thresholds = validation_thresholds(rules, constants)
+        self.mode = "inline"
+        self.last_error = None
+        self._executor = None
+        self._buffers = []
+        self._free = None
+        self.stats = {"batches": 0, "records": 0, "chunks": 0, "inline_batches": 0, "fallbacks": 0, "buffer_waits": 0,
+                      "deferred_returns": 0, "column_batches": 0}
+
+    async def start(self):
+        """풀 / 공유 버퍼 준비 (실패 시 inline), 작업 프로세스를 미리 띄워 첫 배치 지연 방지"""
+        if self.workers <= 0:
+            return
+        try:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.thresholds,))
+            size = (len(OFFLOAD_FIELDS) + 1) * self.capacity * 8
+            self._buffers = [shared_memory.SharedMemory(create=True, size=size) for _ in range(self.workers * 2)]
+            self._free = asyncio.Queue()
+            for shm in self._buffers:
+                self._free.put_nowait(shm)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self._executor, _run_kernel, "urgency", shm.name,
+                                                        self.capacity, 0) for shm in self._buffers))
+            self.mode = "process"
+        except (OSError, BrokenProcessPool, NotImplementedError) as e:
+            self._fallback(e)
+
+    def _fallback(self, error):
+        """프로세스 실행 중단 -> inline 전환 (공유 버퍼 / 풀 정리)"""
+        self.stats["fallbacks"] += 1
+        self.last_error = str(error) or type(error).__name__
+        self.mode = "inline"
+        self._release()
+
+    def _release(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for shm in self._buffers:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # 실패한 배치의 배열 뷰가 남아 있으면 매핑은 GC 시 해제
+            shm.unlink()
+        self._buffers = []
+
+    async def run(self, kernel, records, columns=None):
+        """레코드 배치에 커널 실행 -> 레코드별 결과 (float 배열)
+
+        columns: 미리 만든 (OFFLOAD_FIELDS, 레코드) 블록 (gather_columns), 없으면 레코드 dict 에서 추출
+        """
+        self.stats["batches"] += 1
+        self.stats["records"] += len(records)
+        if columns is not None:
+            self.stats["column_batches"] += 1
+        if self.mode == "process" and self._executor is not None:
+            try:
+                return await self._run_process(kernel, records, columns)
+            except BrokenProcessPool as e:
+                self._fallback(e)
+        self.stats["inline_batches"] += 1
+        if columns is None:
+            columns = np.empty((len(OFFLOAD_FIELDS), len(records)))
+            fill_columns(columns, records)
+        return np.asarray(KERNELS[kernel](dict(zip(OFFLOAD_FIELDS, columns)), self.thresholds), dtype=np.float64)
+
+    async def _run_process(self, kernel, records, columns):
+        bounds = [(i, min(i + self.capacity, len(records))) for i in range(0, len(records), self.capacity)]
+        chunks = [(records[a:b], columns[:, a:b] if columns is not None else None) for a, b in bounds]
+        self.stats["chunks"] += len(chunks)
+        if len(chunks) == 1:
+            return await self._run_chunk(kernel, *chunks[0])
+        return np.concatenate(await asyncio.gather(*(self._run_chunk(kernel, *chunk) for chunk in chunks)))
+
+    async def _run_chunk(self, kernel, chunk, columns=None):
+        """버퍼 1개 확보 -> 컬럼 기록 -> 작업 프로세스 실행 -> 결과 복사 후 반납
+
+        호출자가 취소되면 작업 프로세스가 아직 버퍼를 쓰고 있을 수 있으므로 실행 완료 콜백에서 반납
+        """
+        if self._free.empty():
+            self.stats["buffer_waits"] += 1
+        shm = await self._free.get()
+        future = None
+        try:
+            block = np.ndarray((len(OFFLOAD_FIELDS) + 1, self.capacity), dtype=np.float64, buffer=shm.buf)
+            if columns is not None:
+                block[:-1, :len(chunk)] = columns
+            else:
+                fill_columns(block, chunk)
+            future = self._executor.submit(_run_kernel, kernel, shm.name, self.capacity, len(chunk))
+            await asyncio.wrap_future(future)
+            return block[-1, :len(chunk)].copy()
+        finally:
+            if future is None or future.done():
+                self._return(shm)
+            else:
+                self.stats["deferred_returns"] += 1
+                loop = asyncio.get_running_loop()
+                future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._return, shm))
+
+    def _return(self, shm):
+        """버퍼 반납 (inline 전환 후에는 버퍼가 해제되었으므로 무시)"""
+        if self.mode == "process":
+            self._free.put_nowait(shm)
+
+    async def close(self):
+        """풀 종료 및 공유 메모리 해제 (이후 run 은 inline, snapshot 의 mode 는 실행 중 방식 유지)"""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        self._release()
+
+    def snapshot(self):
+        stats = dict(self.stats)
+        stats["mode"] = self.mode
+        stats["workers"] = self.workers if self.mode == "process" else 0
+        stats["last_error"] = self.last_error
+        return stats
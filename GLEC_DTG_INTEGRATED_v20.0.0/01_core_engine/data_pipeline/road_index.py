@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+도로 속성 인덱스
+- HIGHWAYS 정의로부터 시작 시 1회 구축
+- 구간 / 제한속도 / 사고 다발 지역 조회: 단일 위치 O(log n) (bisect)
+- 위치 배열 조회: 전체 고속도로를 하나의 정렬 키로 펼쳐 np.searchsorted 1회
+"""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+# 고속도로별 km 좌표를 하나의 키 공간으로 펼치기 위한 간격 (최대 연장보다 커야 함)
+HIGHWAY_KEY_STRIDE = 10000.0
+
+
+class RoadAttributeIndex:
+    """고속도로 구간 / 사고 다발 지역 인덱스"""
+
+    def __init__(self, highways):
+        self.highway_names = list(highways.keys())
+        self.highway_pos = {name: h for h, name in enumerate(self.highway_names)}
+        self.highway_length = np.array(
+            [highways[name]["total_distance"] for name in self.highway_names], dtype=np.float64
+        )
+        if len(self.highway_length) and self.highway_length.max() >= HIGHWAY_KEY_STRIDE:
+            raise ValueError("고속도로 연장이 인덱스 키 간격을 초과합니다")
+
+        # 고속도로별 정렬 구간 (bisect 용)
+        self._sections = []
+        self._section_ends = []
+        self._zones = []
+        self._zone_starts = []
+
+        # 전체 고속도로 평탄화 배열 (벡터 조회용)
+        section_keys, section_limits, section_local, section_names = [], [], [], []
+        zone_start_keys, zone_end_keys = [], []
+        self.section_offset = []
+
+        for h, name in enumerate(self.highway_names):
+            highway = highways[name]
+            sections = sorted(highway["sections"], key=lambda s: s["end_km"])
+            self._sections.append(sections)
+            self._section_ends.append([s["end_km"] for s in sections])
+            self.section_offset.append(len(section_keys))
+
+            for s, section in enumerate(sections):
+                section_keys.append(h * HIGHWAY_KEY_STRIDE + section["end_km"])
+                section_limits.append(section["speed_limit"])
+                section_local.append(s)
+                section_names.append(section["name"])
+
+            zones = self._merge_zones(highway.get("accident_zones", []))
+            self._zones.append(zones)
+            self._zone_starts.append([start for start, _ in zones])
+            for zone_start, zone_end in zones:
+                zone_start_keys.append(h * HIGHWAY_KEY_STRIDE + zone_start)
+                zone_end_keys.append(h * HIGHWAY_KEY_STRIDE + zone_end)
+
+        self.section_end_keys = np.array(section_keys, dtype=np.float64)
+        self.section_speed_limit = np.array(section_limits, dtype=np.float64)
+        self.section_local_idx = np.array(section_local, dtype=np.int16)
+        self.section_names = section_names
+        self.section_offset = np.array(self.section_offset, dtype=np.int32)
+        self.zone_start_keys = np.array(zone_start_keys, dtype=np.float64)
+        self.zone_end_keys = np.array(zone_end_keys, dtype=np.float64)
+
+    @staticmethod
+    def _merge_zones(zones):
+        """겹치는 사고 다발 구간 병합 (정렬)"""
+        merged = []
+        for start, end in sorted(zones):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    # ------------------------------------------------------------------
+    # 단일 위치 조회 (O(log n))
+    # ------------------------------------------------------------------
+
+    def section(self, highway_name, position_km):
+        """현재 위치의 구간 정보 (범위 밖: 음수는 첫 구간, 나머지는 마지막 구간)"""
+        h = self.highway_pos[highway_name]
+        sections = self._sections[h]
+        if position_km < 0:
+            return sections[0]
+        s = bisect_left(self._section_ends[h], position_km)
+        return sections[min(s, len(sections) - 1)]
+
+    def speed_limit(self, highway_name, position_km):
+        """현재 위치의 제한속도"""
+        return self.section(highway_name, position_km)["speed_limit"]
+
+    def in_accident_zone(self, highway_name, position_km):
+        """사고 다발 지역 여부"""
+        h = self.highway_pos[highway_name]
+        z = bisect_right(self._zone_starts[h], position_km) - 1
+        return z >= 0 and position_km <= self._zones[h][z][1]
+
+    # ------------------------------------------------------------------
+    # 위치 배열 조회 (벡터화)
+    # ------------------------------------------------------------------
+
+    def _keys(self, highway_idx, position_km):
+        """(고속도로 인덱스, km) -> 평탄화 키 (고속도로 범위로 제한)"""
+        pos = np.clip(position_km, 0.0, self.highway_length[highway_idx])
+        return highway_idx * HIGHWAY_KEY_STRIDE + pos
+
+    def lookup_sections(self, highway_idx, position_km):
+        """위치 배열 -> (전역 구간 ID, 제한속도) 배열"""
+        keys = self._keys(highway_idx, position_km)
+        section_ids = np.searchsorted(self.section_end_keys, keys, side="left")
+        # 마지막 구간 끝이 연장보다 짧은 경우에도 해당 고속도로 마지막 구간으로 제한
+        last_ids = np.append(self.section_offset[1:], len(self.section_end_keys)) - 1
+        section_ids = np.minimum(section_ids, last_ids[highway_idx])
+        return section_ids, self.section_speed_limit[section_ids]
+
+    def accident_zone_mask(self, highway_idx, position_km):
+        """위치 배열 -> 사고 다발 지역 여부 배열"""
+        if len(self.zone_start_keys) == 0:
+            return np.zeros(len(position_km), dtype=bool)
+        keys = highway_idx * HIGHWAY_KEY_STRIDE + np.asarray(position_km, dtype=np.float64)
+        z = np.searchsorted(self.zone_start_keys, keys, side="right") - 1
+        valid = z >= 0
+        return valid & (keys <= self.zone_end_keys[np.maximum(z, 0)])
+
+    def names_for(self, section_ids):
+        """전역 구간 ID 배열 -> 구간명 리스트"""
+        names = self.section_names
+        return [names[s] for s in np.asarray(section_ids).tolist()]
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+멀티 프로세스 샤드 시뮬레이터
+- 고속도로별(highway) 또는 차량 ID 해시(hash) 분할로 워커 프로세스 실행
+- 워커마다 독립 HighwaySimulator / InfluxDB 전송기 보유
+- 코디네이터가 워커 시작/정지, 상태 및 처리량 카운터 병합
+"""
+
+import argparse
+import multiprocessing as mp
+import queue
+import random
+import time
+from datetime import datetime
+
+from highway_simulator import HIGHWAYS, INFLUXDB_CONFIG, HighwaySimulator
+from output_sinks import add_sink_arguments, create_sink
+from sim_clock import add_clock_arguments, make_clock
+from tick_scheduler import TickScheduler
+
+
+def _shard_worker(shard, vehicles_per_highway, clock_options, sink_options, stop_event, status_queue,
+                  report_interval):
+    """워커 프로세스 진입점 - 샤드 1개 시뮬레이션 (싱크도 워커별로 생성)"""
+    sink = create_sink(influx=INFLUXDB_CONFIG, prefix=f"highway-shard{shard['shard_id']}", **sink_options)
+    simulator = HighwaySimulator(
+        highway_names=shard["highways"],
+        clock=make_clock(clock_options["speed"], clock_options["start"]),
+        seed=shard["seed"],
+        sink=sink,
+    )
+    simulator.initialize_vehicles(vehicles_per_highway, partition=shard["partition"])
+    scheduler = TickScheduler.from_rate(clock_options["tick_rate"], clock=simulator.clock)
+
+    ticks = 0
+    tick_time_total = 0.0
+    last_report = 0.0
+    scheduler.start()
+
+    try:
+        while not stop_event.is_set():
+            tick_start = time.perf_counter()
+            try:
+                simulator.simulate_tick(simulator.clock.now(), dt=scheduler.period)
+            except Exception as e:
+                print(f"⚠️ 샤드 {shard['shard_id']} 시뮬레이션 오류: {e}")
+            tick_time_total += time.perf_counter() - tick_start
+            ticks += 1
+
+            now = time.monotonic()
+            if now - last_report >= report_interval:
+                last_report = now
+                stats = simulator.sink.snapshot()
+                tick_stats = scheduler.snapshot()
+                stats.update({
+                    "overruns": tick_stats["overruns"],
+                    "skipped_ticks": tick_stats["skipped_ticks"],
+                    "max_lateness": tick_stats["max_lateness"],
+                    "shard_id": shard["shard_id"],
+                    "pid": mp.current_process().pid,
+                    "ticks": ticks,
+                    "vehicles": len(simulator.fleet_engine.state),
+                    "avg_tick_time": tick_time_total / ticks,
+                })
+                status_queue.put(stats)
+
+            # 다음 틱 마감까지 대기 (정지 신호 시 즉시 종료)
+            scheduler.wait(stop_event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+class ShardedSimulationCoordinator:
+    """샤드 워커 프로세스 코디네이터"""
+
+    def __init__(self, mode="highway", num_shards=None, vehicles_per_highway=None, report_interval=10.0,
+                 speed=None, start=None, seed=None, tick_rate=1.0, sink_options=None):
+        if mode not in ("highway", "hash"):
+            raise ValueError(f"지원하지 않는 샤드 모드: {mode}")
+        self.mode = mode
+        self.num_shards = num_shards or (len(HIGHWAYS) if mode == "highway" else mp.cpu_count())
+        # 해시 분할은 모든 샤드가 같은 차량 집합을 나눠 가져야 하므로 차량 수를 한 번만 결정
+        if mode == "hash" and vehicles_per_highway is None:
+            vehicles_per_highway = random.Random(seed).randint(10, 20)
+        self.vehicles_per_highway = vehicles_per_highway
+        self.report_interval = report_interval
+        self.clock_options = {"speed": speed, "start": start, "tick_rate": tick_rate}
+        self.seed = seed
+        self.sink_options = sink_options or {"kind": "influx"}
+
+        self._ctx = mp.get_context("spawn")
+        self._stop_event = self._ctx.Event()
+        self._status_queue = self._ctx.Queue()
+        self.workers = []
+        self.shard_status = {}
+
+    def plan_shards(self):
+        """샤드 구성 (highway: 고속도로 라운드로빈, hash: 전체 고속도로 x 차량 해시 분할)"""
+        highway_names = list(HIGHWAYS.keys())
+        if self.mode == "highway":
+            count = min(self.num_shards, len(highway_names))
+            return [
+                {"shard_id": k, "highways": highway_names[k::count], "partition": None,
+                 "seed": None if self.seed is None else self.seed + k}
+                for k in range(count)
+            ]
+        # 해시 분할: 모든 샤드가 같은 시드로 같은 차량군을 생성한 뒤 자기 몫만 유지
+        return [
+            {"shard_id": k, "highways": highway_names, "partition": (k, self.num_shards), "seed": self.seed}
+            for k in range(self.num_shards)
+        ]
+
+    def start(self):
+        """워커 프로세스 시작"""
+        self._stop_event.clear()
+        for shard in self.plan_shards():
+            worker = self._ctx.Process(
+                target=_shard_worker,
+                args=(shard, self.vehicles_per_highway, self.clock_options, self.sink_options, self._stop_event,
+                      self._status_queue, self.report_interval),
+                name=f"highway-shard-{shard['shard_id']}",
+                daemon=True,
+            )
+            worker.start()
+            self.workers.append(worker)
+            print(f"✅ 샤드 {shard['shard_id']} 시작 (PID {worker.pid}): {', '.join(shard['highways'])}")
+
+    def collect_status(self):
+        """워커 상태 수신 후 병합 결과 반환"""
+        while True:
+            try:
+                stats = self._status_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.shard_status[stats["shard_id"]] = stats
+
+        merged = {
+            "shards": len(self.workers),
+            "alive": sum(1 for w in self.workers if w.is_alive()),
+            "reporting": len(self.shard_status),
+        }
+        for key in ("vehicles", "ticks", "points_enqueued", "points_written",
+                    "points_dropped", "write_errors", "pending", "throughput",
+                    "overruns", "skipped_ticks"):
+            merged[key] = sum(s.get(key, 0) for s in self.shard_status.values())
+        latencies = [s["avg_flush_latency"] for s in self.shard_status.values() if s.get("batches_written")]
+        merged["avg_flush_latency"] = sum(latencies) / len(latencies) if latencies else 0.0
+        merged["max_tick_time"] = max((s["avg_tick_time"] for s in self.shard_status.values()), default=0.0)
+        merged["max_lateness"] = max((s["max_lateness"] for s in self.shard_status.values()), default=0.0)
+        return merged
+
+    def print_status(self):
+        """병합 상태 출력"""
+        merged = self.collect_status()
+        print(f"\n📊 샤드 시뮬레이션 상태 ({datetime.now().strftime('%H:%M:%S')})")
+        print(f"  워커: {merged['alive']}/{merged['shards']} 실행 중 | 차량: {merged['vehicles']}대")
+        print(f"  전송: {merged['points_written']}개 | 처리량: {merged['throughput']:.1f}/초 | "
+              f"폐기: {merged['points_dropped']}개 | 최대 평균 틱: {merged['max_tick_time'] * 1000:.1f}ms")
+        print(f"  마감 초과: {merged['overruns']}회 | 건너뛴 틱: {merged['skipped_ticks']}회 | "
+              f"최대 지연: {merged['max_lateness'] * 1000:.1f}ms")
+
+    def stop(self, timeout=30.0):
+        """정지 신호 전송 후 워커 종료 대기"""
+        self._stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                print(f"⚠️ 샤드 워커 강제 종료: {worker.name}")
+                worker.terminate()
+        final = self.collect_status()
+        self.workers = []
+        print("🛑 샤드 시뮬레이터 정지")
+        return final
+
+    def run(self):
+        """워커 시작 후 주기적으로 병합 상태 출력 (Ctrl+C 로 정지)"""
+        self.start()
+        try:
+            while any(w.is_alive() for w in self.workers):
+                time.sleep(self.report_interval)
+                self.print_status()
+        except KeyboardInterrupt:
+            print("\n\n⚠️ 사용자 중단")
+        finally:
+            self.stop()
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="멀티 프로세스 샤드 고속도로 시뮬레이터")
+    parser.add_argument("--mode", choices=["highway", "hash"], default="highway",
+                        help="분할 방식 (highway: 고속도로별, hash: 차량 ID 해시)")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="워커 수 (기본: highway=고속도로 수, hash=CPU 코어 수)")
+    parser.add_argument("--vehicles-per-highway", type=int, default=None,
+                        help="고속도로당 차량 수 (기본: 10-20대 랜덤)")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="상태 보고 주기 (초)")
+    add_clock_arguments(parser)
+    add_sink_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_args()
+    coordinator = ShardedSimulationCoordinator(
+        mode=args.mode,
+        num_shards=args.shards,
+        vehicles_per_highway=args.vehicles_per_highway,
+        report_interval=args.report_interval,
+        speed=args.speed,
+        start=args.start,
+        seed=args.seed,
+        tick_rate=args.tick_rate,
+        sink_options={"kind": args.sink, "output_dir": args.output_dir,
+                      "rotate_mb": args.rotate_mb, "compress": args.compress},
+    )
+    coordinator.run()
+
+
+if __name__ == "__main__":
+    print("🚛 한국 고속도로별 DTG 샤드 시뮬레이터")
+    print("=" * 50)
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+시뮬레이션 시계
+- WallClock: 실제 시간 (기존 동작)
+- SimulatedClock: N배속 또는 최대 속도 실행, 합성 타임스탬프 생성
+  시뮬레이션 시간은 sleep() 호출로만 진행되므로 같은 시작 시각 + 같은 시드 = 같은 출력
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+# 교통량 패턴(출퇴근 시간대) 판단 기준 시간대
+KST = timezone(timedelta(hours=9))
+
+
+def parse_start_time(value):
+    """ISO 8601 문자열 -> aware datetime (시간대 생략 시 KST)"""
+    start = datetime.fromisoformat(value)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=KST)
+    return start
+
+
+class WallClock:
+    """실제 시간 시계"""
+
+    speed = 1.0
+
+    def now(self):
+        """현재 시각 (UTC)"""
+        return datetime.now(timezone.utc)
+
+    def local_now(self):
+        """현재 시각 (로컬 시간대)"""
+        return datetime.now()
+
+    def sleep(self, seconds, stop_event=None):
+        """대기 (stop_event 지정 시 정지 신호로 즉시 복귀, 정지 여부 반환)"""
+        if stop_event is not None:
+            return stop_event.wait(seconds)
+        time.sleep(seconds)
+        return False
+
+
+class SimulatedClock:
+    """합성 시간 시계 (speed: N배속, None/0 이면 대기 없이 최대 속도)"""
+
+    def __init__(self, start=None, speed=None, local_tz=KST):
+        self._sim_time = start if start is not None else datetime.now(timezone.utc)
+        if self._sim_time.tzinfo is None:
+            self._sim_time = self._sim_time.replace(tzinfo=local_tz)
+        self.speed = speed or None
+        self.local_tz = local_tz
+
+    def now(self):
+        """시뮬레이션 시각 (UTC)"""
+        return self._sim_time.astimezone(timezone.utc)
+
+    def local_now(self):
+        """시뮬레이션 시각 (지정 로컬 시간대)"""
+        return self._sim_time.astimezone(self.local_tz)
+
+    def advance(self, seconds):
+        """시뮬레이션 시간만 진행"""
+        self._sim_time += timedelta(seconds=seconds)
+
+    def sleep(self, seconds, stop_event=None):
+        """시뮬레이션 시간 진행 + 배속에 맞춘 실제 대기, 정지 여부 반환"""
+        self.advance(seconds)
+        if self.speed is None:
+            return stop_event.is_set() if stop_event is not None else False
+        real_seconds = seconds / self.speed
+        if stop_event is not None:
+            return stop_event.wait(real_seconds)
+        time.sleep(real_seconds)
+        return False
+
+
+def make_clock(speed=None, start=None):
+    """명령행 옵션 -> 시계 (speed 미지정 + start 미지정이면 실제 시간)"""
+    if speed is None and start is None:
+        return WallClock()
+    start_time = parse_start_time(start) if isinstance(start, str) else start
+    return SimulatedClock(start=start_time, speed=speed if speed is not None else 1.0)
+
+
+def add_clock_arguments(parser):
+    """시계 / 시드 / 틱 주기 관련 명령행 옵션 등록"""
+    parser.add_argument("--speed", type=float, default=None,
+                        help="시뮬레이션 배속 (0: 대기 없이 최대 속도, 기본: 실제 시간)")
+    parser.add_argument("--start", type=str, default=None,
+                        help="시뮬레이션 시작 시각 ISO 8601 (예: 2025-08-10T06:00:00+09:00)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="난수 시드 (같은 시드 + 같은 --start 이면 동일 출력)")
+    parser.add_argument("--tick-rate", type=float, default=1.0,
+                        help="초당 틱 수 (예: 10 = 100ms 주기, 기본: 1)")
+    return parser
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+고정 주기 틱 스케줄러 (드리프트 보정)
+- "작업 후 sleep(1)" 대신 절대 마감 시각(t0 + k*주기) 기준으로 대기
+  처리 시간이 주기에 누적되지 않아 타임스탬프 지연이 늘어나지 않음
+- 마감 초과(overrun), 건너뛴 틱(skipped) 카운터 제공
+- 1초 미만 주기 및 시뮬레이션 시계(N배속 / 최대 속도) 지원
+"""
+
+import asyncio
+import time
+
+
+class TickScheduler:
+    """절대 마감 시각 기반 고정 주기 스케줄러"""
+
+    def __init__(self, period=1.0, clock=None, skip_missed=True):
+        if period <= 0:
+            raise ValueError("틱 주기는 0보다 커야 합니다")
+        self.period = period
+        self.clock = clock
+        self.skip_missed = skip_missed
+
+        # 실제 대기 주기 (시뮬레이션 배속 반영, 최대 속도면 None)
+        speed = getattr(clock, "speed", 1.0) if clock is not None else 1.0
+        self.real_period = period / speed if speed else None
+
+        self._next_deadline = None
+        self.stats = {
+            "ticks": 0,
+            "overruns": 0,
+            "skipped_ticks": 0,
+            "last_lateness": 0.0,
+            "max_lateness": 0.0,
+            "total_lateness": 0.0,
+        }
+
+    @classmethod
+    def from_rate(cls, rate_hz, clock=None, skip_missed=True):
+        """초당 틱 수로 생성"""
+        return cls(1.0 / rate_hz, clock=clock, skip_missed=skip_missed)
+
+    def start(self):
+        """첫 마감 시각 설정 (미호출 시 첫 wait 에서 자동 설정)"""
+        self._next_deadline = time.monotonic() + (self.real_period or 0.0)
+
+    def _schedule(self):
+        """다음 마감까지 남은 실제 대기 시간 계산 및 마감 갱신"""
+        if self.clock is not None and hasattr(self.clock, "advance"):
+            self.clock.advance(self.period)
+        self.stats["ticks"] += 1
+
+        if self.real_period is None:
+            return 0.0
+        if self._next_deadline is None:
+            self.start()
+
+        now = time.monotonic()
+        deadline = self._next_deadline
+        if now <= deadline:
+            self._next_deadline = deadline + self.real_period
+            self.stats["last_lateness"] = 0.0
+            return deadline - now
+
+        # 마감 초과: 즉시 실행, 한 주기 이상 밀린 틱은 건너뛰어 위상 유지
+        lateness = now - deadline
+        self.stats["overruns"] += 1
+        self.stats["last_lateness"] = lateness
+        self.stats["total_lateness"] += lateness
+        self.stats["max_lateness"] = max(self.stats["max_lateness"], lateness)
+
+        missed = int(lateness // self.real_period)
+        if self.skip_missed and missed:
+            self.stats["skipped_ticks"] += missed
+            self._next_deadline = deadline + (missed + 1) * self.real_period
+        else:
+            self._next_deadline = deadline + self.real_period
+        return 0.0
+
+    def wait(self, stop_event=None):
+        """다음 틱까지 대기 (stop_event 지정 시 정지 신호로 즉시 복귀, 정지 여부 반환)"""
+        delay = self._schedule()
+        if stop_event is not None:
+            return stop_event.wait(delay) if delay > 0 else stop_event.is_set()
+        if delay > 0:
+            time.sleep(delay)
+        return False
+
+    async def wait_async(self):
+        """다음 틱까지 비동기 대기"""
+        delay = self._schedule()
+        await asyncio.sleep(delay)
+
+    def snapshot(self):
+        """틱 / 지연 지표 요약"""
+        stats = dict(self.stats)
+        overruns = stats["overruns"]
+        stats["period"] = self.period
+        stats["avg_lateness"] = stats["total_lateness"] / overruns if overruns else 0.0
+        return stats
@@ -10,34 +10,22 @@
 
 import time
 import random
-import math
+import argparse
 import numpy as np
 from datetime import datetime, timezone
-from influxdb_client import InfluxDBClient, Point, WritePrecision
-from influxdb_client.client.write_api import SYNCHRONOUS
+
+from line_protocol import LineProtocolSerializer
+from output_sinks import RecordBatch, add_sink_arguments, create_sink
+from physics_kernel import physics_batch
+from sim_clock import add_clock_arguments, make_clock
+from tick_scheduler import TickScheduler
 
 # InfluxDB 설정
 INFLUXDB_URL = "http://localhost:8086"
 INFLUXDB_TOKEN = "glec-admin-token-123456789"
 INFLUXDB_ORG = "glec"
 INFLUXDB_BUCKET = "dtg_metrics"
-
-print("🏆 궁극의 v9.3 완전 통합 시뮬레이터")
-print("=" * 80)
-print("📋 15개 핵심 요구사항 + v7.3 70개 차트 데이터 + 시급성 분류체계")
-print("=" * 80)
-print(f"시작 시간: {datetime.now().strftime('%H:%M:%S')}")
-print("Ctrl+C로 중지")
-print("-" * 80)
-
-# InfluxDB 연결
-try:
-    client = InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG)
-    write_api = client.write_api(write_options=SYNCHRONOUS)
-    print("✅ InfluxDB 연결 성공")
-except Exception as e:
-    print(f"❌ InfluxDB 연결 실패: {e}")
-    exit(1)
+INFLUXDB_CONFIG = {"url": INFLUXDB_URL, "token": INFLUXDB_TOKEN, "org": INFLUXDB_ORG, "bucket": INFLUXDB_BUCKET}
 
 # 차량 정보 (15개 요구사항 기반)
 vehicles = [
@@ -63,13 +51,6 @@ vehicles = [
     }
 ]
 
-# 물리 상수 (15개 요구사항)
-DIESEL_CO2_FACTOR = 3.2  # kgCO2e/L (Well-to-Wheel)
-AIR_DENSITY = 1.225  # kg/m³
-DRAG_COEFFICIENT = 0.7  # 화물차 공기저항계수
-ROLLING_RESISTANCE = 0.008  # 구름저항계수
-GRAVITY = 9.81  # m/s²
-
 # 시급성 분류별 임베딩 차원 (v7.3 통합)
 URGENCY_DIMENSIONS = {
     "CRITICAL": 1024,
@@ -106,259 +87,283 @@ DRIVING_PATTERNS = ["safe", "aggressive", "normal", "fatigued", "economic", "def
 # 날씨 조건 (15개 요구사항)
 WEATHER_CONDITIONS = ["clear", "rain", "fog", "snow", "wind"]
 WEATHER_RISK = {"clear": 0.1, "rain": 0.4, "fog": 0.7, "snow": 0.8, "wind": 0.3}
+PATTERN_RISK = {"safe": 0.1, "aggressive": 0.8, "normal": 0.3, "fatigued": 0.7, "economic": 0.2, "defensive": 0.1}
+
+# 배치 생성용 조회 테이블 (인덱스 -> 위험도 / 임베딩 차원)
+WEATHER_RISK_TABLE = np.array([WEATHER_RISK[w] for w in WEATHER_CONDITIONS], dtype=np.float64)
+PATTERN_RISK_TABLE = np.array([PATTERN_RISK[p] for p in DRIVING_PATTERNS], dtype=np.float64)
+URGENCY_LEVELS = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "NORMAL"]
+URGENCY_DIMENSION_TABLE = np.array([URGENCY_DIMENSIONS[u] for u in URGENCY_LEVELS], dtype=np.float64)
+
+# dtg_simulation_v93 라인 프로토콜 스키마 (ComprehensiveBatchGenerator 의 태그 / 숫자 필드)
+SIMULATION_SERIALIZER = LineProtocolSerializer(
+    "dtg_simulation_v93",
+    tag_keys=["vehicle_id", "truck_class", "highway", "weather", "pattern", "urgency"],
+    field_keys=[
+        "vehicle_speed", "vehicle_rpm", "gear", "acceleration", "fuel_efficiency_kmpl",
+        "co2_emission", "co2_per_km", "total_weight", "drag_force", "rolling_force",
+        "cargo_weight", "weight_ratio", "location_x", "location_y", "accident_risk",
+        "route_progress", "safety_score", "data_consistency",
+        "embedding_dimension", "fatigue_level", "attention_level", "stress_index", "eco_score",
+        "engine_temp", "transmission_temperature", "battery_voltage", "coolant_level",
+        "tire_pressure_avg", "j1939_health",
+        "prediction_30min", "maintenance_prediction", "location_prediction",
+        "total_distance", "driving_time", "fuel_consumed"
+    ],
+    significant_digits=10
+)
+
+def urgency_index(safety_score, vehicle_speed, weather_risk):
+    """시급성 분류 (SEMANTIC_EMBEDDING_STANDARD_v3) -> URGENCY_LEVELS 인덱스 (스칼라 또는 배열)"""
+    safety_score = np.asarray(safety_score)
+    return np.select(
+        [(safety_score < 60) | (np.asarray(vehicle_speed) > 95), (safety_score < 75) | (np.asarray(weather_risk) > 0.5),
+         safety_score < 85, safety_score < 95],
+        [0, 1, 2, 3],
+        default=4,
+    )
 
 def calculate_physics_based_data(vehicle, current_data, dt=1.0):
-    """물리 법칙 기반 데이터 계산 (15개 요구사항)"""
-    
-    # 현재 상태
-    speed_ms = current_data.get("vehicle_speed", 0) / 3.6  # km/h -> m/s
-    total_weight = vehicle["empty_weight"] + current_data.get("cargo_weight", 0)
-    
+    """물리 법칙 기반 데이터 계산 (15개 요구사항)
+
+    physics_kernel.physics_batch 를 길이 1 배열로 호출 -> 물리 검증 규칙과 같은 변속 / RPM 테이블 사용
+    """
     # 목표 속도 (80-100 km/h, 요구사항 1)
     target_speed_kmh = random.uniform(80, 100)
-    target_speed_ms = target_speed_kmh / 3.6
-    
-    # 뉴턴 제2법칙: F = ma
-    speed_diff = target_speed_ms - speed_ms
-    acceleration = np.clip(speed_diff * 0.1, -3.0, 2.0)  # m/s²
-    
-    # 공기저항력과 구름저항력
-    frontal_area = vehicle["tonnage"] * 2.5 + 8.0  # 추정 전면면적 (m²)
-    drag_force = 0.5 * AIR_DENSITY * DRAG_COEFFICIENT * frontal_area * speed_ms**2
-    rolling_force = ROLLING_RESISTANCE * total_weight * GRAVITY
-    
-    # 새로운 속도
-    new_speed_ms = speed_ms + acceleration * dt
-    new_speed_kmh = new_speed_ms * 3.6
-    new_speed_kmh = np.clip(new_speed_kmh, 0, 110)
-    
-    # 기어 계산 (물리적 관계)
-    if new_speed_kmh < 30:
-        gear = 1.0
-    elif new_speed_kmh < 50:
-        gear = 2.0
-    elif new_speed_kmh < 70:
-        gear = 3.0
-    elif new_speed_kmh < 90:
-        gear = 4.0
-    else:
-        gear = 5.0
-    
-    # RPM 계산 (기어비×바퀴 회전수, 요구사항 1)
-    gear_ratios = {1.0: 4.5, 2.0: 2.8, 3.0: 1.8, 4.0: 1.3, 5.0: 1.0}
-    final_drive = 3.5
-    wheel_rpm = (new_speed_ms * 60) / (2 * math.pi * 0.5)  # 바퀴 반지름 0.5m 가정
-    engine_rpm = wheel_rpm * gear_ratios.get(gear, 1.0) * final_drive
-    engine_rpm = np.clip(engine_rpm, 800, 2500)
-    
-    # 연료 소비 계산 (톤급별, 요구사항 2)
-    base_fuel_eff = vehicle["fuel_eff"]
-    weight_penalty = (current_data.get("cargo_weight", 0) / vehicle["max_cargo"]) * 0.2
-    speed_penalty = max(0, (new_speed_kmh - 80) / 20) * 0.15
-    actual_fuel_eff = base_fuel_eff * (1 - weight_penalty - speed_penalty)
-    
-    fuel_rate_l_per_hour = new_speed_kmh / actual_fuel_eff
-    fuel_consumed_per_sec = fuel_rate_l_per_hour / 3600
-    
-    # CO2 배출량 계산 (Well-to-Wheel, 요구사항 3)
-    co2_emission = fuel_consumed_per_sec * DIESEL_CO2_FACTOR  # kgCO2e/s
-    co2_per_km = (co2_emission * 3600) / new_speed_kmh if new_speed_kmh > 0 else 0
-    
-    return {
-        "vehicle_speed": new_speed_kmh,
-        "vehicle_rpm": engine_rpm,
-        "gear": gear,
-        "acceleration": acceleration,
-        "fuel_efficiency_kmpl": actual_fuel_eff,
-        "co2_emission": co2_emission * 60,  # kg/min
-        "co2_per_km": co2_per_km,
-        "total_weight": total_weight,
-        "drag_force": drag_force,
-        "rolling_force": rolling_force
-    }
+    physics = physics_batch(
+        [current_data.get("vehicle_speed", 0)], [current_data.get("cargo_weight", 0)],
+        [vehicle["empty_weight"]], [vehicle["tonnage"]], [vehicle["fuel_eff"]], [vehicle["max_cargo"]],
+        [target_speed_kmh], dt,
+    )
+    return {field: float(values[0]) for field, values in physics.items()}
 
-def generate_comprehensive_data(vehicle, simulation_time):
-    """완전 통합 데이터 생성 (v7.3 + 15개 요구사항)"""
-    
-    # 기본 화물 정보
-    cargo_weight = random.uniform(0.3, 0.9) * vehicle["max_cargo"]
-    weather = random.choice(WEATHER_CONDITIONS)
-    pattern = random.choice(DRIVING_PATTERNS)
-    
-    # GPS 좌표 (한국 고속도로, 요구사항 4)
-    gps_range = KOREA_GPS[vehicle["highway"]]
-    location_x = random.uniform(gps_range["lat_range"][0], gps_range["lat_range"][1])
-    location_y = random.uniform(gps_range["lon_range"][0], gps_range["lon_range"][1])
-    
-    # 물류창고 경로 (요구사항 7)
-    origin = random.choice(LOGISTICS_CENTERS)
-    destination = random.choice([lc for lc in LOGISTICS_CENTERS if lc != origin])
-    route_progress = random.uniform(0, 100)
-    
-    # 기본 물리 데이터
-    base_data = {"cargo_weight": cargo_weight, "vehicle_speed": vehicle["base_speed"]}
-    physics_data = calculate_physics_based_data(vehicle, base_data)
-    
-    # 안전 분석 (GPT-OSS 통합, 요구사항 8)
-    weather_risk = WEATHER_RISK[weather]
-    pattern_risk = {"safe": 0.1, "aggressive": 0.8, "normal": 0.3, "fatigued": 0.7, "economic": 0.2, "defensive": 0.1}
-    base_safety = 90 - (weather_risk * 20) - (pattern_risk[pattern] * 30)
-    safety_score = max(50, min(100, base_safety + random.uniform(-5, 5)))
-    
-    # 시급성 분류 (SEMANTIC_EMBEDDING_STANDARD_v3)
-    if safety_score < 60 or physics_data["vehicle_speed"] > 95:
-        urgency = "CRITICAL"
-    elif safety_score < 75 or weather_risk > 0.5:
-        urgency = "HIGH"
-    elif safety_score < 85:
-        urgency = "MEDIUM"
-    elif safety_score < 95:
-        urgency = "LOW"
-    else:
-        urgency = "NORMAL"
-    
-    # v7.3 임베딩 관련 데이터
-    embedding_dimension = URGENCY_DIMENSIONS[urgency]
-    
-    # 운전자 상태 (v7.3)
-    fatigue_level = random.uniform(0, 100) if pattern == "fatigued" else random.uniform(0, 30)
-    attention_level = max(0, 100 - fatigue_level + random.uniform(-10, 10))
-    stress_index = weather_risk * 50 + (100 - safety_score) * 0.5
-    
-    # J1939 센서 데이터 (67종 센서)
-    engine_temp = random.uniform(80, 95) + (weather_risk * 10)
-    transmission_temp = random.uniform(70, 90) + random.uniform(-5, 10)
-    battery_voltage = random.uniform(12.0, 14.4)
-    coolant_level = random.uniform(85, 100)
-    
-    # 타이어 압력 (4륜)
-    base_pressure = 100 if vehicle["tonnage"] > 8 else 80
-    tire_pressures = [base_pressure + random.uniform(-5, 5) for _ in range(4)]
-    tire_pressure_avg = sum(tire_pressures) / 4
-    
-    # 예측 분석 (AI 기반)
-    prediction_30min = {
-        "speed": physics_data["vehicle_speed"] + random.uniform(-10, 10),
-        "fatigue": min(100, fatigue_level + random.uniform(0, 15)),
-        "fuel": physics_data["fuel_efficiency_kmpl"] * (1 + random.uniform(-0.1, 0.05))
-    }
-    
-    # 경제운전 점수
-    eco_score = (physics_data["fuel_efficiency_kmpl"] / vehicle["fuel_eff"]) * 100
-    eco_score = max(0, min(120, eco_score))
-    
-    return {
-        # 15개 핵심 요구사항 데이터
-        **physics_data,
-        "cargo_weight": cargo_weight,
-        "weight_ratio": cargo_weight / vehicle["max_cargo"],
-        "location_x": location_x,
-        "location_y": location_y,
-        "weather_condition": weather,
-        "accident_risk": weather_risk * 100,
-        "route_progress": route_progress,
-        "safety_score": safety_score,
-        "data_consistency": random.uniform(85, 100),
-        
-        # v7.3 임베딩 데이터
-        "driving_pattern": pattern,
-        "urgency_level": urgency,
-        "embedding_dimension": embedding_dimension,
-        "fatigue_level": fatigue_level,
-        "attention_level": attention_level,
-        "stress_index": stress_index,
-        "eco_score": eco_score,
-        
-        # J1939 센서 데이터
-        "engine_temp": engine_temp,
-        "transmission_temperature": transmission_temp,
-        "battery_voltage": battery_voltage,
-        "coolant_level": coolant_level,
-        "tire_pressure_avg": tire_pressure_avg,
-        "j1939_health": random.uniform(90, 100),
-        
-        # 예측 분석
-        "prediction_30min": prediction_30min["speed"],
-        "maintenance_prediction": random.uniform(30, 180),  # 일
-        "location_prediction": random.uniform(50, 500),     # km
-        
-        # 운행 통계
-        "total_distance": random.uniform(100, 1000),
-        "driving_time": random.uniform(60, 480),  # 분
-        "fuel_consumed": random.uniform(10, 100)  # L
-    }
+def build_fleet(count=None):
+    """차량 템플릿(vehicles)을 순환 복제해 count 대 차량 목록 생성 (미지정 시 기본 5대)"""
+    if count is None:
+        return list(vehicles)
+    fleet = []
+    for i in range(count):
+        template = vehicles[i % len(vehicles)]
+        fleet.append({**template, "id": f"TRUCK_{template['tonnage']}T_{i + 1:03d}"})
+    return fleet
+
+
+class ComprehensiveBatchGenerator:
+    """차량군 완전 통합 데이터 배치 생성기 (v7.3 + 15개 요구사항)
+
+    한 번 호출로 차량 N대의 레코드를 컬럼 배열로 생성 (난수는 인스턴스 rng, seed 로 재현 가능)
+    """
+
+    def __init__(self, fleet=None, rng=None, seed=None):
+        self.fleet = list(fleet) if fleet is not None else list(vehicles)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+        # 차량별 고정 제원 컬럼
+        fleet = self.fleet
+        self.tonnage = np.array([v["tonnage"] for v in fleet], dtype=np.float64)
+        self.base_speed = np.array([v["base_speed"] for v in fleet], dtype=np.float64)
+        self.fuel_eff = np.array([v["fuel_eff"] for v in fleet], dtype=np.float64)
+        self.empty_weight = np.array([v["empty_weight"] for v in fleet], dtype=np.float64)
+        self.max_cargo = np.array([v["max_cargo"] for v in fleet], dtype=np.float64)
+        self.lat_range = np.array([KOREA_GPS[v["highway"]]["lat_range"] for v in fleet], dtype=np.float64)
+        self.lon_range = np.array([KOREA_GPS[v["highway"]]["lon_range"] for v in fleet], dtype=np.float64)
+        self.base_pressure = np.where(self.tonnage > 8, 100.0, 80.0)
+
+        # 고정 태그 컬럼
+        self.vehicle_ids = [v["id"] for v in fleet]
+        self.truck_classes = [f"{v['tonnage']}T" for v in fleet]
+        self.highways = [v["highway"] for v in fleet]
+
+        self._weather_names = np.array(WEATHER_CONDITIONS, dtype=object)
+        self._pattern_names = np.array(DRIVING_PATTERNS, dtype=object)
+        self._urgency_names = np.array(URGENCY_LEVELS, dtype=object)
+        self._fatigued_idx = DRIVING_PATTERNS.index("fatigued")
+
+    def __len__(self):
+        return len(self.fleet)
+
+    def _physics(self, cargo_weight, dt=1.0):
+        """calculate_physics_based_data 의 배열 버전 (physics_kernel 사용)"""
+        target_speed_kmh = self.rng.uniform(80, 100, len(self.fleet))
+        return physics_batch(self.base_speed, cargo_weight, self.empty_weight, self.tonnage,
+                             self.fuel_eff, self.max_cargo, target_speed_kmh, dt)
+
+    def generate_columns(self):
+        """차량군 1틱 데이터 -> (태그 컬럼 dict, 필드 컬럼 dict)"""
+        rng = self.rng
+        n = len(self.fleet)
+
+        # 기본 화물 / 날씨 / 운전 패턴
+        cargo_weight = rng.uniform(0.3, 0.9, n) * self.max_cargo
+        weather_idx = rng.integers(0, len(WEATHER_CONDITIONS), n)
+        pattern_idx = rng.integers(0, len(DRIVING_PATTERNS), n)
+
+        # GPS 좌표 / 경로 진행률
+        location_x = rng.uniform(self.lat_range[:, 0], self.lat_range[:, 1])
+        location_y = rng.uniform(self.lon_range[:, 0], self.lon_range[:, 1])
+        route_progress = rng.uniform(0, 100, n)
+
+        fields = self._physics(cargo_weight)
+        speed = fields["vehicle_speed"]
+
+        # 안전 분석
+        weather_risk = WEATHER_RISK_TABLE[weather_idx]
+        base_safety = 90 - weather_risk * 20 - PATTERN_RISK_TABLE[pattern_idx] * 30
+        safety_score = np.clip(base_safety + rng.uniform(-5, 5, n), 50, 100)
+
+        # 시급성 분류 (URGENCY_LEVELS 인덱스)
+        urgency_idx = urgency_index(safety_score, speed, weather_risk)
+
+        # 운전자 상태
+        fatigue_level = rng.uniform(0, 1, n) * np.where(pattern_idx == self._fatigued_idx, 100.0, 30.0)
+        attention_level = np.maximum(0, 100 - fatigue_level + rng.uniform(-10, 10, n))
 
-data_count = 0
-start_time = time.time()
-
-try:
-    while True:
-        points = []
-        current_time = datetime.now(timezone.utc)
-        
-        for vehicle in vehicles:
-            # 완전 통합 데이터 생성
-            data = generate_comprehensive_data(vehicle, current_time)
-            
-            # InfluxDB 포인트 생성
-            point = Point("dtg_simulation_v93") \
-                .tag("vehicle_id", vehicle["id"]) \
-                .tag("truck_class", f"{vehicle['tonnage']}T") \
-                .tag("highway", vehicle["highway"]) \
-                .tag("weather", data["weather_condition"]) \
-                .tag("pattern", data["driving_pattern"]) \
-                .tag("urgency", data["urgency_level"]) \
-                .time(current_time, WritePrecision.NS)
-            
-            # 모든 데이터 필드 추가
-            for field_name, field_value in data.items():
-                if isinstance(field_value, (int, float)) and not isinstance(field_value, bool):
-                    try:
-                        point = point.field(field_name, float(field_value))
-                    except (ValueError, TypeError):
-                        continue
-            
-            points.append(point)
-        
-        # 데이터 전송
-        if points:
-            write_api.write(bucket=INFLUXDB_BUCKET, org=INFLUXDB_ORG, record=points)
-            data_count += len(points)
-        
-        # 상태 출력 (30초마다)
-        if data_count % 150 == 0:  # 5대 차량 × 30초
-            elapsed = time.time() - start_time
-            rate = data_count / elapsed if elapsed > 0 else 0
-            
-            print(f"📊 전송: {data_count}개 | 속도: {rate:.1f}/초 | 시간: {datetime.now().strftime('%H:%M:%S')}")
-            print("   📋 최신 데이터:")
-            
-            for vehicle in vehicles:
-                sample_data = generate_comprehensive_data(vehicle, current_time)
-                print(f"   🚛 {vehicle['id']}: {sample_data['vehicle_speed']:.1f}km/h, "
-                      f"안전:{sample_data['safety_score']:.0f}점, "
-                      f"시급성:{sample_data['urgency_level']}")
-        
-        time.sleep(1)
-        
-except KeyboardInterrupt:
-    print(f"\n⏹️ 시뮬레이션 중지")
-    print(f"📈 총 전송 데이터: {data_count}개")
-    
-except Exception as e:
-    print(f"\n❌ 오류 발생: {e}")
-    import traceback
-    traceback.print_exc()
-    
-finally:
+        eco_score = np.clip(fields["fuel_efficiency_kmpl"] / self.fuel_eff * 100, 0, 120)
+
+        fields.update({
+            "cargo_weight": cargo_weight,
+            "weight_ratio": cargo_weight / self.max_cargo,
+            "location_x": location_x,
+            "location_y": location_y,
+            "accident_risk": weather_risk * 100,
+            "route_progress": route_progress,
+            "safety_score": safety_score,
+            "data_consistency": rng.uniform(85, 100, n),
+            "embedding_dimension": URGENCY_DIMENSION_TABLE[urgency_idx],
+            "fatigue_level": fatigue_level,
+            "attention_level": attention_level,
+            "stress_index": weather_risk * 50 + (100 - safety_score) * 0.5,
+            "eco_score": eco_score,
+            "engine_temp": rng.uniform(80, 95, n) + weather_risk * 10,
+            "transmission_temperature": rng.uniform(70, 90, n) + rng.uniform(-5, 10, n),
+            "battery_voltage": rng.uniform(12.0, 14.4, n),
+            "coolant_level": rng.uniform(85, 100, n),
+            "tire_pressure_avg": self.base_pressure + rng.uniform(-5, 5, (n, 4)).mean(axis=1),
+            "j1939_health": rng.uniform(90, 100, n),
+            "prediction_30min": speed + rng.uniform(-10, 10, n),
+            "maintenance_prediction": rng.uniform(30, 180, n),
+            "location_prediction": rng.uniform(50, 500, n),
+            "total_distance": rng.uniform(100, 1000, n),
+            "driving_time": rng.uniform(60, 480, n),
+            "fuel_consumed": rng.uniform(10, 100, n),
+        })
+
+        tags = {
+            "vehicle_id": self.vehicle_ids,
+            "truck_class": self.truck_classes,
+            "highway": self.highways,
+            "weather": self._weather_names[weather_idx].tolist(),
+            "pattern": self._pattern_names[pattern_idx].tolist(),
+            "urgency": self._urgency_names[urgency_idx].tolist(),
+        }
+        return tags, fields
+
+    def generate(self, simulation_time):
+        """차량군 1틱 데이터 -> RecordBatch (dtg_simulation_v93 스키마)"""
+        tags, fields = self.generate_columns()
+        return RecordBatch(
+            SIMULATION_SERIALIZER,
+            [tags[key] for key in SIMULATION_SERIALIZER.tag_keys],
+            [fields[key] for key in SIMULATION_SERIALIZER.field_keys],
+            simulation_time,
+        )
+
+
+def print_status(batch, data_count, start_time, sink, scheduler, sample_size=5):
+    """전송 / 지연 상태와 방금 생성한 배치의 최신 데이터 출력"""
+    elapsed = time.time() - start_time
+    rate = data_count / elapsed if elapsed > 0 else 0
+
+    stats = sink.snapshot()
+    print(f"📊 전송: {data_count}개 | 속도: {rate:.1f}/초 | 시간: {datetime.now().strftime('%H:%M:%S')}")
+    print(f"   ⏱️ 배치 지연: 평균 {stats['avg_flush_latency'] * 1000:.1f}ms | "
+          f"대기: {stats['pending']}개 | 폐기: {stats['points_dropped']}개")
+    ticks = scheduler.snapshot()
+    print(f"   ⏰ 마감 초과: {ticks['overruns']}회 | 건너뛴 틱: {ticks['skipped_ticks']}회")
+    print("   📋 최신 데이터:")
+
+    columns = batch.to_columns()
+    for i in range(min(len(batch), sample_size)):
+        print(f"   🚛 {columns['vehicle_id'][i]}: {columns['vehicle_speed'][i]:.1f}km/h, "
+              f"안전:{columns['safety_score'][i]:.0f}점, "
+              f"시급성:{columns['urgency'][i]}")
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="궁극의 v9.3 완전 통합 시뮬레이터")
+    parser.add_argument("--vehicles", type=int, default=None,
+                        help="시뮬레이션 차량 수 (기본: 템플릿 5대)")
+    add_clock_arguments(parser)
+    add_sink_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수 (같은 시드 + 같은 --start 이면 동일 출력)"""
+    args = parse_args()
+    clock = make_clock(args.speed, args.start)
+    scheduler = TickScheduler.from_rate(args.tick_rate, clock=clock)
+
+    print("🏆 궁극의 v9.3 완전 통합 시뮬레이터")
+    print("=" * 80)
+    print("📋 15개 핵심 요구사항 + v7.3 70개 차트 데이터 + 시급성 분류체계")
+    print("=" * 80)
+    print(f"시작 시간: {datetime.now().strftime('%H:%M:%S')}")
+    print("Ctrl+C로 중지")
+    print("-" * 80)
+
+    # 출력 싱크 연결
     try:
-        client.close()
-        print("✅ InfluxDB 연결 종료")
-    except:
-        pass
-
-print("=" * 80)
-print("🏆 궁극의 v9.3 완전 통합 시뮬레이션 완료!")
-print("📊 궁극의 대시보드: http://localhost:3000/d/glec-dtg-v93-ultimate")
-print("📈 모든 요구사항과 임베딩 데이터가 완벽하게 구현되었습니다.")
-print("=" * 80)
\ No newline at end of file
+        sink = create_sink(args.sink, influx=INFLUXDB_CONFIG, output_dir=args.output_dir, prefix="simulation_v93",
+                           rotate_mb=args.rotate_mb, compress=args.compress)
+        print(f"✅ 출력 싱크 연결 성공: {args.sink}")
+    except Exception as e:
+        print(f"❌ 출력 싱크 연결 실패: {e}")
+        exit(1)
+
+    generator = ComprehensiveBatchGenerator(build_fleet(args.vehicles), seed=args.seed)
+
+    data_count = 0
+    tick_count = 0
+    start_time = time.time()
+    scheduler.start()
+
+    try:
+        while True:
+            # 완전 통합 데이터 생성 및 전송
+            batch = generator.generate(clock.now())
+            data_count += sink.write(batch)
+            tick_count += 1
+
+            # 상태 출력 (30틱마다, 방금 전송한 배치 재사용)
+            if tick_count % 30 == 0:
+                print_status(batch, data_count, start_time, sink, scheduler)
+
+            scheduler.wait()
+
+    except KeyboardInterrupt:
+        print(f"\n⏹️ 시뮬레이션 중지")
+        print(f"📈 총 전송 데이터: {data_count}개")
+
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+
+    finally:
+        try:
+            sink.close()
+            print("✅ 출력 싱크 종료")
+        except:
+            pass
+
+    print("=" * 80)
+    print("🏆 궁극의 v9.3 완전 통합 시뮬레이션 완료!")
+    print("📊 궁극의 대시보드: http://localhost:3000/d/glec-dtg-v93-ultimate")
+    print("📈 모든 요구사항과 임베딩 데이터가 완벽하게 구현되었습니다.")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
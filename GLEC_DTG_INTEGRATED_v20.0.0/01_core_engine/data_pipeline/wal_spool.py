@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+저장소 장애 대비 디스크 선행 기록 스풀 (write-ahead spool)
+- 추가 전용 세그먼트 파일: segment-00000001.wal, ... (segment_bytes 초과 시 다음 세그먼트로 회전)
+- 항목 1개 = 레코드 배치 1개: [압축 길이, 레코드 수, CRC32] 헤더 + zlib 압축 JSON
+- 재생 위치(cursor.json) 는 재생 성공 후에만 전진 (원자적 교체), 다 읽은 세그먼트는 삭제
+  커밋 직전 중단되면 해당 배치는 다시 재생됨 (최소 1회 전달, InfluxDB 는 같은 시리즈/시각 덮어쓰기)
+- 재시작 시 세그먼트를 검사해 CRC 가 맞지 않는 꼬리(기록 중 중단)는 잘라내고 새 세그먼트에서 추가 시작
+- 디스크 상한(max_bytes) 초과 시 가장 오래된 세그먼트부터 폐기 (evicted_records 로 집계)
+- 모든 항목은 추가 순서(FIFO)로 재생 -> 차량별 순서 보존
+- 재생이 영구 오류로 실패한 항목은 dead-letter-00000001.wal ... 로 옮기고 재생 위치를 넘김
+  (항목 = {"error", "records"}, 상한 max_dead_letter_bytes 초과 시 오래된 파일부터 삭제, iter_dead_letters 로 조회)
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from line_protocol import to_timestamp_ns
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".wal"
+DEAD_LETTER_PREFIX = "dead-letter-"
+CURSOR_FILE = "cursor.json"
+# 압축 페이로드 길이, 레코드 수, 페이로드 CRC32
+ENTRY_HEADER = struct.Struct("<III")
+
+
+def _encode_default(value):
+    """JSON 기본 변환 불가 값: datetime -> 나노초 정수, NumPy 스칼라 -> 파이썬 값"""
+    if isinstance(value, datetime):
+        return to_timestamp_ns(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"스풀 직렬화 불가: {type(value).__name__}")
+
+
+class WriteAheadSpool:
+    """세그먼트 회전형 FIFO 스풀 (추가 / 재생 스레드 안전)"""
+
+    def __init__(self, directory, segment_bytes=64 * 1024 * 1024, max_bytes=4 * 1024 ** 3, fsync=True,
+                 compress_level=1, max_dead_letter_bytes=None):
+        if max_bytes < 2 * segment_bytes:
+            raise ValueError("max_bytes 는 segment_bytes 의 2배 이상이어야 합니다")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self.compress_level = compress_level
+        self.max_dead_letter_bytes = 2 * segment_bytes if max_dead_letter_bytes is None else max_dead_letter_bytes
+
+        self._lock = threading.Lock()
+        # [번호, 바이트, 미재생 레코드 수], 오래된 순. 재생 위치는 항상 첫 세그먼트 안
+        self._segments = []
+        self._read_number = 0
+        self._read_offset = 0
+        self._reader = None  # (번호, 파일)
+        self._writer = None
+        # 격리 파일 [번호, 바이트], 오래된 순 (기록 파일은 첫 격리 시 생성)
+        self._dead_letters = []
+        self._dead_writer = None
+        self.stats = {
+            "appended_batches": 0,
+            "appended_records": 0,
+            "replayed_batches": 0,
+            "replayed_records": 0,
+            "rotations": 0,
+            "evicted_segments": 0,
+            "evicted_records": 0,
+            "truncated_bytes": 0,
+            "corrupt_entries": 0,
+            "dead_letter_batches": 0,
+            "dead_letter_records": 0,
+            "dead_letter_evicted": 0,
+        }
+        self._recover()
+
+    def _path(self, number):
+        return self.directory / f"{SEGMENT_PREFIX}{number:08d}{SEGMENT_SUFFIX}"
+
+    def _dead_letter_path(self, number):
+        return self.directory / f"{DEAD_LETTER_PREFIX}{number:08d}{SEGMENT_SUFFIX}"
+
+    def _encode(self, document, count):
+        """문서 -> 항목 바이트 (헤더 + zlib 압축 JSON)"""
+        payload = zlib.compress(json.dumps(document, separators=(",", ":"), default=_encode_default).encode(),
+                                self.compress_level)
+        return ENTRY_HEADER.pack(len(payload), count, zlib.crc32(payload)) + payload
+
+    def _write_entry(self, handle, entry):
+        handle.write(entry)
+        handle.flush()
+        if self.fsync:
+            os.fsync(handle.fileno())
+
+    def _load_cursor(self):
+        try:
+            with open(self.directory / CURSOR_FILE, encoding="utf-8") as f:
+                cursor = json.load(f)
+            return int(cursor["segment"]), int(cursor["offset"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_cursor(self):
+        path = self.directory / CURSOR_FILE
+        temp = path.with_suffix(".tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"segment": self._read_number, "offset": self._read_offset}, f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp, path)
+
+    def _scan(self, number, start):
+        """세그먼트 검사 -> (유효 바이트, start 이후 레코드 수), 손상된 꼬리는 잘라냄"""
+        path = self._path(number)
+        offset, records = 0, 0
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(ENTRY_HEADER.size)
+                if len(header) < ENTRY_HEADER.size:
+                    break
+                length, count, crc = ENTRY_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                if offset >= start:
+                    records += count
+                offset += ENTRY_HEADER.size + length
+        size = path.stat().st_size
+        if size > offset:
+            os.truncate(path, offset)
+            self.stats["truncated_bytes"] += size - offset
+        return offset, records
+
+    def _recover(self):
+        """기존 세그먼트 / 재생 위치 복구 후 새 활성 세그먼트 열기"""
+        numbers = sorted(int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                         for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+        cursor = self._load_cursor() or (0, 0)
+        for number in numbers:
+            if number < cursor[0]:
+                self._path(number).unlink()  # 재생 완료 후 삭제 전 중단된 세그먼트
+                continue
+            start = cursor[1] if number == cursor[0] else 0
+            size, records = self._scan(number, start)
+            if records:
+                self._segments.append([number, size, records])
+                if not self._read_number:
+                    self._read_number, self._read_offset = number, start
+            else:
+                self._path(number).unlink()
+        self._dead_letters = sorted(
+            [int(path.name[len(DEAD_LETTER_PREFIX):-len(SEGMENT_SUFFIX)]), path.stat().st_size]
+            for path in self.directory.glob(f"{DEAD_LETTER_PREFIX}*{SEGMENT_SUFFIX}"))
+        self._open_segment(max(numbers + [cursor[0]], default=0) + 1)
+        if not self._read_number:
+            self._read_number, self._read_offset = self._segments[0][0], 0
+        self._save_cursor()
+
+    def _open_segment(self, number):
+        self._writer = open(self._path(number), "ab")
+        self._segments.append([number, 0, 0])
+
+    def _rotate(self):
+        """활성 세그먼트를 닫고 다음 번호로 회전"""
+        self._writer.close()
+        self._open_segment(self._segments[-1][0] + 1)
+        self.stats["rotations"] += 1
+
+    def _drop_head(self):
+        """첫 세그먼트 삭제 후 재생 위치를 다음 세그먼트 처음으로"""
+        number = self._segments.pop(0)[0]
+        if self._reader is not None and self._reader[0] == number:
+            self._reader[1].close()
+            self._reader = None
+        self._path(number).unlink()
+        self._read_number, self._read_offset = self._segments[0][0], 0
+
+    def _enforce_limit(self):
+        """디스크 상한 초과 시 오래된 세그먼트 폐기 (활성 세그먼트 제외)"""
+        evicted = False
+        while len(self._segments) > 1 and sum(segment[1] for segment in self._segments) > self.max_bytes:
+            self.stats["evicted_segments"] += 1
+            self.stats["evicted_records"] += self._segments[0][2]
+            self._drop_head()
+            evicted = True
+        if evicted:
+            self._save_cursor()
+
+    def append(self, records):
+        """레코드 배치 1개를 항목으로 추가 (fsync 설정 시 반환 시점에 디스크 반영)"""
+        entry = self._encode(records, len(records))
+        with self._lock:
+            segment = self._segments[-1]
+            if segment[1] and segment[1] + len(entry) > self.segment_bytes:
+                self._rotate()
+                segment = self._segments[-1]
+            self._write_entry(self._writer, entry)
+            segment[1] += len(entry)
+            segment[2] += len(records)
+            self.stats["appended_batches"] += 1
+            self.stats["appended_records"] += len(records)
+            self._enforce_limit()
+
+    def peek(self):
+        """재생할 다음 항목 -> (records, position), 없으면 None (commit 전까지 같은 항목 반환)"""
+        with self._lock:
+            while True:
+                segment = self._segments[0]
+                if self._read_offset >= segment[1]:
+                    if len(self._segments) == 1:
+                        return None
+                    self._drop_head()
+                    self._save_cursor()
+                    continue
+                if self._reader is None or self._reader[0] != segment[0]:
+                    if self._reader is not None:
+                        self._reader[1].close()
+                    self._reader = (segment[0], open(self._path(segment[0]), "rb"))
+                handle = self._reader[1]
+                handle.seek(self._read_offset)
+                length, count, crc = ENTRY_HEADER.unpack(handle.read(ENTRY_HEADER.size))
+                payload = handle.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    # 검사를 통과한 뒤 손상된 경우: 세그먼트 나머지를 버리고 다음으로
+                    self.stats["corrupt_entries"] += 1
+                    self.stats["evicted_records"] += segment[2]
+                    segment[2] = 0
+                    self._read_offset = segment[1]
+                    continue
+                records = json.loads(zlib.decompress(payload))
+                return records, (segment[0], self._read_offset + ENTRY_HEADER.size + length, count)
+
+    def commit(self, position):
+        """peek 항목 재생 완료: 재생 위치 전진 및 저장"""
+        number, offset, count = position
+        with self._lock:
+            if number != self._read_number:
+                return  # 재생 중 디스크 상한으로 폐기된 세그먼트
+            self._read_offset = offset
+            self._segments[0][2] -= count
+            self.stats["replayed_batches"] += 1
+            self.stats["replayed_records"] += count
+            if offset >= self._segments[0][1] and len(self._segments) > 1:
+                self._drop_head()
+            self._save_cursor()
+
+    def dead_letter(self, records, error):
+        """재생 불가 배치를 격리 파일에 기록 (이후 commit 으로 재생 위치를 넘김)"""
+        entry = self._encode({"error": str(error), "records": records}, len(records))
+        with self._lock:
+            if self._dead_writer is None or self._dead_letters[-1][1] + len(entry) > self.segment_bytes:
+                if self._dead_writer is not None:
+                    self._dead_writer.close()
+                number = self._dead_letters[-1][0] + 1 if self._dead_letters else 1
+                self._dead_writer = open(self._dead_letter_path(number), "ab")
+                self._dead_letters.append([number, 0])
+            self._write_entry(self._dead_writer, entry)
+            self._dead_letters[-1][1] += len(entry)
+            self.stats["dead_letter_batches"] += 1
+            self.stats["dead_letter_records"] += len(records)
+            # 격리 상한: 기록 중인 파일을 제외하고 오래된 파일부터 삭제
+            while len(self._dead_letters) > 1 and sum(size for _, size in self._dead_letters) > self.max_dead_letter_bytes:
+                number, _ = self._dead_letters.pop(0)
+                self._dead_letter_path(number).unlink()
+                self.stats["dead_letter_evicted"] += 1
+
+    def iter_dead_letters(self):
+        """격리된 배치 조회 -> (error, records) 순회 (오래된 순)"""
+        with self._lock:
+            numbers = [number for number, _ in self._dead_letters]
+        for number in numbers:
+            try:
+                handle = open(self._dead_letter_path(number), "rb")
+            except FileNotFoundError:
+                continue  # 조회 중 상한으로 삭제됨
+            with handle:
+                while True:
+                    header = handle.read(ENTRY_HEADER.size)
+                    if len(header) < ENTRY_HEADER.size:
+                        break
+                    length, _, crc = ENTRY_HEADER.unpack(header)
+                    payload = handle.read(length)
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        break
+                    document = json.loads(zlib.decompress(payload))
+                    yield document["error"], document["records"]
+
+    @property
+    def pending_records(self):
+        """재생 대기 레코드 수"""
+        return sum(segment[2] for segment in self._segments)
+
+    @property
+    def pending_bytes(self):
+        """재생 대기 바이트 수 (압축 기준)"""
+        return sum(segment[1] for segment in self._segments) - self._read_offset
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            if self._reader is not None:
+                self._reader[1].close()
+                self._reader = None
+            if self._dead_writer is not None:
+                self._dead_writer.close()
+                self._dead_writer = None
+            self._save_cursor()
+
+    def snapshot(self):
+        """추가 / 재생 / 폐기 지표와 현재 적체량"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pending_records"] = self.pending_records
+            stats["pending_bytes"] = self.pending_bytes
+            stats["segments"] = len(self._segments)
+            stats["disk_bytes"] = sum(segment[1] for segment in self._segments)
+            stats["dead_letter_bytes"] = sum(size for _, size in self._dead_letters)
+        return stats
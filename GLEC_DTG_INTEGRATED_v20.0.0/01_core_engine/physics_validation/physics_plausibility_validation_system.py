@@ -10,12 +10,19 @@ import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 from influxdb_client import InfluxDBClient
 import warnings
+import copy
 import json
 import time
 from scipy import stats
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 import logging
+import sys
+from pathlib import Path
+
+# 공용 파이프라인 구성요소 (01_core_engine/data_pipeline)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "data_pipeline"))
+from physics_kernel import PHYSICAL_CONSTANTS, VALIDATION_RULES, expected_engine_rpm
 
 # 설정
 INFLUXDB_URL = "http://localhost:8086"
@@ -27,53 +34,11 @@ class PhysicsValidationEngine:
     """물리 법칙 기반 데이터 검증 엔진"""
     
     def __init__(self):
-        self.validation_rules = {
-            'speed_acceleration': {
-                'name': '속도-가속도 일관성',
-                'description': 'v = u + at 법칙 검증',
-                'tolerance': 5.0,  # 허용 오차 (%)
-                'critical': False
-            },
-            'fuel_speed_correlation': {
-                'name': '연비-속도 상관관계',
-                'description': '속도와 연비의 물리적 관계 검증',
-                'tolerance': 15.0,
-                'critical': True
-            },
-            'weight_acceleration': {
-                'name': '중량-가속도 관계',
-                'description': 'F = ma 기반 중량과 가속도 관계',
-                'tolerance': 10.0,
-                'critical': True
-            },
-            'co2_fuel_consistency': {
-                'name': 'CO2-연료소모 일치성',
-                'description': '연료소모량과 CO2 배출량 비례 관계',
-                'tolerance': 8.0,
-                'critical': True
-            },
-            'speed_rpm_correlation': {
-                'name': '속도-RPM 상관관계',
-                'description': '차량 속도와 엔진 RPM의 기계적 관계',
-                'tolerance': 12.0,
-                'critical': False
-            },
-            'temperature_performance': {
-                'name': '온도-성능 상관관계',
-                'description': '엔진온도와 성능지표의 열역학적 관계',
-                'tolerance': 20.0,
-                'critical': False
-            }
-        }
+        # 규칙 / 기준값은 physics_kernel 공용 정의 (ProcessOffload 검증 커널과 같은 기준)
+        self.validation_rules = copy.deepcopy(VALIDATION_RULES)
         
         # 물리적 상수 및 기준값
-        self.physical_constants = {
-            'co2_per_liter_diesel': 2.68,  # kg CO2/L 디젤
-            'truck_mass_range': (5000, 40000),  # kg (5톤-40톤)
-            'max_acceleration': 3.0,  # m/s² (화물차 최대 가속도)
-            'optimal_speed_range': (70, 90),  # km/h (연비 최적 속도)
-            'rpm_speed_ratio_range': (25, 45)  # RPM당 km/h
-        }
+        self.physical_constants = dict(PHYSICAL_CONSTANTS)
         
         self.anomaly_detector = IsolationForest(
             contamination=0.1,  # 10% 이상치로 가정
@@ -319,6 +284,55 @@ class PhysicsValidationEngine:
         
         return results
 
+    def validate_speed_rpm_correlation(self, data_df):
+        """속도-RPM 상관관계 검증 (변속 테이블 기반 기대 RPM 과 비교)"""
+        results = {
+            'rule_name': 'speed_rpm_correlation',
+            'total_records': len(data_df),
+            'violations': 0,
+            'violation_rate': 0.0,
+            'details': []
+        }
+        
+        required_fields = ['vehicle_speed', 'vehicle_rpm']
+        if not all(field in data_df.columns for field in required_fields):
+            results['error'] = f'Required fields missing: {required_fields}'
+            return results
+        
+        valid_data = data_df[
+            (data_df['vehicle_speed'] > 0) &
+            (data_df['vehicle_rpm'] > 0)
+        ]
+        
+        if len(valid_data) < 5:
+            results['error'] = 'Insufficient valid data'
+            return results
+        
+        # 기록된 속도로 기대 RPM 일괄 계산 (physics_kernel 과 동일 모델)
+        speeds = valid_data['vehicle_speed'].to_numpy(dtype=np.float64)
+        actual_rpm = valid_data['vehicle_rpm'].to_numpy(dtype=np.float64)
+        expected_rpm = expected_engine_rpm(speeds)
+        relative_errors = np.abs(actual_rpm - expected_rpm) / expected_rpm * 100
+        
+        tolerance = self.validation_rules['speed_rpm_correlation']['tolerance']
+        violation_mask = relative_errors > tolerance
+        
+        violations = []
+        for idx in np.flatnonzero(violation_mask)[:10]:
+            violations.append({
+                'index': int(valid_data.index[idx]),
+                'speed': float(speeds[idx]),
+                'actual_rpm': float(actual_rpm[idx]),
+                'expected_rpm': float(expected_rpm[idx]),
+                'error_percent': float(relative_errors[idx])
+            })
+        
+        results['violations'] = int(violation_mask.sum())
+        results['violation_rate'] = float(violation_mask.mean() * 100)
+        results['details'] = violations
+        
+        return results
+
     def detect_anomalies_multivariate(self, data_df):
         """다변량 이상치 탐지"""
         results = {
@@ -408,7 +422,8 @@ class PhysicsValidationEngine:
             self.validate_speed_acceleration_consistency,
             self.validate_fuel_speed_correlation,
             self.validate_weight_acceleration_relationship,
-            self.validate_co2_fuel_consistency
+            self.validate_co2_fuel_consistency,
+            self.validate_speed_rpm_correlation
         ]
         
         critical_violations = 0
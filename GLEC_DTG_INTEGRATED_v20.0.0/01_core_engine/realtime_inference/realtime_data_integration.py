@@ -2,72 +2,446 @@
 """
 실시간 데이터 연동 시스템 v2.0
 Critical Requirement #1: 5초 이내 실시간 데이터 처리
+
+단계별 파이프라인: 수집(배치 구성) -> 물리 검증 -> 저장 -> 알람
+- 단계 사이는 제한 크기 asyncio.Queue (배치 단위), 단계별 작업자 수 설정
+- 입력은 레코드 dict 큐 (AsyncQueueSink 등 외부 생산자) 또는 틱마다 센서 데이터를 넣는 내부 수집기
+- 종료 시 입력을 멈추고 단계 순서대로 남은 배치를 모두 처리 (graceful drain)
+- 저장 단계는 AdaptiveBatchStore (지연 예산 기반 적응형 마이크로 배치) 연결 시 실제 저장
+- 물리 검증 / 시급성 분류는 NumPy 커널, ProcessOffload 로 프로세스 풀 + 공유 메모리 버퍼에서 실행
+  기본 (compute_workers=0) 은 inline: 컬럼 추출 / 커널 연산이 이벤트 루프에서 실행됨
+- 커널 입력 컬럼은 생산자가 만든 블록을 수집 단계에서 모아 배치와 함께 전달 (차량군 시뮬레이터 입력)
+- 지표는 snapshot() 으로 조회: 단계별 / 종단 지연 히스토그램, 큐 깊이, 5초 SLO 소진율
 """
 
+import argparse
 import asyncio
+import sys
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
 from influxdb_client import InfluxDBClient
 from influxdb_client.client.write_api import SYNCHRONOUS
 
+# 공용 파이프라인 구성요소 (01_core_engine/data_pipeline)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "data_pipeline"))
+from adaptive_store import AdaptiveBatchStore, InfluxRecordWriter
+from latency_metrics import LatencyHistogram, SLOTracker
+from output_sinks import COLUMN_SOURCE_KEY, AsyncQueueSink
+from process_offload import OFFLOAD_FIELDS, VIOLATION_NAMES, ProcessOffload, gather_columns
+from tick_scheduler import TickScheduler
+from wal_spool import WriteAheadSpool
+from ultimate_comprehensive_simulator import (INFLUXDB_CONFIG, SIMULATION_SERIALIZER, URGENCY_LEVELS,
+                                              ComprehensiveBatchGenerator, build_fleet)
+
+# 수집 이후 단계 (순서대로 연결)
+STAGES = ("validate", "store", "alerts")
+DEFAULT_STAGE_WORKERS = {"collect": 1, "validate": 2, "store": 2, "alerts": 1}
+# 저장 단계에 배정하는 종단 지연 예산 비율 (나머지는 수집 / 검증 / 큐 대기)
+STORE_BUDGET_SHARE = 0.4
+
 class RealTimeDataIntegrator:
     """실시간 데이터 통합 시스템"""
-    
-    def __init__(self):
+
+    def __init__(self, tick_interval=1.0, signal_queue=None, max_drain=10000, record_queue=None,
+                 stage_workers=None, batch_size=500, batch_timeout=0.05, stage_queue_size=8,
+                 max_queued_records=100000, slo_objective=0.99, store=None, offload=None, alert_level="HIGH",
+                 snapshot_store=None, vehicle_id=None):
         self.target_latency = 5.0  # 5초 이내
-        self.processing_queue = asyncio.Queue()
-        
+        # CAN 신호 큐 (AsyncCANIngestor.queue 를 그대로 받아 틱마다 요약, 없으면 시뮬레이터 값)
+        self.signal_queue = signal_queue
+        self.max_drain = max_drain
+        self.latest_signals = {}
+        # 차량 최신 신호 스냅샷 (DTGCANBusSystem.enable_snapshot_store 의 저장소 / 차량 ID)
+        self.snapshot_store = snapshot_store
+        self.vehicle_id = vehicle_id
+
+        # 파이프라인 입력 (레코드 dict): 외부 생산자 큐가 없으면 틱 수집기가 채움
+        self.processing_queue = record_queue if record_queue is not None else asyncio.Queue(maxsize=max_queued_records)
+        self.tick_source = record_queue is None
+        self.stage_workers = dict(DEFAULT_STAGE_WORKERS, **(stage_workers or {}))
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.stage_queue_size = stage_queue_size
+
+        # 저장 단계 (None 이면 저장 생략)
+        self.store = store
+        # 검증 / 시급성 커널 실행기 (None 이면 inline: 커널 연산이 이벤트 루프에서 실행)
+        self.offload = offload if offload is not None else ProcessOffload()
+        # 알람 기준 시급성 (이 등급 이상이면 알람, URGENCY_LEVELS 는 높은 등급부터)
+        self.alert_level = alert_level
+        self._alert_index = URGENCY_LEVELS.index(alert_level)
+        self.violations_by_rule = {}
+        self.recent_alerts = deque(maxlen=100)
+
+        # 절대 마감 시각 기준 주기 (처리 시간이 주기에 누적되지 않음)
+        self.scheduler = TickScheduler(period=tick_interval)
+
+        self.stage_queues = {}
+        self._workers = {}
+        self._source_task = None
+        self._stop_event = None
+        self.stats = {"records": 0, "batches": 0, "processed": 0, "errors": 0, "late_batches": 0,
+                      "physics_violations": 0, "alerts": 0}
+        self.errors_by_stage = {}
+        self.last_error = None
+
+        # 단계별 처리 시간 (collect 는 배치 구성 시간), 종단 지연은 레코드 건수 가중
+        self.stage_latency = {name: LatencyHistogram() for name in ("collect",) + STAGES}
+        self.end_to_end_latency = LatencyHistogram()
+        self.slo = SLOTracker(target=self.target_latency, objective=slo_objective)
+        self.queue_peaks = {}
+
     async def process_realtime_stream(self):
-        """실시간 스트림 처리"""
+        """실시간 스트림 처리 (stop() 또는 취소 시 남은 데이터를 처리한 뒤 종료)"""
+        self._stop_event = asyncio.Event()
+        await self.start()
+        try:
+            await self._stop_event.wait()
+        finally:
+            await self.shutdown()
+
+    async def start(self):
+        """단계 큐 / 작업자 태스크 시작"""
+        await self.offload.start()
+        self.stage_queues = {name: asyncio.Queue(maxsize=self.stage_queue_size) for name in STAGES}
+        self.queue_peaks = {name: 0 for name in ("input",) + STAGES}
+        handlers = {"validate": self.validate_physics, "store": self.store_data, "alerts": self.check_alerts}
+
+        self._workers = {"collect": [asyncio.create_task(self._collect_worker(self.stage_queues[STAGES[0]]))
+                                     for _ in range(self.stage_workers["collect"])]}
+        for i, name in enumerate(STAGES):
+            output = self.stage_queues[STAGES[i + 1]] if i + 1 < len(STAGES) else None
+            self._workers[name] = [
+                asyncio.create_task(self._stage_worker(name, handlers[name], self.stage_queues[name], output))
+                for _ in range(self.stage_workers[name])
+            ]
+        if self.tick_source:
+            self._source_task = asyncio.create_task(self._tick_source())
+
+    def stop(self):
+        """process_realtime_stream 종료 요청"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def shutdown(self):
+        """입력 중지 후 단계 순서대로 남은 배치 처리, 작업자 정리"""
+        if self._source_task is not None:
+            self._source_task.cancel()
+            await asyncio.gather(self._source_task, return_exceptions=True)
+            self._source_task = None
+
+        # 외부 생산자는 호출 전에 멈춰 있어야 함 (큐가 계속 채워지면 join 이 끝나지 않음)
+        await self.processing_queue.join()
+        await self._cancel_workers("collect")
+        for name in STAGES:
+            await self.stage_queues[name].join()
+            await self._cancel_workers(name)
+            if name == "store" and self.store is not None:
+                # 저장 버퍼 플러시 + 진행 중인 쓰기 완료 대기
+                await self.store.close()
+        await self.offload.close()
+
+    async def _cancel_workers(self, name):
+        workers = self._workers.pop(name, [])
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _tick_source(self):
+        """틱마다 센서 데이터 1건을 파이프라인 입력에 적재"""
+        self.scheduler.start()
         while True:
-            start_time = time.time()
-            
-            # 데이터 처리 로직
             try:
-                # 시뮬레이터에서 데이터 수집
                 data = await self.collect_sensor_data()
-                
-                # 물리 검증
-                validated_data = await self.validate_physics(data)
-                
-                # 저장
-                await self.store_data(validated_data)
-                
-                # 실시간 알람 체크
-                await self.check_alerts(validated_data)
-                
-                processing_time = time.time() - start_time
-                
-                if processing_time > self.target_latency:
-                    print(f"⚠️ 지연 경고: {processing_time:.2f}초")
+                data["enqueued_at"] = time.monotonic()
+                await self.processing_queue.put(data)
+            except Exception as e:
+                self._record_error("collect", e)
+            await self.scheduler.wait_async()  # 다음 틱 마감까지 대기
+
+    async def _collect_worker(self, output):
+        """입력 레코드 -> 배치 (batch_size 개 또는 첫 레코드 후 batch_timeout 경과 시)"""
+        queue = self.processing_queue
+        histogram = self.stage_latency["collect"]
+        while True:
+            records = [await queue.get()]
+            batch_started = time.monotonic()
+            # 종단 지연 기준: 수신 시각 (CAN 수집기 등) > 입력 큐 적재 시각 (싱크 / 틱 수집기) > 배치 시작
+            # 큐는 FIFO 라 첫 레코드가 배치에서 가장 오래 대기한 레코드
+            first = records[0] if isinstance(records[0], dict) else {}
+            started = first.get("received_at", first.get("enqueued_at", batch_started))
+            depth = queue.qsize() + 1
+            if depth > self.queue_peaks["input"]:
+                self.queue_peaks["input"] = depth
+            deadline = batch_started + self.batch_timeout
+            while len(records) < self.batch_size:
+                if not queue.empty():
+                    records.append(queue.get_nowait())
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, 0.005))
+
+            # 생산자 컬럼 출처는 여기서 떼어 배치 단위 블록으로 전달 (레코드는 저장 / 스풀 가능한 dict 로 유지)
+            columns = gather_columns([record.pop(COLUMN_SOURCE_KEY, None) if isinstance(record, dict) else None
+                                      for record in records])
+            self.stats["records"] += len(records)
+            self.stats["batches"] += 1
+            histogram.record(time.monotonic() - batch_started)
+            await output.put((started, records, columns))
+            for _ in records:
+                queue.task_done()
+
+    async def _stage_worker(self, name, handler, input_queue, output_queue):
+        """단계 작업자: 배치 처리 후 다음 단계로 전달 (마지막 단계면 완료 집계)"""
+        histogram = self.stage_latency[name]
+        while True:
+            started, records, columns = await input_queue.get()
+            depth = input_queue.qsize() + 1
+            if depth > self.queue_peaks[name]:
+                self.queue_peaks[name] = depth
+            try:
+                stage_started = time.perf_counter()
+                result = await handler(records, columns)
+                histogram.record(time.perf_counter() - stage_started)
+                if result is not None:
+                    records = result
+                if output_queue is not None:
+                    await output_queue.put((started, records, columns))
                 else:
-                    print(f"✅ 처리 완료: {processing_time:.2f}초")
-                
+                    self._complete(started, records)
             except Exception as e:
-                print(f"❌ 처리 오류: {e}")
-            
-            await asyncio.sleep(1)  # 1초 간격
-    
+                self._record_error(name, e)
+            finally:
+                input_queue.task_done()
+
+    def _complete(self, started, records):
+        """배치 처리 완료: 종단 지연 / SLO 집계"""
+        latency = time.monotonic() - started
+        count = len(records)
+        self.stats["processed"] += count
+        self.end_to_end_latency.record(latency, count)
+        self.slo.record(latency, count)
+        if latency > self.target_latency:
+            self.stats["late_batches"] += 1
+
+    def _record_error(self, stage, error):
+        self.stats["errors"] += 1
+        self.errors_by_stage[stage] = self.errors_by_stage.get(stage, 0) + 1
+        self.last_error = f"{stage}: {error}"
+
+    def _queue_gauges(self):
+        """큐별 현재 깊이 / 최대 깊이 / 용량"""
+        queues = {"input": self.processing_queue, **self.stage_queues}
+        return {
+            name: {"depth": queue.qsize(), "peak": self.queue_peaks.get(name, 0), "capacity": queue.maxsize}
+            for name, queue in queues.items()
+        }
+
+    def snapshot(self):
+        """지표 스냅샷: 처리 건수, 단계별 / 종단 지연 분포, 큐 깊이, SLO"""
+        return {
+            "counters": dict(self.stats),
+            "errors_by_stage": dict(self.errors_by_stage),
+            "last_error": self.last_error,
+            "stages": {name: histogram.snapshot() for name, histogram in self.stage_latency.items()},
+            "end_to_end": self.end_to_end_latency.snapshot(),
+            "queues": self._queue_gauges(),
+            "slo": self.slo.snapshot(),
+            "store": self.store.snapshot() if self.store is not None else None,
+            "violations_by_rule": dict(self.violations_by_rule),
+            "offload": self.offload.snapshot(),
+            "ticks": self.scheduler.snapshot(),
+        }
+
     async def collect_sensor_data(self):
-        """센서 데이터 수집"""
-        # 실제 구현 필요
-        return {"speed": 80, "fuel": 8.5}
-    
-    async def validate_physics(self, data):
-        """물리 법칙 검증"""
-        # 실제 물리 검증 로직
+        """센서 데이터 수집 (CAN 신호 큐가 있으면 틱 사이 쌓인 신호를 비워 신호별 최신값으로 요약)
+
+        스냅샷 저장소가 있으면 최신값은 저장소에서 읽음 (변화 감지 필터가 거른 변화 포함) + 가장 오래된 신호 나이
+        """
+        if self.signal_queue is None and self.snapshot_store is None:
+            # 실제 구현 필요
+            return {"speed": 80, "fuel": 8.5}
+
+        queue = self.signal_queue
+        drained = 0
+        oldest = None
+        while queue is not None and drained < self.max_drain and not queue.empty():
+            signal = queue.get_nowait()
+            drained += 1
+            self.latest_signals[signal["type"]] = signal["value"]
+            if oldest is None and "received_at" in signal:
+                oldest = signal["received_at"]
+
+        ages = []
+        if self.snapshot_store is not None:
+            for name, entry in self.snapshot_store.snapshot(self.vehicle_id).items():
+                self.latest_signals[name] = entry["value"]
+                ages.append(entry["age"])
+
+        data = dict(self.latest_signals)
+        data["signal_count"] = drained
+        # 틱 내 가장 오래 대기한 신호의 큐 체류 시간 (수신 스레드 기준 monotonic)
+        data["queue_delay"] = time.monotonic() - oldest if oldest is not None else 0.0
+        if self.snapshot_store is not None:
+            # 가장 오래 갱신되지 않은 신호의 나이 (수신 시각 기준, 재생 로그에서도 유효)
+            data["max_signal_age"] = max(ages) if ages else None
         return data
-    
-    async def store_data(self, data):
-        """데이터 저장"""
-        # InfluxDB 저장
-        pass
-    
-    async def check_alerts(self, data):
-        """실시간 알람 체크"""
-        # 안전 점수, 위험 상황 체크
-        pass
+
+    async def validate_physics(self, records, columns=None):
+        """물리 법칙 검증 (레코드 배치 -> 검증된 배치): 위반 레코드에 physics_violations 비트 표시, 폐기하지 않음"""
+        flags = await self.offload.run("validate", records, columns)
+        violated = np.flatnonzero(flags)
+        if violated.size:
+            codes = flags[violated].astype(np.int64)
+            self.stats["physics_violations"] += int(violated.size)
+            for bit, name in VIOLATION_NAMES.items():
+                count = int(np.count_nonzero(codes & bit))
+                if count:
+                    self.violations_by_rule[name] = self.violations_by_rule.get(name, 0) + count
+            for i, code in zip(violated.tolist(), codes.tolist()):
+                records[i]["physics_violations"] = code
+        return records
+
+    async def store_data(self, records, columns=None):
+        """데이터 저장 (레코드 배치): 적응형 배치 저장소에 적재, 쓰기는 크기 / 마감 기준으로 묶어서 수행"""
+        if self.store is not None:
+            await self.store.add(records)
+
+    async def check_alerts(self, records, columns=None):
+        """실시간 알람 체크 (레코드 배치): 시급성이 alert_level 이상인 레코드를 알람으로 집계"""
+        levels = await self.offload.run("urgency", records, columns)
+        for i in np.flatnonzero(levels <= self._alert_index).tolist():
+            record = records[i]
+            self.stats["alerts"] += 1
+            self.recent_alerts.append({"vehicle_id": record.get("vehicle_id"),
+                                       "urgency": URGENCY_LEVELS[int(levels[i])],
+                                       "timestamp": record.get("timestamp")})
+
+async def feed_simulated_fleet(integrator, vehicles, duration):
+    """차량군 시뮬레이터 -> 통합기 입력 큐 (틱마다 차량 수만큼 레코드)"""
+    generator = ComprehensiveBatchGenerator(build_fleet(vehicles))
+    # 커널 입력 컬럼은 시뮬레이터 배치 배열에서 바로 생성 (이벤트 루프에서 레코드 dict 를 훑지 않음)
+    sink = AsyncQueueSink(integrator.processing_queue, drop_oldest=False, column_fields=OFFLOAD_FIELDS)
+    scheduler = TickScheduler(period=integrator.scheduler.period)
+    started = time.monotonic()
+    while duration is None or time.monotonic() - started < duration:
+        sink.write(generator.generate(datetime.now(timezone.utc)))
+        await scheduler.wait_async()
+    return sink
+
+def format_report(snapshot):
+    """지표 스냅샷 -> 한 줄 요약 (처리 건수, 종단 / 단계별 p99, 큐 깊이, 60초 SLO 소진율)"""
+    end_to_end = snapshot["end_to_end"]
+    stages = " ".join(f"{name}={stats.get('p99', 0.0) * 1000:.1f}ms" for name, stats in snapshot["stages"].items())
+    queues = " ".join(f"{name}={gauge['depth']}" for name, gauge in snapshot["queues"].items())
+    return (f"📊 처리 {snapshot['counters']['processed']}건 | 종단 p50 {end_to_end.get('p50', 0.0) * 1000:.1f}ms "
+            f"p99 {end_to_end.get('p99', 0.0) * 1000:.1f}ms | 단계 p99 {stages} | 큐 {queues} | "
+            f"SLO 소진율(60s) {snapshot['slo']['burn_rates']['60s']:.2f} | 오류 {snapshot['counters']['errors']}"
+            f"{format_spool(snapshot.get('store'))}")
+
+def format_spool(store):
+    """저장 단계 스풀 적체 요약 (스풀 미사용 시 빈 문자열)"""
+    if not store or "spool" not in store:
+        return ""
+    spool = store["spool"]
+    mode = "스풀" if store["spooling"] else "정상"
+    return (f" | 저장 {mode} 적체 {spool['pending_records']}건 ({spool['pending_bytes'] / 1024 / 1024:.1f}MB) "
+            f"재생 {store['replayed']}건 폐기 {spool['evicted_records']}건")
+
+async def report_periodically(integrator, interval):
+    """interval 초마다 지표 요약 출력"""
+    while True:
+        await asyncio.sleep(interval)
+        print(format_report(integrator.snapshot()))
+
+def create_influx_store(target_latency=5.0, max_in_flight=2, spool_dir=None, spool_max_bytes=4 * 1024 ** 3,
+                        replay_rate=20000.0):
+    """시뮬레이터 스키마 InfluxDB 적응형 저장 단계 -> (저장소, 클라이언트)
+
+    spool_dir 지정 시 InfluxDB 장애 동안 배치를 디스크 스풀에 기록하고 복구 후 replay_rate 로 재생
+    """
+    client = InfluxDBClient(url=INFLUXDB_CONFIG["url"], token=INFLUXDB_CONFIG["token"], org=INFLUXDB_CONFIG["org"],
+                            enable_gzip=True)
+    writer = InfluxRecordWriter(client.write_api(write_options=SYNCHRONOUS), INFLUXDB_CONFIG["bucket"],
+                                INFLUXDB_CONFIG["org"], SIMULATION_SERIALIZER)
+    spool = WriteAheadSpool(spool_dir, max_bytes=spool_max_bytes) if spool_dir else None
+    store = AdaptiveBatchStore(writer, latency_budget=target_latency * STORE_BUDGET_SHARE, max_in_flight=max_in_flight,
+                               spool=spool, replay_rate=replay_rate)
+    return store, client
+
+async def run(args):
+    """명령행 실행: 통합기 + (선택) 차량군 부하, 종료 시 지표 출력"""
+    store, client = None, None
+    if args.store == "influx":
+        store, client = create_influx_store(max_in_flight=args.max_in_flight, spool_dir=args.spool_dir,
+                                            spool_max_bytes=args.spool_max_mb * 1024 * 1024,
+                                            replay_rate=args.replay_rate)
+    integrator = RealTimeDataIntegrator(
+        tick_interval=args.tick_interval,
+        offload=ProcessOffload(workers=args.compute_workers),
+        alert_level=args.alert_level,
+        record_queue=asyncio.Queue(maxsize=args.max_queued) if args.vehicles else None,
+        stage_workers={"validate": args.validate_workers, "store": args.store_workers},
+        batch_size=args.batch_size,
+        store=store,
+    )
+    stream = asyncio.create_task(integrator.process_realtime_stream())
+    reporter = asyncio.create_task(report_periodically(integrator, args.report_interval))
+    try:
+        if args.vehicles:
+            sink = await feed_simulated_fleet(integrator, args.vehicles, args.duration)
+            print(f"입력 폐기: {sink.snapshot()['points_dropped']}건")
+        elif args.duration is not None:
+            await asyncio.sleep(args.duration)
+        else:
+            await stream
+    finally:
+        integrator.stop()
+        await stream
+        reporter.cancel()
+        if client is not None:
+            client.close()
+        print(format_report(integrator.snapshot()))
+        print(f"처리 지표: {integrator.snapshot()}")
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="실시간 데이터 연동 시스템")
+    parser.add_argument("--tick-interval", type=float, default=1.0, help="수집 주기 (초, 기본: 1.0)")
+    parser.add_argument("--vehicles", type=int, default=0,
+                        help="시뮬레이션 차량 수 (0: 센서 데이터 틱 수집, 기본: 0)")
+    parser.add_argument("--duration", type=float, default=None, help="실행 시간 (초, 기본: 무제한)")
+    parser.add_argument("--batch-size", type=int, default=500, help="단계 처리 배치 크기 (기본: 500)")
+    parser.add_argument("--validate-workers", type=int, default=DEFAULT_STAGE_WORKERS["validate"],
+                        help="물리 검증 작업자 수")
+    parser.add_argument("--store-workers", type=int, default=DEFAULT_STAGE_WORKERS["store"],
+                        help="저장 작업자 수")
+    parser.add_argument("--compute-workers", type=int, default=0,
+                        help="검증 / 시급성 커널 프로세스 수 (0: 이벤트 루프에서 inline 실행, 기본: 0)")
+    parser.add_argument("--alert-level", choices=URGENCY_LEVELS, default="HIGH",
+                        help="알람 기준 시급성 (이 등급 이상 알람, 기본: HIGH)")
+    parser.add_argument("--store", choices=("none", "influx"), default="none",
+                        help="저장 단계 (influx: 시뮬레이터 레코드를 적응형 배치로 InfluxDB 저장, --vehicles 필요)")
+    parser.add_argument("--max-in-flight", type=int, default=2,
+                        help="InfluxDB 동시 쓰기 상한 (기본: 2, --spool-dir 사용 시 순서 보존을 위해 1)")
+    parser.add_argument("--spool-dir", default=None, help="InfluxDB 장애 대비 디스크 스풀 디렉터리 (기본: 사용 안 함)")
+    parser.add_argument("--spool-max-mb", type=int, default=4096, help="스풀 디스크 상한 (MB, 기본: 4096)")
+    parser.add_argument("--replay-rate", type=float, default=20000.0, help="복구 후 스풀 재생 속도 (레코드/초, 기본: 20000)")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="지표 요약 출력 주기 (초, 기본: 10)")
+    parser.add_argument("--max-queued", type=int, default=100000, help="입력 큐 최대 레코드 수")
+    args = parser.parse_args()
+    # 센서 틱 레코드에는 timestamp 등 저장 필드가 없어 모든 쓰기가 실패 (스풀 사용 시 재생이 막힘)
+    if args.store == "influx" and args.vehicles <= 0:
+        parser.error("--store influx 는 시뮬레이터 레코드 전용: --vehicles 1 이상 지정 필요")
+    return args
 
 if __name__ == "__main__":
-    integrator = RealTimeDataIntegrator()
-    asyncio.run(integrator.process_realtime_stream())
+    try:
+        asyncio.run(run(parse_args()))
+    except KeyboardInterrupt:
+        pass
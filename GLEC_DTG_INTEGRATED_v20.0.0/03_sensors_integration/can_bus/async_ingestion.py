@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+asyncio CAN 수집
+- 수신 스레드가 bus.recv() 후 기록 / 디코딩 / 변화 감지 필터 적용, 신호를 이벤트 루프의 제한 크기 asyncio.Queue 로 전달
+- 큐가 가득 찼을 때 정책: drop_newest (새 신호 폐기), drop_oldest (오래된 신호 폐기), block (수신 스레드 대기)
+  drop_* 정책은 수신 스레드 쪽 제한 크기 전달 버퍼에서도 같은 정책 적용 (루프 콜백은 한 번에 1개만 예약)
+- 수신 / 폐기 / 지연 프레임 카운터, 오류 시 짧은 지수 백오프
+- 큐는 RealTimeDataIntegrator(signal_queue=...) 가 그대로 소비
+- 다중 채널: 채널별 수집기 큐를 재정렬 창 안에서 타임스탬프 순서로 병합 (느린 채널이 다른 채널을 막지 않음)
+  병합 대기열은 max_pending 에서 수집을 멈춤 -> 채널 큐가 차면서 수집기의 큐 정책이 그대로 적용
+  출력 큐가 가득 차면 같은 정책 적용 (block: 병합 대기열에 남겨 역압 전달)
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+DROP_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+
+class AsyncCANIngestor:
+    """DTGCANBusSystem -> asyncio.Queue 신호 수집기"""
+
+    def __init__(self, can_system, queue=None, maxsize=10000, policy="drop_oldest", block_timeout=0.5,
+                 late_threshold=0.5, channel=None, handoff_size=None):
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"지원하지 않는 큐 정책: {policy}")
+        self.can_system = can_system
+        self.queue = queue
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.late_threshold = late_threshold
+        self.channel = channel
+        # drop_* 정책의 스레드 -> 루프 전달 버퍼 상한 (루프가 밀려도 쌓이는 신호 수 제한)
+        self.handoff_size = handoff_size if handoff_size is not None else maxsize
+
+        self.loop = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.finished = asyncio.Event()
+        # 전달 버퍼 + 예약된 루프 콜백 여부 (콜백은 최대 1개만 대기)
+        self._handoff = deque()
+        self._handoff_lock = threading.Lock()
+        self._drain_scheduled = False
+        # 스레드별 카운터 (수신 스레드 / 이벤트 루프 각자 자기 dict 만 갱신, stats 에서 합산)
+        self._reader_stats = self._new_counters()
+        self._loop_stats = self._new_counters()
+
+    @staticmethod
+    def _new_counters():
+        return {
+            "frames": 0,
+            "signals": 0,
+            "enqueued": 0,
+            "dropped": 0,
+            "handoff_dropped": 0,
+            "late_frames": 0,
+            "max_latency": 0.0,
+            "backpressure_waits": 0,
+            "errors": 0,
+        }
+
+    @property
+    def stats(self):
+        """수신 스레드 / 이벤트 루프 카운터 합산 (max_latency 는 최대값)"""
+        reader, loop = dict(self._reader_stats), dict(self._loop_stats)
+        merged = {key: reader[key] + loop[key] for key in reader}
+        merged["max_latency"] = max(reader["max_latency"], loop["max_latency"])
+        return merged
+
+    async def start(self):
+        """수신 스레드 시작 (실행 중인 이벤트 루프에 큐 연결)"""
+        self.loop = asyncio.get_running_loop()
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._reader, name=f"can-ingest-{self.channel or 'bus'}",
+                                        daemon=True)
+        self._thread.start()
+        return self.queue
+
+    def _reader(self):
+        """수신 스레드: 수신 -> handle_message (기록 / 디코딩 / 필터) -> 이벤트 루프로 전달"""
+        system = self.can_system
+        bus = system.bus
+        stats = self._reader_stats
+        backoff = 0.01
+        try:
+            while not self._stop.is_set():
+                try:
+                    msg = bus.recv(timeout=0.1)
+                except Exception as e:
+                    stats["errors"] += 1
+                    print(f"CAN 수집 오류: {e}")
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, 1.0)
+                    continue
+                backoff = 0.01
+                # 프레임이 없어도 TP 세션 타임아웃 정리
+                system.transport.poll()
+                if msg is None:
+                    if getattr(bus, "finished", False):
+                        break
+                    continue
+
+                stats["frames"] += 1
+                signals = system.handle_message(msg)
+                if not signals:
+                    continue
+
+                received_at = time.monotonic()
+                channel = self.channel or msg.channel
+                for signal in signals:
+                    signal["timestamp"] = msg.timestamp
+                    signal["channel"] = channel
+                    signal["received_at"] = received_at
+                stats["signals"] += len(signals)
+                self._hand_off(signals)
+        finally:
+            # 대기 중인 전달 콜백이 먼저 실행된 뒤 완료 표시 (call_soon_threadsafe 는 순서 보장)
+            self.loop.call_soon_threadsafe(self.finished.set)
+
+    def _hand_off(self, signals):
+        """신호를 이벤트 루프 큐로 전달
+
+        drop_* 정책: 수신 스레드에서 제한 크기 버퍼에 넣고 정책 적용, 루프 콜백은 비어 있을 때만 예약
+        block 정책: 큐에 자리가 날 때까지 대기 (block_timeout 초과 시 폐기)
+        """
+        stats = self._reader_stats
+        if self.policy != "block":
+            with self._handoff_lock:
+                pending = self._handoff
+                if self.policy == "drop_newest":
+                    room = max(self.handoff_size - len(pending), 0)
+                    dropped = max(len(signals) - room, 0)
+                    pending.extend(signals[:room])
+                else:
+                    pending.extend(signals)
+                    dropped = max(len(pending) - self.handoff_size, 0)
+                    for _ in range(dropped):
+                        pending.popleft()
+                schedule = not self._drain_scheduled
+                self._drain_scheduled = True
+            if dropped:
+                stats["dropped"] += dropped
+                stats["handoff_dropped"] += dropped
+            if schedule:
+                self.loop.call_soon_threadsafe(self._drain)
+            return
+        for signal in signals:
+            if self.queue.full():
+                stats["backpressure_waits"] += 1
+            future = asyncio.run_coroutine_threadsafe(self.queue.put(signal), self.loop)
+            try:
+                future.result(self.block_timeout)
+                self._count_enqueued(signal, stats)
+            except Exception:
+                future.cancel()
+                stats["dropped"] += 1
+
+    def _count_enqueued(self, signal, stats):
+        stats["enqueued"] += 1
+        latency = time.monotonic() - signal["received_at"]
+        if latency > stats["max_latency"]:
+            stats["max_latency"] = latency
+        if latency > self.late_threshold:
+            stats["late_frames"] += 1
+
+    def _drain(self):
+        """이벤트 루프 스레드: 전달 버퍼를 비워 큐 적재"""
+        with self._handoff_lock:
+            signals = self._handoff
+            self._handoff = deque()
+            self._drain_scheduled = False
+        self._enqueue(signals)
+
+    def _enqueue(self, signals):
+        """이벤트 루프 스레드에서 큐 적재 (drop_newest / drop_oldest)"""
+        queue = self.queue
+        stats = self._loop_stats
+        for signal in signals:
+            if queue.full():
+                stats["dropped"] += 1
+                if self.policy == "drop_newest":
+                    continue
+                queue.get_nowait()
+            queue.put_nowait(signal)
+            self._count_enqueued(signal, stats)
+
+    async def stop(self, timeout=5.0):
+        """수신 스레드 정지"""
+        self._stop.set()
+        if self._thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._thread.join, timeout)
+            self._thread = None
+        # 전달 버퍼에 남은 신호 적재 (이후 큐를 비우는 호출자가 놓치지 않도록)
+        self._drain()
+
+    def snapshot(self):
+        """수집 / 큐 지표 요약"""
+        stats = dict(self.stats)
+        stats["policy"] = self.policy
+        stats["queue_size"] = self.queue.qsize() if self.queue is not None else 0
+        stats["handoff_pending"] = len(self._handoff)
+        return stats
+
+
+class ChannelMerger:
+    """채널별 수집기 큐 -> 타임스탬프 순서 단일 큐
+
+    수신 후 reorder_window 초가 지난 신호를 모아 타임스탬프 순으로 정렬해 내보냄.
+    특정 채널을 기다리지 않으므로 조용하거나 느린 채널은 병합을 지연시키지 않고,
+    창보다 늦게 도착해 이미 내보낸 시각보다 이른 신호는 그대로 내보내고 out_of_order 로 집계.
+    병합 대기열이 max_pending (기본: maxsize) 에 도달하면 채널 큐에서 더 꺼내지 않음.
+    """
+
+    def __init__(self, ingestors, output=None, maxsize=10000, reorder_window=0.05, policy="drop_oldest",
+                 max_pending=None):
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"지원하지 않는 큐 정책: {policy}")
+        self.ingestors = ingestors
+        self.output = output
+        self.maxsize = maxsize
+        self.reorder_window = reorder_window
+        self.policy = policy
+        self.max_pending = max_pending if max_pending is not None else maxsize
+        self.finished = asyncio.Event()
+
+        self._pending = deque()
+        self._room = asyncio.Event()
+        self._last_timestamp = None
+        self._tasks = []
+        self.stats = {"merged": 0, "dropped": 0, "out_of_order": 0, "peak_pending": 0, "pull_waits": 0,
+                      "output_full": 0}
+
+    async def start(self):
+        """채널별 수집 태스크 + 방출 태스크 시작 -> 병합 큐"""
+        if self.output is None:
+            self.output = asyncio.Queue(maxsize=self.maxsize)
+        self.finished.clear()
+        self._tasks = [asyncio.create_task(self._pull(ingestor)) for ingestor in self.ingestors.values()]
+        self._tasks.append(asyncio.create_task(self._emit()))
+        return self.output
+
+    async def _pull(self, ingestor):
+        queue = ingestor.queue
+        while True:
+            if len(self._pending) >= self.max_pending:
+                # 병합이 밀림: 채널 큐에 남겨 수집기 정책(block / drop_*)이 적용되게 함
+                self.stats["pull_waits"] += 1
+                self._room.clear()
+                await self._room.wait()
+                continue
+            self._pending.append(await queue.get())
+            if len(self._pending) > self.stats["peak_pending"]:
+                self.stats["peak_pending"] = len(self._pending)
+
+    async def _emit(self):
+        interval = max(self.reorder_window / 2, 0.001)
+        while True:
+            await asyncio.sleep(interval)
+            self.flush(time.monotonic() - self.reorder_window)
+            if not self._pending and all(ingestor.finished.is_set() and ingestor.queue.empty()
+                                      for ingestor in self.ingestors.values()):
+                self.finished.set()
+
+    def flush(self, cutoff=None):
+        """cutoff (monotonic) 이전에 수신된 신호를 타임스탬프 순으로 출력 큐에 적재 (None 이면 전부)
+
+        출력 큐가 가득 차면 정책 적용: drop_oldest (출력 큐 앞 신호 폐기), drop_newest (내보낼 신호 폐기),
+        block (남은 신호를 대기열 앞에 되돌리고 다음 flush 에서 재시도)
+        """
+        pending = self._pending
+        ready = []
+        while pending and (cutoff is None or pending[0]["received_at"] <= cutoff):
+            ready.append(pending.popleft())
+        ready.sort(key=lambda signal: signal["timestamp"])
+        output = self.output
+        for i, signal in enumerate(ready):
+            if output.full():
+                self.stats["output_full"] += 1
+                if self.policy == "block":
+                    pending.extendleft(reversed(ready[i:]))
+                    break
+                self.stats["dropped"] += 1
+                if self.policy == "drop_newest":
+                    continue
+                output.get_nowait()
+            timestamp = signal["timestamp"]
+            if self._last_timestamp is not None and timestamp < self._last_timestamp:
+                self.stats["out_of_order"] += 1
+            else:
+                self._last_timestamp = timestamp
+            output.put_nowait(signal)
+            self.stats["merged"] += 1
+        if len(pending) < self.max_pending:
+            self._room.set()
+
+    async def stop(self, timeout=5.0):
+        """채널 수집기 정지 후 남은 신호 모두 출력 (block 정책은 timeout 까지 소비를 기다린 뒤 나머지 폐기)"""
+        await asyncio.gather(*(ingestor.stop(timeout) for ingestor in self.ingestors.values()))
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for ingestor in self.ingestors.values():
+            while not ingestor.queue.empty():
+                self._pending.append(ingestor.queue.get_nowait())
+        deadline = time.monotonic() + timeout
+        self.flush()
+        while self._pending and time.monotonic() < deadline:
+            await asyncio.sleep(max(self.reorder_window / 2, 0.001))
+            self.flush()
+        if self._pending:
+            self.stats["dropped"] += len(self._pending)
+            self._pending.clear()
+        self.finished.set()
+
+    def snapshot(self):
+        """채널별 수집 지표 + 병합 지표"""
+        stats = dict(self.stats)
+        stats["policy"] = self.policy
+        stats["pending"] = len(self._pending)
+        stats["queue_size"] = self.output.qsize() if self.output is not None else 0
+        stats["channels"] = {channel: ingestor.snapshot() for channel, ingestor in self.ingestors.items()}
+        return stats
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+J1939 배치 디코더 (오프라인 로그 재처리용)
+- NumPy 구조화 배열 (timestamp, arbitration_id, dlc, data[8]) 단위 디코딩
+- PGN 별 벡터 마스크로 프레임 그룹화, 8바이트 데이터를 uint64 로 보고 시프트 / 마스크 / 배율 적용
+- 결과는 PGN 별 컬럼 배열 (timestamp, source, 신호별 float64, 무효값은 NaN)
+"""
+
+import numpy as np
+
+from j1939_decoder import J1939Decoder
+
+# CAN 프레임 레코드 (고정 크기 21바이트, 패딩 없음)
+CAN_FRAME_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("arbitration_id", "<u4"),
+    ("dlc", "u1"),
+    ("data", "u1", (8,)),
+])
+
+
+def frames_from_messages(messages):
+    """can.Message 반복자 -> CAN_FRAME_DTYPE 배열"""
+    messages = list(messages)
+    frames = np.zeros(len(messages), dtype=CAN_FRAME_DTYPE)
+    if not messages:
+        return frames
+    frames["timestamp"] = [msg.timestamp for msg in messages]
+    frames["arbitration_id"] = [msg.arbitration_id for msg in messages]
+    frames["dlc"] = [min(len(msg.data), 8) for msg in messages]
+    payload = b"".join(bytes(msg.data[:8]).ljust(8, b"\xff") for msg in messages)
+    frames["data"] = np.frombuffer(payload, dtype=np.uint8).reshape(-1, 8)
+    return frames
+
+
+def pgns_from_arbitration_ids(arbitration_ids):
+    """중재 ID 배열 -> PGN 배열 (pgn_from_arbitration_id 의 벡터 버전)"""
+    ids = np.asarray(arbitration_ids, dtype=np.uint32)
+    pgns = (ids >> 8) & 0x3FFFF
+    pdu1 = ((pgns >> 8) & 0xFF) < 240
+    return np.where(pdu1, pgns & 0x3FF00, pgns)
+
+
+class J1939BatchDecoder:
+    """J1939Decoder 의 PGN 레이아웃을 공유하는 배치 디코더"""
+
+    def __init__(self, decoder=None):
+        self.decoder = decoder if decoder is not None else J1939Decoder()
+        self.stats = {"frames": 0, "decoded": 0, "unhandled": 0, "invalid": 0, "transport": 0}
+
+    @staticmethod
+    def _payload_words(data):
+        """(n, 8) uint8 -> (n,) little-endian uint64 (바이트 뷰, 복사는 비연속일 때만)"""
+        return np.ascontiguousarray(data, dtype=np.uint8).view("<u8").reshape(-1)
+
+    def decode_layout(self, layout, frames):
+        """같은 PGN 프레임 배열 -> 컬럼 dict"""
+        words = self._payload_words(frames["data"])
+        columns = {
+            "timestamp": frames["timestamp"],
+            "source": (frames["arbitration_id"] & 0xFF).astype(np.uint8),
+        }
+        for i, (start, mask, length) in enumerate(layout.fields):
+            raw = (words >> np.uint64(start)) & np.uint64(mask)
+            if layout.signed[i]:
+                values = raw.astype(np.int64)
+                values[values >= 1 << (length - 1)] -= 1 << length
+                values = values.astype(np.float64)
+            else:
+                values = raw.astype(np.float64)
+            values = values * layout.scales[i] + layout.offsets[i]
+            if layout.max_raw[i] is not None:
+                values[raw > layout.max_raw[i]] = np.nan
+            columns[layout.types[i]] = values
+        return columns
+
+    def decode(self, frames):
+        """CAN 프레임 구조화 배열 -> {PGN: 컬럼 dict} (미지원 PGN 은 제외)"""
+        pgns = pgns_from_arbitration_ids(frames["arbitration_id"])
+        has_dlc = "dlc" in frames.dtype.names
+        results = {}
+        handled = 0
+        invalid = 0
+        for pgn, layout in self.decoder.layouts.items():
+            mask = pgns == pgn
+            if has_dlc:
+                short = mask & (frames["dlc"] < layout.min_length)
+                mask &= ~short
+                invalid += int(np.count_nonzero(short))
+            selected = np.flatnonzero(mask)
+            handled += len(selected)
+            if len(selected):
+                results[pgn] = self.decode_layout(layout, frames[selected])
+
+        # 테이블 밖이지만 다른 계층이 처리하는 PGN (J1939Decoder.transport_pgns) 은 transport 로 집계
+        transport = 0
+        if self.decoder.transport_pgns:
+            transport_pgns = list(self.decoder.transport_pgns - self.decoder.layouts.keys())
+            transport = int(np.count_nonzero(np.isin(pgns, transport_pgns)))
+
+        self.stats["frames"] += len(frames)
+        self.stats["decoded"] += handled
+        self.stats["invalid"] += invalid
+        self.stats["transport"] += transport
+        self.stats["unhandled"] += len(frames) - handled - invalid - transport
+        return results
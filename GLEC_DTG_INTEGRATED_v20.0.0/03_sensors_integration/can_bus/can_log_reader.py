@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+오프라인 CAN 로그 리더 / 재생기
+- candump (-l 로그), Vector ASC: mmap 으로 한 줄씩 파싱 (수 GB 로그도 RAM 에 올리지 않음)
+- Vector BLF: 압축 컨테이너 형식이라 python-can BLFReader 로 스트리밍
+- 재생 속도: 원래 시간(1.0), N배속, 대기 없이 최대 속도(None / 0)
+- 재생기는 bus.recv() 인터페이스를 제공하므로 DTGCANBusSystem.collect_can_data 에 그대로 연결 가능
+"""
+
+import mmap
+import time
+
+import can
+import numpy as np
+
+from batch_decoder import CAN_FRAME_DTYPE
+
+LOG_FORMATS = ("candump", "asc", "blf")
+
+
+def detect_format(path):
+    """파일 확장자 -> 로그 형식"""
+    name = str(path).lower()
+    if name.endswith(".asc"):
+        return "asc"
+    if name.endswith(".blf"):
+        return "blf"
+    if name.endswith((".log", ".candump")):
+        return "candump"
+    raise ValueError(f"지원하지 않는 CAN 로그 형식: {path}")
+
+
+def _mapped_lines(path):
+    """파일을 mmap 으로 열어 줄 단위 bytes 반복"""
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b"")
+
+
+def iter_candump(path):
+    """candump -l 로그 -> (timestamp, channel, arbitration_id, is_extended, data)
+
+    형식: (1436509052.249713) can0 18FEF100#FF0050FFFFFFFFFF [R|T]
+    """
+    for line in _mapped_lines(path):
+        if not line.startswith(b"("):
+            continue
+        try:
+            stamp, channel, frame = line.split(None, 3)[:3]
+            can_id, _, payload = frame.partition(b"#")
+            if payload.startswith(b"#"):
+                # CAN FD: ##<flags><data>
+                payload = payload[2:]
+            elif payload.startswith((b"R", b"r")):
+                payload = b""
+            yield (float(stamp[1:-1]), channel.decode(), int(can_id, 16), len(can_id) > 3,
+                   bytes.fromhex(payload.decode()))
+        except ValueError:
+            continue
+
+
+def iter_asc(path):
+    """Vector ASC 로그 -> (timestamp, channel, arbitration_id, is_extended, data)
+
+    형식: 0.004000 1  18FEF100x       Rx   d 8 FF 00 50 FF FF FF FF FF
+    """
+    base = 16
+    for line in _mapped_lines(path):
+        fields = line.split()
+        if not fields:
+            continue
+        head = fields[0]
+        if head == b"base":
+            base = 16 if fields[1] == b"hex" else 10
+            continue
+        if len(fields) < 6 or not head[:1].isdigit() or fields[3] not in (b"Rx", b"Tx"):
+            continue
+        try:
+            if fields[4].lower() != b"d":
+                continue
+            raw_id = fields[2]
+            extended = raw_id.endswith((b"x", b"X"))
+            can_id = int(raw_id.rstrip(b"xX"), base)
+            dlc = int(fields[5], 16)
+            payload = bytes(int(b, base) for b in fields[6:6 + dlc])
+            yield float(head), fields[1].decode(), can_id, extended, payload
+        except ValueError:
+            continue
+
+
+def iter_blf(path):
+    """Vector BLF 로그 -> (timestamp, channel, arbitration_id, is_extended, data)"""
+    with can.BLFReader(str(path)) as reader:
+        for msg in reader:
+            if msg.is_error_frame or msg.is_remote_frame:
+                continue
+            yield msg.timestamp, str(msg.channel), msg.arbitration_id, msg.is_extended_id, bytes(msg.data)
+
+
+_ITERATORS = {"candump": iter_candump, "asc": iter_asc, "blf": iter_blf}
+
+
+def iter_log_records(path, log_format=None):
+    """로그 파일 -> 레코드 튜플 스트림 (형식 미지정 시 확장자로 판단)"""
+    return _ITERATORS[log_format or detect_format(path)](path)
+
+
+def read_messages(path, log_format=None):
+    """로그 파일 -> can.Message 스트림"""
+    for timestamp, channel, can_id, extended, payload in iter_log_records(path, log_format):
+        yield can.Message(timestamp=timestamp, channel=channel, arbitration_id=can_id,
+                          is_extended_id=extended, data=payload)
+
+
+def _frame_array(timestamps, can_ids, dlcs, payloads):
+    frames = np.zeros(len(timestamps), dtype=CAN_FRAME_DTYPE)
+    frames["timestamp"] = timestamps
+    frames["arbitration_id"] = can_ids
+    frames["dlc"] = dlcs
+    frames["data"] = np.frombuffer(bytes(payloads), dtype=np.uint8).reshape(-1, 8)
+    return frames
+
+
+def read_frame_arrays(path, log_format=None, chunk_size=100000):
+    """로그 파일 -> CAN_FRAME_DTYPE 배열 청크 스트림 (배치 디코더 입력용)"""
+    timestamps, can_ids, dlcs, payloads = [], [], [], bytearray()
+    for timestamp, _, can_id, _, payload in iter_log_records(path, log_format):
+        timestamps.append(timestamp)
+        can_ids.append(can_id)
+        dlcs.append(min(len(payload), 8))
+        payloads += payload[:8].ljust(8, b"\xff")
+        if len(timestamps) == chunk_size:
+            yield _frame_array(timestamps, can_ids, dlcs, payloads)
+            timestamps, can_ids, dlcs, payloads = [], [], [], bytearray()
+    if timestamps:
+        yield _frame_array(timestamps, can_ids, dlcs, payloads)
+
+
+class CANLogReplayer:
+    """로그 파일 시간 정확 재생기 (bus.recv 호환)"""
+
+    def __init__(self, path, speed=1.0, log_format=None, loop=False):
+        self.path = path
+        self.log_format = log_format or detect_format(path)
+        self.speed = speed or None
+        self.loop = loop
+        self.finished = False
+
+        self._messages = None
+        self._log_start = None
+        self._wall_start = None
+        self.stats = {"frames": 0, "late_frames": 0, "max_lateness": 0.0, "loops": 0}
+
+    def _next_message(self):
+        """다음 메시지 (반복 재생 시 처음부터 다시)"""
+        while True:
+            if self._messages is None:
+                self._messages = read_messages(self.path, self.log_format)
+            msg = next(self._messages, None)
+            if msg is not None:
+                return msg
+            self._messages = None
+            if not self.loop:
+                return None
+            self.stats["loops"] += 1
+            self._log_start = None
+
+    def recv(self, timeout=None):
+        """다음 프레임을 원래 시간 간격(배속 반영)에 맞춰 반환, 로그 끝이면 None"""
+        if self.finished:
+            return None
+        msg = self._next_message()
+        if msg is None:
+            self.finished = True
+            return None
+
+        if self.speed is not None:
+            if self._log_start is None:
+                self._log_start = msg.timestamp
+                self._wall_start = time.monotonic()
+            deadline = self._wall_start + (msg.timestamp - self._log_start) / self.speed
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.001:
+                # 처리 지연으로 원래 시각보다 늦게 전달된 프레임
+                self.stats["late_frames"] += 1
+                self.stats["max_lateness"] = max(self.stats["max_lateness"], -delay)
+        self.stats["frames"] += 1
+        return msg
+
+    def __iter__(self):
+        while True:
+            msg = self.recv()
+            if msg is None:
+                return
+            yield msg
+
+    def shutdown(self):
+        """재생 중지"""
+        self.finished = True
+        self._messages = None
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+압축 바이너리 CAN 레코더
+- 고정 크기 레코드 (CAN_FRAME_DTYPE, 21바이트) 를 채널별 추가 전용 파일에 기록, 크기 기준 회전
+- 희소 시간 인덱스 (.idx): N 레코드마다 (timestamp, 레코드 번호) 1개
+- 읽기는 np.memmap: 일주일치 기록에서도 인덱스 탐색 후 해당 구간만 읽음
+- 확장 ID 여부는 중재 ID 최상위 비트(CAN_EFF_FLAG)에 보관
+"""
+
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+
+import can
+import numpy as np
+
+from batch_decoder import CAN_FRAME_DTYPE
+
+RECORDING_MAGIC = b"DTGCAN01"
+RECORDING_SUFFIX = ".dtgcan"
+INDEX_SUFFIX = ".idx"
+CAN_EFF_FLAG = 0x80000000
+
+# 파일 헤더 (64바이트): 매직, 레코드 크기, 인덱스 간격, 생성 시각, 채널명
+_HEADER = struct.Struct("<8sHIxxd16s24x")
+_RECORD = struct.Struct("<dIB8s")
+INDEX_DTYPE = np.dtype([("timestamp", "<f8"), ("record", "<u8")])
+
+assert _RECORD.size == CAN_FRAME_DTYPE.itemsize
+
+
+class CANRecorder:
+    """채널 1개의 바이너리 레코더 (버퍼링 후 일괄 기록, 파일 회전)"""
+
+    def __init__(self, directory, channel="can0", max_bytes=256 * 1024 * 1024, index_interval=1024,
+                 buffer_records=4096):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.channel = channel
+        self.max_bytes = max_bytes
+        self.index_interval = index_interval
+        self.buffer_records = buffer_records
+
+        self._buffer = bytearray(buffer_records * _RECORD.size)
+        self._buffered = 0
+        self._index = []
+        self._file = None
+        self._index_file = None
+        self._file_records = 0
+        self._sequence = 0
+        self.path = None
+        self.stats = {"frames": 0, "bytes_written": 0, "files": 0, "flushes": 0}
+
+    def _open_file(self):
+        """새 기록 파일 + 인덱스 파일 열기"""
+        self._sequence += 1
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        self.path = self.directory / f"{self.channel}-{stamp}-{self._sequence:04d}{RECORDING_SUFFIX}"
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(RECORDING_MAGIC, _RECORD.size, self.index_interval, time.time(),
+                                      self.channel.encode("utf-8")[:16]))
+        self._index_file = open(self.path.with_suffix(INDEX_SUFFIX), "wb")
+        self._file_records = 0
+        self.stats["files"] += 1
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._index_file.close()
+            self._file = None
+            self._index_file = None
+
+    def record_frame(self, timestamp, arbitration_id, data, extended=True):
+        """프레임 1개 버퍼에 추가"""
+        if self._file is None:
+            self._open_file()
+        record_no = self._file_records + self._buffered
+        if record_no % self.index_interval == 0:
+            self._index.append((timestamp, record_no))
+        can_id = arbitration_id | CAN_EFF_FLAG if extended else arbitration_id
+        payload = bytes(data[:8])
+        _RECORD.pack_into(self._buffer, self._buffered * _RECORD.size, timestamp, can_id, len(payload), payload)
+        self._buffered += 1
+        self.stats["frames"] += 1
+        if self._buffered == self.buffer_records:
+            self.flush()
+
+    def record(self, msg):
+        """can.Message 기록"""
+        self.record_frame(msg.timestamp, msg.arbitration_id, msg.data, msg.is_extended_id)
+
+    def flush(self):
+        """버퍼 / 인덱스 디스크 기록 (파일 크기 초과 시 회전)"""
+        if self._file is None or not self._buffered:
+            return
+        size = self._buffered * _RECORD.size
+        self._file.write(memoryview(self._buffer)[:size])
+        self._file.flush()
+        if self._index:
+            self._index_file.write(np.array(self._index, dtype=INDEX_DTYPE).tobytes())
+            self._index_file.flush()
+            self._index = []
+        self._file_records += self._buffered
+        self._buffered = 0
+        self.stats["bytes_written"] += size
+        self.stats["flushes"] += 1
+        if self._file.tell() >= self.max_bytes:
+            self._close_file()
+
+    def close(self):
+        """남은 버퍼 기록 후 파일 닫기"""
+        self.flush()
+        self._close_file()
+
+
+class RecordingReader:
+    """기록 파일 1개 메모리 매핑 리더"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic, record_size, index_interval, created, channel = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != RECORDING_MAGIC or record_size != CAN_FRAME_DTYPE.itemsize:
+            raise ValueError(f"DTG CAN 기록 파일이 아닙니다: {path}")
+        self.channel = channel.rstrip(b"\x00").decode("utf-8")
+        self.created = created
+        self.index_interval = index_interval
+
+        # 기록 중 잘린 마지막 레코드는 제외
+        count = (os.path.getsize(self.path) - _HEADER.size) // record_size
+        self.frames = (np.memmap(self.path, dtype=CAN_FRAME_DTYPE, mode="r", offset=_HEADER.size, shape=(count,))
+                       if count else np.zeros(0, dtype=CAN_FRAME_DTYPE))
+        index_path = self.path.with_suffix(INDEX_SUFFIX)
+        index = np.fromfile(index_path, dtype=INDEX_DTYPE) if index_path.exists() else np.zeros(0, INDEX_DTYPE)
+        self.index = index[index["record"] < count]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def time_range(self):
+        """(첫 프레임 시각, 마지막 프레임 시각), 비어 있으면 None"""
+        if not len(self.frames):
+            return None
+        return float(self.frames[0]["timestamp"]), float(self.frames[-1]["timestamp"])
+
+    def _record_bounds(self, start, end):
+        """인덱스로 후보 구간을 좁힌 뒤 그 구간 안에서만 이진 탐색"""
+        count = len(self.frames)
+        stamps = self.index["timestamp"]
+        records = self.index["record"]
+        lo_slot = np.searchsorted(stamps, start, side="left") - 1
+        hi_slot = np.searchsorted(stamps, end, side="right")
+        lo = int(records[lo_slot]) if lo_slot >= 0 else 0
+        hi = int(records[hi_slot]) if hi_slot < len(records) else count
+        window = self.frames["timestamp"][lo:hi]
+        return (lo + int(np.searchsorted(window, start, side="left")),
+                lo + int(np.searchsorted(window, end, side="right")))
+
+    def window(self, start, end):
+        """start <= timestamp <= end 프레임 배열 (복사본, 중재 ID 에서 CAN_EFF_FLAG 제거)"""
+        lo, hi = self._record_bounds(start, end)
+        frames = np.array(self.frames[lo:hi])
+        frames["arbitration_id"] &= ~np.uint32(CAN_EFF_FLAG)
+        return frames
+
+    def messages(self, start=None, end=None):
+        """구간 프레임 -> can.Message 스트림"""
+        lo, hi = self._record_bounds(-np.inf if start is None else start, np.inf if end is None else end)
+        for i in range(lo, hi):
+            frame = self.frames[i]
+            can_id = int(frame["arbitration_id"])
+            yield can.Message(timestamp=float(frame["timestamp"]), channel=self.channel,
+                              arbitration_id=can_id & ~CAN_EFF_FLAG, is_extended_id=bool(can_id & CAN_EFF_FLAG),
+                              data=frame["data"][:frame["dlc"]].tobytes())
+
+
+def list_recordings(directory, channel=None):
+    """디렉터리의 기록 파일 목록 (채널 지정 시 해당 채널만, 이름순 = 시간순)"""
+    pattern = f"{channel}-*{RECORDING_SUFFIX}" if channel else f"*{RECORDING_SUFFIX}"
+    return sorted(Path(directory).glob(pattern))
+
+
+def read_window(directory, channel, start, end):
+    """회전된 기록 파일들에서 시간 구간 프레임 배열 추출"""
+    parts = []
+    for path in list_recordings(directory, channel):
+        reader = RecordingReader(path)
+        span = reader.time_range()
+        if span is None or span[1] < start or span[0] > end:
+            continue
+        parts.append(reader.window(start, end))
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=CAN_FRAME_DTYPE)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+디코딩 신호 변화 감지 필터 (send-on-delta)
+- 디코더와 소비자 사이: 마지막으로 내보낸 값 대비 불감대(deadband) 이상 변했을 때만 전달
+- 최대 간격(max_interval) 이 지나면 변화가 없어도 하트비트로 전달
+- 규칙은 SPN 별 (SPN 이 없는 신호는 신호 타입 별), 상태는 (채널, 송신 주소, PGN, 신호) 별
+- 시각은 프레임 타임스탬프 기준 (로그 재생 결과가 실시간 수집과 같음)
+- 값 외 부가 정보 (DM1 의 dtcs / lamp_status 등) 는 불감대 없이 같은지만 비교
+"""
+
+import json
+
+# 기본 불감대 / 최대 간격 (키: SPN 정수 또는 신호 타입 문자열)
+DEADBAND_TABLE = {
+    "speed": {"deadband": 0.5, "max_interval": 1.0},
+    "rpm": {"deadband": 25.0, "max_interval": 1.0},
+    "fuel_rate": {"deadband": 0.5, "max_interval": 1.0},
+    84: {"deadband": 0.5, "max_interval": 1.0},  # 휠 기반 차속
+    110: {"deadband": 1.0, "max_interval": 10.0},  # 냉각수 온도
+    175: {"deadband": 1.0, "max_interval": 10.0},  # 엔진 오일 온도
+    247: {"deadband": 0.05, "max_interval": 60.0},  # 엔진 가동 시간
+    249: {"deadband": 1000.0, "max_interval": 60.0},  # 엔진 누적 회전수
+    582: {"deadband": 50.0, "max_interval": 10.0},  # 축중
+    928: {"deadband": 0.0, "max_interval": 10.0},  # 축 위치
+}
+
+# 디코더 신호 기본 키 (이 밖의 키는 부가 정보로 비교, received_at 은 수신 시각이라 제외)
+SIGNAL_FIELDS = frozenset(("type", "value", "unit", "pgn", "spn", "source", "received_at"))
+# 디코더 신호 dict 의 키 개수 (이하이면 부가 정보 없음, 키 순회 생략)
+_BASE_FIELD_COUNT = 6
+
+
+def signal_details(signal):
+    """신호의 부가 정보 dict (없으면 None)"""
+    if len(signal) <= _BASE_FIELD_COUNT:
+        return None
+    return {key: item for key, item in signal.items() if key not in SIGNAL_FIELDS} or None
+
+
+def load_deadband_table(path):
+    """JSON 규칙 파일 -> 불감대 테이블 (숫자 키는 SPN 정수로 변환)"""
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    return {int(key) if str(key).isdigit() else key: rule for key, rule in document.items()}
+
+
+class ChangeFilter:
+    """신호별 불감대 + 하트비트 필터"""
+
+    def __init__(self, deadband_table=None, default_deadband=0.0, default_max_interval=1.0):
+        self.table = dict(DEADBAND_TABLE if deadband_table is None else deadband_table)
+        self.default_rule = (default_deadband, default_max_interval)
+        self._rules = {}
+        self._last = {}
+        self.stats = {"signals": 0, "emitted": 0, "suppressed": 0, "heartbeats": 0}
+        self.suppressed_by_type = {}
+
+    def set_rule(self, key, deadband=0.0, max_interval=None):
+        """실행 중 규칙 추가 / 교체 (key: SPN 또는 신호 타입)"""
+        self.table[key] = {"deadband": deadband, "max_interval": max_interval}
+        self._rules.clear()
+
+    def _rule(self, spn, signal_type):
+        """(spn, 타입) -> (deadband, max_interval), 결과 캐시"""
+        cache_key = (spn, signal_type)
+        try:
+            return self._rules[cache_key]
+        except KeyError:
+            rule = self.table.get(spn) if spn is not None else None
+            if rule is None:
+                rule = self.table.get(signal_type)
+            if rule is None:
+                resolved = self.default_rule
+            else:
+                resolved = (rule.get("deadband", self.default_rule[0]),
+                            rule.get("max_interval", self.default_rule[1]))
+            self._rules[cache_key] = resolved
+            return resolved
+
+    def accept(self, signal, timestamp, channel=None):
+        """신호 1개 전달 여부 (전달 시 기준값 갱신)"""
+        self.stats["signals"] += 1
+        signal_type = signal["type"]
+        key = (channel, signal["source"], signal["pgn"], signal_type)
+        value = signal["value"]
+        details = signal_details(signal)
+        last = self._last.get(key)
+        if last is not None:
+            last_value, last_details, last_time = last
+            deadband, max_interval = self._rule(signal.get("spn"), signal_type)
+            if isinstance(value, (int, float)) and isinstance(last_value, (int, float)):
+                changed = abs(value - last_value) > deadband
+            else:
+                # DTC / VIN 등 비수치 신호는 값이 바뀔 때만
+                changed = value != last_value
+            # 부가 정보 변화 (예: DTC 개수는 같고 SPN 만 바뀐 DM1) 는 값 변화와 같이 취급
+            changed = changed or details != last_details
+            if not changed:
+                if max_interval is None or timestamp - last_time < max_interval:
+                    self.stats["suppressed"] += 1
+                    self.suppressed_by_type[signal_type] = self.suppressed_by_type.get(signal_type, 0) + 1
+                    return False
+                self.stats["heartbeats"] += 1
+        self._last[key] = (value, details, timestamp)
+        self.stats["emitted"] += 1
+        return True
+
+    def apply(self, signals, timestamp, channel=None):
+        """프레임 1개의 신호 리스트 -> 전달할 신호만"""
+        return [signal for signal in signals if self.accept(signal, timestamp, channel)]
+
+    def reset(self):
+        """기준값 초기화 (다음 신호는 모두 전달)"""
+        self._last.clear()
+
+    def snapshot(self):
+        """전달 / 억제 지표 (suppression_ratio: 억제된 신호 비율)"""
+        stats = dict(self.stats)
+        stats["suppression_ratio"] = stats["suppressed"] / stats["signals"] if stats["signals"] else 0.0
+        stats["suppressed_by_type"] = dict(self.suppressed_by_type)
+        stats["tracked_signals"] = len(self._last)
+        return stats
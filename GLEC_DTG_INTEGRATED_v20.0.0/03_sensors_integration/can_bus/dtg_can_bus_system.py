@@ -4,68 +4,336 @@ DTG CAN Bus 시스템 v2.0
 Critical Requirement #2: J1939 프로토콜 완전 구현
 """
 
+import argparse
+import asyncio
 import can
-import struct
 import time
 from datetime import datetime
 
+from async_ingestion import DROP_POLICIES, AsyncCANIngestor, ChannelMerger
+from batch_decoder import J1939BatchDecoder
+from can_log_reader import CANLogReplayer
+from can_recorder import CANRecorder
+from change_filter import ChangeFilter, load_deadband_table
+from j1939_decoder import J1939Decoder, can_filters_for_pgns, load_pgn_table, pgn_from_arbitration_id
+from j1939_transport import MULTIPACKET_PGNS, TP_CM_PGN, TP_DT_PGN, J1939TransportReassembler, decode_multipacket
+from signal_snapshot import SignalSnapshotStore
+
 class DTGCANBusSystem:
     """DTG CAN Bus 완전 구현 시스템"""
     
-    def __init__(self):
+    def __init__(self, pgn_table=None, pgn_file=None):
+        # PGN 정의: 인자 테이블 > 정의 파일(JSON / DBC) > 기본 테이블
+        if pgn_table is None and pgn_file is not None:
+            pgn_table = load_pgn_table(pgn_file)
+        # TP / 다중 패킷 PGN 은 decode_multipacket_message 가 처리 (디코더 지표에서 unhandled 제외)
+        self.decoder = J1939Decoder(pgn_table, transport_pgns=(TP_CM_PGN, TP_DT_PGN) + MULTIPACKET_PGNS)
+        self.batch_decoder = J1939BatchDecoder(self.decoder)
+        self.transport = J1939TransportReassembler()
+        self.recorder = None
+        self.change_filter = None
+        self.snapshot_store = None
+        self.vehicle_id = None
+        self.channel = 'can0'
+        self.kernel_filters = True
         self.j1939_messages = {
-            0x00F00400: "Vehicle Speed (TSC1)",
-            0x00F00300: "Engine Speed (EEC1)", 
-            0x00FEF200: "Fuel Economy (LFE)",
-            0x00FEE500: "Engine Temperature (ET1)",
-            0x00FEF100: "Vehicle Weight (VW)"
+            pgn << 8: layout.name for pgn, layout in self.decoder.layouts.items()
         }
         
-    def initialize_can_interface(self):
-        """CAN 인터페이스 초기화"""
+    def initialize_can_interface(self, channel='can0', interface='socketcan', kernel_filters=True):
+        """CAN 인터페이스 초기화 (kernel_filters: 처리 PGN 외 프레임은 커널에서 차단)"""
+        self.channel = channel
+        self.kernel_filters = kernel_filters
         try:
             # 실제 CAN 인터페이스 설정
-            self.bus = can.interface.Bus(channel='can0', bustype='socketcan')
-            print("✅ CAN Bus 연결 성공")
+            self.bus = can.interface.Bus(channel=channel, interface=interface,
+                                         can_filters=self.can_filters() if kernel_filters else None)
+            print(f"✅ CAN Bus 연결 성공: {channel}")
             return True
         except Exception as e:
             print(f"❌ CAN Bus 연결 실패: {e}")
             return False
     
-    def parse_j1939_message(self, msg):
-        """J1939 메시지 파싱"""
-        pgn = (msg.arbitration_id >> 8) & 0x1FFFF
-        
-        if pgn == 0xF004:  # TSC1 - Vehicle Speed
-            speed = struct.unpack('<H', msg.data[4:6])[0] * 0.00390625
-            return {"type": "speed", "value": speed, "unit": "km/h"}
-            
-        elif pgn == 0xF003:  # EEC1 - Engine Speed  
-            rpm = struct.unpack('<H', msg.data[3:5])[0] * 0.125
-            return {"type": "rpm", "value": rpm, "unit": "rpm"}
-            
-        elif pgn == 0xFEF2:  # LFE - Fuel Economy
-            fuel_rate = struct.unpack('<H', msg.data[0:2])[0] * 0.05
-            return {"type": "fuel_rate", "value": fuel_rate, "unit": "L/h"}
-            
+    def accepted_pgns(self):
+        """수신해야 하는 PGN: 단일 프레임 테이블 + TP.CM / TP.DT + 다중 패킷 PGN"""
+        return set(self.decoder.pgns) | {TP_CM_PGN, TP_DT_PGN} | set(MULTIPACKET_PGNS)
+    
+    def can_filters(self):
+        """수신 PGN 목록 -> CAN ID 필터 목록"""
+        return can_filters_for_pgns(self.accepted_pgns())
+    
+    def apply_filters(self):
+        """현재 PGN 목록으로 버스 수신 필터 재설치 (로그 재생기는 필터 없음)"""
+        bus = getattr(self, "bus", None)
+        if bus is None or not self.kernel_filters or not hasattr(bus, "set_filters"):
+            return False
+        bus.set_filters(self.can_filters())
+        return True
+    
+    def add_pgn(self, pgn, definition):
+        """실행 중 PGN 정의 추가 / 교체 후 필터 갱신"""
+        self.decoder.add_pgn(pgn, definition)
+        self.j1939_messages[pgn << 8] = self.decoder.layouts[pgn].name
+        self.apply_filters()
+    
+    def remove_pgn(self, pgn):
+        """실행 중 PGN 제거 후 필터 갱신"""
+        self.decoder.remove_pgn(pgn)
+        self.j1939_messages.pop(pgn << 8, None)
+        self.apply_filters()
+    
+    def initialize_log_replay(self, path, speed=1.0, loop=False):
+        """CAN 하드웨어 대신 로그 파일(candump / ASC / BLF) 재생 (speed: N배속, None/0 이면 최대 속도)"""
+        try:
+            self.bus = CANLogReplayer(path, speed=speed, loop=loop)
+            print(f"✅ CAN 로그 재생 준비: {path} ({self.bus.log_format})")
+            return True
+        except Exception as e:
+            print(f"❌ CAN 로그 열기 실패: {e}")
+            return False
+    
+    def enable_recording(self, directory, channel=None, **options):
+        """수신 원시 프레임 바이너리 기록 시작 (CANRecorder 옵션 전달, 기본 채널명은 연결 채널)"""
+        self.recorder = CANRecorder(directory, channel=channel or self.channel, **options)
+        print(f"✅ CAN 프레임 기록: {directory}")
+        return self.recorder
+    
+    def enable_change_filter(self, deadband_table=None, deadband_file=None, **options):
+        """디코딩 신호 send-on-delta 필터 시작 (규칙: 인자 테이블 > JSON 파일 > 기본 테이블)"""
+        if deadband_table is None and deadband_file is not None:
+            deadband_table = load_deadband_table(deadband_file)
+        self.change_filter = ChangeFilter(deadband_table, **options)
+        return self.change_filter
+    
+    def enable_snapshot_store(self, store=None, vehicle_id=None):
+        """차량별 최신 신호 스냅샷 저장 시작 (vehicle_id 기본값: 연결 채널명)"""
+        self.snapshot_store = store if store is not None else SignalSnapshotStore()
+        self.vehicle_id = vehicle_id or self.channel
+        return self.snapshot_store
+    
+    def handle_message(self, msg):
+        """수신 프레임 1개: 기록 -> 디코딩 -> 스냅샷 갱신 -> 변화 감지 필터 -> 전달할 신호 리스트 (없으면 None)"""
+        if self.recorder is not None:
+            self.recorder.record(msg)
+        signals = self.decode_j1939_message(msg)
+        if signals and self.snapshot_store is not None:
+            # 스냅샷은 필터 이전 값 (불감대 이내 변화도 최신값에 반영)
+            self.snapshot_store.update(self.vehicle_id, signals, msg.timestamp)
+        if signals and self.change_filter is not None:
+            signals = self.change_filter.apply(signals, msg.timestamp)
+        return signals
+    
+    def close(self):
+        """기록 버퍼 정리 및 버스 종료"""
+        if self.recorder is not None:
+            self.recorder.close()
+        bus = getattr(self, "bus", None)
+        if bus is not None:
+            bus.shutdown()
+    
+    def decode_j1939_message(self, msg):
+        """J1939 메시지의 모든 SPN 신호 디코딩 (미지원 PGN 이면 None)"""
+        signals = self.decoder.decode(msg.arbitration_id, msg.data)
+        if signals is not None:
+            return signals
+        return self.decode_multipacket_message(msg)
+    
+    def decode_multipacket_message(self, msg):
+        """단일 프레임 테이블에 없는 프레임: TP 재조립 / DM1 / VI 처리"""
+        pgn = pgn_from_arbitration_id(msg.arbitration_id)
+        if pgn == TP_CM_PGN or pgn == TP_DT_PGN:
+            completed = self.transport.feed(msg.arbitration_id, msg.data, msg.timestamp)
+            if completed is None:
+                return None
+            pgn, source, _, payload = completed
+            return decode_multipacket(pgn, source, payload)
+        if pgn in MULTIPACKET_PGNS:
+            return decode_multipacket(pgn, msg.arbitration_id & 0xFF, msg.data)
         return None
     
-    def collect_can_data(self):
-        """CAN 데이터 수집"""
+    def decode_j1939_batch(self, frames):
+        """CAN 프레임 구조화 배열(CAN_FRAME_DTYPE) 일괄 디코딩 -> {PGN: 컬럼 dict}"""
+        return self.batch_decoder.decode(frames)
+    
+    def parse_j1939_message(self, msg):
+        """J1939 메시지 파싱 (첫 번째 신호만 반환, 전체는 decode_j1939_message)"""
+        signals = self.decoder.decode(msg.arbitration_id, msg.data)
+        return signals[0] if signals else None
+    
+    def collect_can_data(self, verbose=False):
+        """CAN 데이터 수집 (동기 제너레이터, verbose 이면 프레임마다 출력)"""
+        backoff = 0.01
         while True:
             try:
-                msg = self.bus.recv(timeout=1.0)
+                # 짧은 수신 대기: 프레임이 없어도 TP 세션 타임아웃 정리
+                msg = self.bus.recv(timeout=0.1)
+                self.transport.poll()
+                backoff = 0.01
+                if msg is None and getattr(self.bus, "finished", False):
+                    # 로그 재생 종료
+                    return
                 if msg:
-                    parsed = self.parse_j1939_message(msg)
-                    if parsed:
-                        print(f"CAN Data: {parsed}")
+                    signals = self.handle_message(msg)
+                    for parsed in signals or ():
+                        if verbose:
+                            print(f"CAN Data: {parsed}")
                         yield parsed
             except Exception as e:
                 print(f"CAN 수집 오류: {e}")
-                time.sleep(1)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 1.0)
+    
+    async def start_async_ingestion(self, maxsize=10000, policy="drop_oldest", **options):
+        """asyncio 수집 시작 -> (수집기, 신호 큐), 큐는 RealTimeDataIntegrator(signal_queue=...) 로 전달"""
+        ingestor = AsyncCANIngestor(self, maxsize=maxsize, policy=policy, **options)
+        queue = await ingestor.start()
+        return ingestor, queue
 
-if __name__ == "__main__":
-    can_system = DTGCANBusSystem()
-    if can_system.initialize_can_interface():
-        for data in can_system.collect_can_data():
+class MultiChannelCANSystem:
+    """다중 CAN 채널 (파워트레인 / 바디 등) 동시 수집: 채널별 디코더 / 통계 / 수신 스레드"""
+    
+    def __init__(self, channels, pgn_table=None, pgn_file=None):
+        if pgn_table is None and pgn_file is not None:
+            pgn_table = load_pgn_table(pgn_file)
+        self.channels = list(channels)
+        self.systems = {channel: DTGCANBusSystem(pgn_table) for channel in self.channels}
+        self.merger = None
+    
+    def initialize_can_interfaces(self, interface='socketcan', kernel_filters=True):
+        """모든 채널 인터페이스 초기화 (하나라도 실패하면 False)"""
+        results = [system.initialize_can_interface(channel=channel, interface=interface,
+                                                   kernel_filters=kernel_filters)
+                   for channel, system in self.systems.items()]
+        return all(results)
+    
+    def enable_recording(self, directory, **options):
+        """채널별 바이너리 기록 시작 (파일명에 채널명 포함)"""
+        for channel, system in self.systems.items():
+            system.enable_recording(directory, channel=channel, **options)
+    
+    def enable_change_filter(self, deadband_table=None, deadband_file=None, **options):
+        """채널별 send-on-delta 필터 시작 (같은 규칙, 채널별 상태)"""
+        if deadband_table is None and deadband_file is not None:
+            deadband_table = load_deadband_table(deadband_file)
+        for system in self.systems.values():
+            system.enable_change_filter(deadband_table, **options)
+    
+    def enable_snapshot_store(self, store=None, vehicle_id=None):
+        """모든 채널이 한 차량 행을 공유하는 스냅샷 저장소 (vehicle_id 기본값: 채널명 연결)"""
+        store = store if store is not None else SignalSnapshotStore()
+        vehicle_id = vehicle_id or "+".join(self.channels)
+        for system in self.systems.values():
+            system.enable_snapshot_store(store, vehicle_id)
+        return store
+    
+    def add_pgn(self, pgn, definition):
+        """모든 채널에 PGN 정의 추가 / 교체"""
+        for system in self.systems.values():
+            system.add_pgn(pgn, definition)
+    
+    def remove_pgn(self, pgn):
+        """모든 채널에서 PGN 제거"""
+        for system in self.systems.values():
+            system.remove_pgn(pgn)
+    
+    async def start_async_ingestion(self, maxsize=10000, policy="drop_oldest", reorder_window=0.05, **options):
+        """채널별 수집기 시작 + 타임스탬프 순 병합 -> (병합기, 채널 태그가 붙은 단일 신호 큐)"""
+        ingestors = {}
+        for channel, system in self.systems.items():
+            ingestors[channel] = AsyncCANIngestor(system, maxsize=maxsize, policy=policy, channel=channel,
+                                                  **options)
+            await ingestors[channel].start()
+        self.merger = ChannelMerger(ingestors, maxsize=maxsize, reorder_window=reorder_window, policy=policy)
+        queue = await self.merger.start()
+        return self.merger, queue
+    
+    def snapshot(self):
+        """채널별 디코더 / 전송 프로토콜 / 수집 지표"""
+        merge = self.merger.snapshot() if self.merger is not None else {"channels": {}}
+        channels = {}
+        for channel, system in self.systems.items():
+            channels[channel] = {
+                "decoder": dict(system.decoder.stats),
+                "transport": system.transport.snapshot(),
+                "change_filter": system.change_filter.snapshot() if system.change_filter is not None else None,
+                "ingest": merge["channels"].get(channel),
+            }
+        merge["channels"] = channels
+        return merge
+    
+    def close(self):
+        for system in self.systems.values():
+            system.close()
+
+async def consume_async(can_system, maxsize, policy):
+    """asyncio 수집 모드: 큐에서 신호를 꺼내 출력, 종료 시 수집 지표 출력"""
+    ingestor, queue = await can_system.start_async_ingestion(maxsize=maxsize, policy=policy)
+    try:
+        while not (ingestor.finished.is_set() and queue.empty()):
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
             print(f"수집: {data}")
+    finally:
+        await ingestor.stop()
+        print(f"수집 지표: {ingestor.snapshot()}")
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="DTG CAN Bus 시스템")
+    parser.add_argument("--pgn-file", type=str, default=None,
+                        help="PGN / SPN 정의 파일 (JSON 또는 DBC, 기본: 내장 테이블)")
+    parser.add_argument("--channels", type=str, default="can0",
+                        help="수집할 CAN 채널 (쉼표 구분, 예: can0,can1 / 2개 이상이면 asyncio 병합 수집)")
+    parser.add_argument("--replay", type=str, default=None,
+                        help="CAN 인터페이스 대신 재생할 로그 파일 (.log candump / .asc / .blf)")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="로그 재생 배속 (0: 대기 없이 최대 속도, 기본: 원래 시간)")
+    parser.add_argument("--record", type=str, default=None,
+                        help="수신 원시 프레임을 바이너리로 기록할 디렉터리")
+    parser.add_argument("--deadband", action="store_true",
+                        help="변화 감지 필터 사용 (불감대 이내 변화는 최대 간격마다만 전달)")
+    parser.add_argument("--deadband-file", type=str, default=None,
+                        help="불감대 / 최대 간격 규칙 JSON (키: SPN 또는 신호 타입, --deadband 포함)")
+    parser.add_argument("--no-kernel-filters", action="store_true",
+                        help="커널 CAN ID 필터 미설치 (모든 프레임 수신)")
+    parser.add_argument("--async-ingest", action="store_true",
+                        help="asyncio 수집 모드 (수신 스레드 -> 제한 크기 큐)")
+    parser.add_argument("--queue-size", type=int, default=10000,
+                        help="asyncio 수집 큐 크기 (기본: 10000)")
+    parser.add_argument("--queue-policy", choices=DROP_POLICIES, default="drop_oldest",
+                        help="큐가 가득 찼을 때 정책 (기본: drop_oldest)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    channels = [channel.strip() for channel in args.channels.split(",") if channel.strip()]
+    if len(channels) > 1 and not args.replay:
+        # 다중 채널: 채널별 수신 스레드 + 타임스탬프 순 병합
+        can_system = MultiChannelCANSystem(channels, pgn_file=args.pgn_file)
+        connected = can_system.initialize_can_interfaces(kernel_filters=not args.no_kernel_filters)
+        async_ingest = True
+    else:
+        can_system = DTGCANBusSystem(pgn_file=args.pgn_file)
+        if args.replay:
+            connected = can_system.initialize_log_replay(args.replay, speed=args.replay_speed)
+        else:
+            connected = can_system.initialize_can_interface(channel=channels[0],
+                                                            kernel_filters=not args.no_kernel_filters)
+        async_ingest = args.async_ingest
+    if connected:
+        if args.record:
+            can_system.enable_recording(args.record)
+        if args.deadband or args.deadband_file:
+            can_system.enable_change_filter(deadband_file=args.deadband_file)
+        try:
+            if async_ingest:
+                asyncio.run(consume_async(can_system, args.queue_size, args.queue_policy))
+            else:
+                for data in can_system.collect_can_data():
+                    print(f"수집: {data}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            can_system.close()
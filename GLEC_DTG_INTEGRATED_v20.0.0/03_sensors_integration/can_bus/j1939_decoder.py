@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+테이블 기반 J1939 디코더
+- PGN / SPN 정의 테이블(시작 비트, 길이, 배율, 오프셋, 단위)로 디코딩 규칙 선언
+- PGN 별 struct.Struct 사전 컴파일 (바이트 정렬 필드) 또는 비트 마스크 (비정렬 필드)
+- 중재 ID -> 컴파일된 레이아웃 dict 디스패치 + ID 별 캐시
+- 정의 파일: JSON 또는 DBC 형식 (BO_ / SG_ / BA_ "SPN")
+- 처리 PGN 목록 -> CAN ID 수신 필터 (커널에서 불필요한 프레임 차단)
+- J1939 오류 / 미지원 범위 원시값 (예: 16비트 0xFB00 이상) 은 신호에서 제외 (기존 if/elif 파서는 그대로 환산)
+  기존 동작이 필요하면 J1939Decoder(skip_not_available=False)
+- 다른 계층 (TP 재조립 / 다중 패킷 디코더) 이 처리하는 PGN 은 unhandled 가 아닌 transport 로 집계
+"""
+
+import json
+import re
+import struct
+
+# 기본 PGN 테이블 (PGN -> 메시지 이름 + 신호 목록, start_bit 는 LSB 기준 인텔 바이트 순서)
+J1939_PGN_TABLE = {
+    0xF004: {
+        "name": "Vehicle Speed (TSC1)",
+        "signals": [
+            {"type": "speed", "start_bit": 32, "length": 16, "scale": 0.00390625, "offset": 0, "unit": "km/h"},
+        ],
+    },
+    0xF003: {
+        "name": "Engine Speed (EEC1)",
+        "signals": [
+            {"type": "rpm", "start_bit": 24, "length": 16, "scale": 0.125, "offset": 0, "unit": "rpm"},
+        ],
+    },
+    0xFEF2: {
+        "name": "Fuel Economy (LFE)",
+        "signals": [
+            {"type": "fuel_rate", "start_bit": 0, "length": 16, "scale": 0.05, "offset": 0, "unit": "L/h"},
+        ],
+    },
+    0xFEE5: {
+        "name": "Engine Hours, Revolutions (HOURS)",
+        "signals": [
+            {"type": "engine_hours", "spn": 247, "start_bit": 0, "length": 32, "scale": 0.05, "offset": 0,
+             "unit": "h"},
+            {"type": "engine_revolutions", "spn": 249, "start_bit": 32, "length": 32, "scale": 1000, "offset": 0,
+             "unit": "r"},
+        ],
+    },
+    0xFEEE: {
+        "name": "Engine Temperature (ET1)",
+        "signals": [
+            {"type": "coolant_temp", "spn": 110, "start_bit": 0, "length": 8, "scale": 1, "offset": -40,
+             "unit": "°C"},
+            {"type": "oil_temp", "spn": 175, "start_bit": 16, "length": 16, "scale": 0.03125, "offset": -273,
+             "unit": "°C"},
+        ],
+    },
+    0xFEF1: {
+        "name": "Cruise Control/Vehicle Speed (CCVS)",
+        "signals": [
+            {"type": "wheel_speed", "spn": 84, "start_bit": 8, "length": 16, "scale": 0.00390625, "offset": 0,
+             "unit": "km/h"},
+        ],
+    },
+    0xFEEA: {
+        "name": "Vehicle Weight (VW)",
+        "signals": [
+            {"type": "axle_location", "spn": 928, "start_bit": 0, "length": 8, "scale": 1, "offset": 0,
+             "unit": ""},
+            {"type": "axle_weight", "spn": 582, "start_bit": 8, "length": 16, "scale": 0.5, "offset": 0,
+             "unit": "kg"},
+        ],
+    },
+}
+
+# 바이트 정렬 필드 길이 -> struct 형식 문자 (부호 없음 / 있음)
+_STRUCT_CODES = {8: ("B", "b"), 16: ("H", "h"), 32: ("I", "i"), 64: ("Q", "q")}
+
+
+def pgn_from_arbitration_id(arbitration_id):
+    """29비트 중재 ID -> PGN (PDU1 형식이면 목적지 주소 바이트 제외)"""
+    pgn = (arbitration_id >> 8) & 0x3FFFF
+    if (pgn >> 8) & 0xFF < 240:
+        pgn &= 0x3FF00
+    return pgn
+
+
+def max_valid_raw(length):
+    """J1939 유효 원시값 상한 (그 위는 오류 / 미지원 표시)"""
+    if length >= 8:
+        return (0xFA << (length - 8)) | ((1 << (length - 8)) - 1)
+    if length >= 2:
+        return (1 << length) - 3
+    return 1
+
+
+# 중재 ID 의 PGN 비교 마스크 (우선순위 비트 / 송신 주소 무시, PDU1 은 목적지 주소도 무시)
+PDU2_PGN_MASK = 0x03FFFF00
+PDU1_PGN_MASK = 0x03FF0000
+
+
+def can_filters_for_pgns(pgns):
+    """PGN 목록 -> python-can 수신 필터 (socketcan 에서는 커널 CAN_RAW_FILTER 로 설치)"""
+    filters = []
+    for pgn in sorted(set(pgns)):
+        mask = PDU1_PGN_MASK if (pgn >> 8) & 0xFF < 240 else PDU2_PGN_MASK
+        filters.append({"can_id": (pgn << 8) & mask, "can_mask": mask, "extended": True})
+    return filters
+
+
+class PGNLayout:
+    """PGN 1개의 컴파일된 디코딩 레이아웃"""
+
+    def __init__(self, pgn, definition, skip_not_available=True):
+        self.pgn = pgn
+        self.name = definition["name"]
+        signals = sorted(definition["signals"], key=lambda s: s["start_bit"])
+        if not signals:
+            raise ValueError(f"PGN 0x{pgn:04X}: 신호 정의가 없습니다")
+
+        self.types = tuple(s["type"] for s in signals)
+        self.units = tuple(s.get("unit", "") for s in signals)
+        self.spns = tuple(s.get("spn") for s in signals)
+        self.scales = tuple(float(s.get("scale", 1)) for s in signals)
+        self.offsets = tuple(float(s.get("offset", 0)) for s in signals)
+        self.signed = tuple(bool(s.get("signed", False)) for s in signals)
+        self.max_raw = tuple(None if s.get("signed") or not skip_not_available else max_valid_raw(s["length"])
+                             for s in signals)
+        self.min_length = max((s["start_bit"] + s["length"] + 7) // 8 for s in signals)
+        self.signals = signals
+
+        # 모든 필드가 바이트 정렬이면 struct.Struct 한 번으로 전부 추출
+        self.struct = self._compile_struct(signals)
+        self.fields = tuple((s["start_bit"], (1 << s["length"]) - 1, s["length"]) for s in signals)
+
+    @staticmethod
+    def _compile_struct(signals):
+        fmt = "<"
+        position = 0
+        for s in signals:
+            start, length = s["start_bit"], s["length"]
+            if start % 8 or length not in _STRUCT_CODES or start < position * 8:
+                return None
+            byte = start // 8
+            if byte > position:
+                fmt += f"{byte - position}x"
+            fmt += _STRUCT_CODES[length][1 if s.get("signed") else 0]
+            position = byte + length // 8
+        return struct.Struct(fmt)
+
+    def raw_values(self, data):
+        """프레임 데이터 -> 원시 정수 튜플 (길이 부족 시 None)"""
+        if len(data) < self.min_length:
+            return None
+        if self.struct is not None:
+            return self.struct.unpack_from(data)
+        word = int.from_bytes(bytes(data[:8]), "little")
+        raw = []
+        for (start, mask, length), signed in zip(self.fields, self.signed):
+            value = (word >> start) & mask
+            if signed and value >> (length - 1):
+                value -= 1 << length
+            raw.append(value)
+        return raw
+
+    def decode(self, data):
+        """프레임 데이터 -> [(type, value, unit, spn), ...] (skip_not_available 이면 J1939 오류 / 미지원 값 제외)"""
+        raw = self.raw_values(data)
+        if raw is None:
+            return None
+        decoded = []
+        for i, value in enumerate(raw):
+            limit = self.max_raw[i]
+            if limit is not None and value > limit:
+                continue
+            decoded.append((self.types[i], value * self.scales[i] + self.offsets[i], self.units[i], self.spns[i]))
+        return decoded
+
+
+class J1939Decoder:
+    """PGN 테이블 기반 J1939 디코더 (중재 ID 별 레이아웃 캐시)"""
+
+    def __init__(self, pgn_table=None, skip_not_available=True, transport_pgns=()):
+        self.skip_not_available = skip_not_available
+        # 테이블에 없어도 다른 계층이 처리하는 PGN (TP.CM / TP.DT, DM1 / VI 등)
+        self.transport_pgns = frozenset(transport_pgns)
+        self.layouts = {}
+        self._id_cache = {}
+        self.stats = {"frames": 0, "decoded": 0, "unhandled": 0, "invalid": 0, "transport": 0}
+        for pgn, definition in (pgn_table if pgn_table is not None else J1939_PGN_TABLE).items():
+            self.add_pgn(pgn, definition)
+
+    @property
+    def pgns(self):
+        """디코딩 대상 PGN 목록"""
+        return sorted(self.layouts)
+
+    def add_pgn(self, pgn, definition):
+        """PGN 정의 추가 / 교체"""
+        self.layouts[pgn] = PGNLayout(pgn, definition, self.skip_not_available)
+        self._id_cache.clear()
+
+    def remove_pgn(self, pgn):
+        """PGN 정의 제거"""
+        self.layouts.pop(pgn, None)
+        self._id_cache.clear()
+
+    def layout_for(self, arbitration_id):
+        """중재 ID -> 레이아웃 (미지원 PGN 이면 None, 결과 캐시)"""
+        try:
+            return self._id_cache[arbitration_id]
+        except KeyError:
+            layout = self.layouts.get(pgn_from_arbitration_id(arbitration_id))
+            self._id_cache[arbitration_id] = layout
+            return layout
+
+    def decode(self, arbitration_id, data):
+        """프레임 1개 -> 신호 dict 리스트 (미지원 PGN / 길이 부족이면 None)"""
+        self.stats["frames"] += 1
+        layout = self.layout_for(arbitration_id)
+        if layout is None:
+            if pgn_from_arbitration_id(arbitration_id) in self.transport_pgns:
+                self.stats["transport"] += 1
+            else:
+                self.stats["unhandled"] += 1
+            return None
+        decoded = layout.decode(data)
+        if decoded is None:
+            self.stats["invalid"] += 1
+            return None
+        self.stats["decoded"] += 1
+        source = arbitration_id & 0xFF
+        return [
+            {"type": name, "value": value, "unit": unit, "pgn": layout.pgn, "spn": spn, "source": source}
+            for name, value, unit, spn in decoded
+        ]
+
+
+def load_pgn_table(path):
+    """정의 파일 -> PGN 테이블 (.dbc 는 DBC 형식, 그 외는 JSON)"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if str(path).lower().endswith(".dbc"):
+        return parse_dbc(text)
+    return parse_json_table(json.loads(text))
+
+
+def parse_json_table(document):
+    """JSON 정의 -> PGN 테이블
+
+    형식: {"pgns": [{"pgn": "0xFEF1", "name": "...", "signals": [{"type", "start_bit", "length",
+    "scale", "offset", "unit", "spn"?, "signed"?}]}]}
+    """
+    table = {}
+    for entry in document["pgns"]:
+        pgn = entry["pgn"]
+        pgn = int(pgn, 0) if isinstance(pgn, str) else int(pgn)
+        for signal in entry["signals"]:
+            for key in ("type", "start_bit", "length"):
+                if key not in signal:
+                    raise ValueError(f"PGN 0x{pgn:04X}: 신호 필드 누락 ({key})")
+        table[pgn] = {"name": entry.get("name", f"PGN {pgn}"), "signals": entry["signals"]}
+    return table
+
+
+_DBC_MESSAGE = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:")
+_DBC_SIGNAL = re.compile(
+    r"^SG_\s+(\w+)\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*\(([^,]+),([^)]+)\)\s*\[[^\]]*\]\s*\"([^\"]*)\""
+)
+_DBC_SPN = re.compile(r"^BA_\s+\"SPN\"\s+SG_\s+(\d+)\s+(\w+)\s+(\d+)\s*;")
+
+
+def parse_dbc(text):
+    """DBC 정의 -> PGN 테이블 (인텔 바이트 순서 신호만 지원)"""
+    table = {}
+    signals_by_id = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        match = _DBC_MESSAGE.match(line)
+        if match:
+            dbc_id = int(match.group(1))
+            current = {"name": match.group(2), "signals": []}
+            table[pgn_from_arbitration_id(dbc_id & 0x1FFFFFFF)] = current
+            signals_by_id[dbc_id] = current["signals"]
+            continue
+        match = _DBC_SIGNAL.match(line)
+        if match and current is not None:
+            name, start, length, byte_order, sign, scale, offset, unit = match.groups()
+            if byte_order != "1":
+                raise ValueError(f"모토로라 바이트 순서 신호는 지원하지 않습니다: {name}")
+            current["signals"].append({
+                "type": name, "start_bit": int(start), "length": int(length),
+                "scale": float(scale), "offset": float(offset), "unit": unit, "signed": sign == "-",
+            })
+            continue
+        match = _DBC_SPN.match(line)
+        if match:
+            for signal in signals_by_id.get(int(match.group(1)), []):
+                if signal["type"] == match.group(2):
+                    signal["spn"] = int(match.group(3))
+        elif not line:
+            # 빈 줄에서 메시지 블록 종료
+            current = None
+    return {pgn: definition for pgn, definition in table.items() if definition["signals"]}
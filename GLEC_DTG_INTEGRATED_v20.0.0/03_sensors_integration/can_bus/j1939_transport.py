@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+J1939 전송 프로토콜 (TP.CM / TP.DT) 재조립
+- BAM (브로드캐스트) 및 RTS/CTS 연결 모드 수동(청취) 재조립
+- (송신 주소, 수신 주소) 별 세션, 세션 수 / 버퍼 메모리 상한, 프레임 타임스탬프 기준 타임아웃
+- 수신 루프가 poll() 을 주기적으로 호출해 TP 프레임이 끊겨도 세션 정리 (현재 시각은 마지막 프레임 + clock 경과로 추정)
+- 재조립된 DM1 (고장 코드), VI (차대번호) 디코딩
+- 단일 프레임 경로에는 관여하지 않음 (디코더가 처리하지 못한 프레임만 전달받음)
+"""
+
+import time
+
+TP_CM_PGN = 0xEC00  # 연결 관리
+TP_DT_PGN = 0xEB00  # 데이터 전송
+
+TP_CM_RTS = 16
+TP_CM_CTS = 17
+TP_CM_EOM_ACK = 19
+TP_CM_BAM = 32
+TP_CM_ABORT = 255
+
+TP_MAX_MESSAGE_SIZE = 1785  # 255 패킷 x 7바이트
+GLOBAL_ADDRESS = 0xFF
+
+DM1_PGN = 0xFECA
+VI_PGN = 0xFEEC
+MULTIPACKET_PGNS = (DM1_PGN, VI_PGN)
+
+
+class TransportSession:
+    """재조립 중인 다중 패킷 메시지 1개"""
+
+    __slots__ = ("pgn", "source", "destination", "size", "packets", "buffer", "received", "count",
+                 "broadcast", "last_time")
+
+    def __init__(self, pgn, source, destination, size, packets, broadcast, timestamp):
+        self.pgn = pgn
+        self.source = source
+        self.destination = destination
+        self.size = size
+        self.packets = packets
+        self.buffer = bytearray(packets * 7)
+        self.received = bytearray(packets)
+        self.count = 0
+        self.broadcast = broadcast
+        self.last_time = timestamp
+
+
+class J1939TransportReassembler:
+    """TP.CM / TP.DT 프레임 -> 완성된 (PGN, 송신 주소, 수신 주소, 데이터)"""
+
+    def __init__(self, max_sessions=64, max_memory=64 * TP_MAX_MESSAGE_SIZE, bam_timeout=0.75,
+                 rts_timeout=1.25, sweep_interval=0.1, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.max_memory = max_memory
+        self.bam_timeout = bam_timeout
+        self.rts_timeout = rts_timeout
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+
+        self.sessions = {}
+        self.memory_bytes = 0
+        self._last_sweep = None
+        # 프레임 타임스탬프 - clock (마지막 TP 프레임 기준), 프레임 없이 현재 시각 추정용
+        self._source_offset = None
+        self.stats = {
+            "sessions_started": 0,
+            "completed": 0,
+            "aborted": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "sequence_errors": 0,
+            "peak_memory": 0,
+        }
+
+    def _open(self, key, session):
+        """세션 등록 (상한 초과 시 거부)"""
+        if key in self.sessions:
+            # 같은 주소 쌍의 새 세션이 이전 세션을 대체
+            self._close(key)
+            self.stats["aborted"] += 1
+        size = len(session.buffer)
+        if len(self.sessions) >= self.max_sessions or self.memory_bytes + size > self.max_memory:
+            self.stats["rejected"] += 1
+            return
+        self.sessions[key] = session
+        self.memory_bytes += size
+        self.stats["sessions_started"] += 1
+        self.stats["peak_memory"] = max(self.stats["peak_memory"], self.memory_bytes)
+
+    def _close(self, key):
+        session = self.sessions.pop(key, None)
+        if session is not None:
+            self.memory_bytes -= len(session.buffer)
+        return session
+
+    def expire(self, now=None):
+        """마지막 프레임 이후 타임아웃이 지난 세션 정리 (now: 프레임 타임스탬프 영역, None 이면 추정)"""
+        if now is None:
+            if self._source_offset is None:
+                return
+            now = self.clock() + self._source_offset
+        self._last_sweep = now
+        for key, session in list(self.sessions.items()):
+            timeout = self.bam_timeout if session.broadcast else self.rts_timeout
+            if now - session.last_time > timeout:
+                self._close(key)
+                self.stats["timeouts"] += 1
+
+    def poll(self):
+        """수신 루프 타이머: 진행 중인 세션이 있으면 sweep_interval 마다 expire()"""
+        if not self.sessions or self._source_offset is None:
+            return
+        if self.clock() + self._source_offset - self._last_sweep >= self.sweep_interval:
+            self.expire()
+
+    def feed(self, arbitration_id, data, timestamp):
+        """TP.CM / TP.DT 프레임 1개 처리 -> 완성 시 (pgn, source, destination, bytes), 아니면 None"""
+        self._source_offset = timestamp - self.clock()
+        if self._last_sweep is None or timestamp - self._last_sweep >= self.sweep_interval:
+            self.expire(timestamp)
+
+        pf = (arbitration_id >> 16) & 0xFF
+        source = arbitration_id & 0xFF
+        destination = (arbitration_id >> 8) & 0xFF
+        if len(data) < 8:
+            return None
+
+        if pf == TP_CM_PGN >> 8:
+            self._connection_management(source, destination, data, timestamp)
+            return None
+        if pf != TP_DT_PGN >> 8:
+            return None
+
+        session = self.sessions.get((source, destination))
+        if session is None:
+            return None
+        sequence = data[0]
+        if not 1 <= sequence <= session.packets:
+            self.stats["sequence_errors"] += 1
+            return None
+        session.last_time = timestamp
+        index = sequence - 1
+        if session.received[index]:
+            return None
+        session.received[index] = 1
+        session.count += 1
+        session.buffer[index * 7:index * 7 + 7] = data[1:8]
+        if session.count == session.packets:
+            self._close((source, destination))
+            self.stats["completed"] += 1
+            return session.pgn, source, destination, bytes(session.buffer[:session.size])
+        return None
+
+    def _connection_management(self, source, destination, data, timestamp):
+        control = data[0]
+        if control in (TP_CM_BAM, TP_CM_RTS):
+            size = data[1] | (data[2] << 8)
+            packets = data[3]
+            pgn = data[5] | (data[6] << 8) | (data[7] << 16)
+            if not 9 <= size <= TP_MAX_MESSAGE_SIZE or packets != (size + 6) // 7:
+                self.stats["rejected"] += 1
+                return
+            broadcast = control == TP_CM_BAM
+            if broadcast:
+                destination = GLOBAL_ADDRESS
+            self._open((source, destination),
+                       TransportSession(pgn, source, destination, size, packets, broadcast, timestamp))
+        elif control in (TP_CM_CTS, TP_CM_EOM_ACK):
+            # 수신 측 응답: 송신 -> 수신 방향 세션의 타이머 갱신
+            session = self.sessions.get((destination, source))
+            if session is not None:
+                session.last_time = timestamp
+        elif control == TP_CM_ABORT:
+            for key in ((source, destination), (destination, source)):
+                if self._close(key) is not None:
+                    self.stats["aborted"] += 1
+
+    def snapshot(self):
+        """세션 / 메모리 지표 요약"""
+        stats = dict(self.stats)
+        stats["active_sessions"] = len(self.sessions)
+        stats["memory_bytes"] = self.memory_bytes
+        return stats
+
+
+def decode_dm1(payload):
+    """DM1 활성 고장 코드 -> (램프 상태 dict, DTC 리스트)"""
+    lamps = payload[0] if payload else 0
+    lamp_status = {
+        "malfunction": (lamps >> 6) & 0x3,
+        "red_stop": (lamps >> 4) & 0x3,
+        "amber_warning": (lamps >> 2) & 0x3,
+        "protect": lamps & 0x3,
+    }
+    dtcs = []
+    for i in range(2, len(payload) - 3, 4):
+        b0, b1, b2, b3 = payload[i:i + 4]
+        spn = b0 | (b1 << 8) | ((b2 & 0xE0) << 11)
+        if spn in (0, 0x7FFFF):
+            continue
+        dtcs.append({"spn": spn, "fmi": b2 & 0x1F, "occurrence": b3 & 0x7F, "conversion": b3 >> 7})
+    return lamp_status, dtcs
+
+
+def decode_vin(payload):
+    """VI (SPN 237) -> 차대번호 문자열 ('*' 구분자 이후 제거)"""
+    return bytes(payload).split(b"*", 1)[0].decode("ascii", errors="replace").strip("\x00 ")
+
+
+def decode_multipacket(pgn, source, payload):
+    """다중 패킷(또는 8바이트 단일 프레임) PGN -> 신호 dict 리스트 (미지원이면 None)"""
+    if pgn == DM1_PGN:
+        lamp_status, dtcs = decode_dm1(payload)
+        return [{"type": "dtc_count", "value": len(dtcs), "unit": "", "pgn": pgn, "spn": None, "source": source,
+                 "dtcs": dtcs, "lamp_status": lamp_status}]
+    if pgn == VI_PGN:
+        return [{"type": "vin", "value": decode_vin(payload), "unit": "", "pgn": pgn, "spn": 237,
+                 "source": source}]
+    return None
+
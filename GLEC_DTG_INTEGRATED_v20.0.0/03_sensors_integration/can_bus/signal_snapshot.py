@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+차량별 최신 신호 스냅샷 저장소
+- 사전 할당 NumPy 배열 (차량 행 x 신호 ID 열): 최신값, 프레임 타임스탬프, 수신 시각
+- 나이(age)는 수신 시각 기준 (clock, 기본 time.monotonic): 프레임 타임스탬프는 소스 시간 영역이라
+  로그 재생 / 버스 하드웨어 시계에서는 벽시계와 비교할 수 없음
+- 읽기: (차량, 신호) -> 행 / 열 인덱스 dict 조회 후 배열 접근, O(1)
+- 행 단위 시퀀스 락 (seqlock): 쓰기 중에는 시퀀스가 홀수, 읽기는 시퀀스가 같은 짝수일 때만 채택
+  읽기 측은 락을 잡지 않으므로 수집 스레드를 막지 않음 (쓰기끼리만 짧은 락)
+- 프레임 1개의 신호는 한 번의 쓰기 구간으로 반영 (같은 프레임 신호는 항상 함께 보임)
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from j1939_decoder import J1939_PGN_TABLE
+
+
+def default_signal_names():
+    """기본 PGN 테이블 + 다중 패킷 수치 신호 이름"""
+    names = [signal["type"] for definition in J1939_PGN_TABLE.values() for signal in definition["signals"]]
+    names.append("dtc_count")
+    return list(dict.fromkeys(names))
+
+
+class SignalSnapshotStore:
+    """차량 x 신호 최신값 저장소 (쓰기: 수집 스레드, 읽기: 임의 스레드 / 이벤트 루프)"""
+
+    def __init__(self, signal_names=None, max_vehicles=64, read_retries=100, clock=time.monotonic):
+        names = default_signal_names() if signal_names is None else list(signal_names)
+        self.signal_ids = {name: i for i, name in enumerate(names)}
+        self.vehicle_rows = {}
+        self.read_retries = read_retries
+        self.clock = clock
+        self._write_lock = threading.Lock()
+        # (values, timestamps, received, sequences): 크기 변경 시 튜플 통째로 교체
+        self._arrays = self._allocate(max_vehicles, max(len(names), 1))
+        self.stats = {"updates": 0, "ignored": 0, "read_retries": 0, "resizes": 0}
+
+    @staticmethod
+    def _allocate(rows, columns):
+        return (np.full((rows, columns), np.nan), np.full((rows, columns), np.nan), np.full((rows, columns), np.nan),
+                np.zeros(rows, dtype=np.int64))
+
+    def _grow(self, rows, columns):
+        """용량 확장 (쓰기 락 안에서만 호출, 읽기 측은 이전 배열을 일관된 상태로 계속 읽음)"""
+        values, stamps, received, sequences = self._arrays
+        old_rows, old_columns = values.shape
+        new_values, new_stamps, new_received, new_sequences = self._allocate(max(rows, old_rows),
+                                                                             max(columns, old_columns))
+        new_values[:old_rows, :old_columns] = values
+        new_stamps[:old_rows, :old_columns] = stamps
+        new_received[:old_rows, :old_columns] = received
+        new_sequences[:old_rows] = sequences
+        self._arrays = (new_values, new_stamps, new_received, new_sequences)
+        self.stats["resizes"] += 1
+
+    def _row(self, vehicle_id):
+        row = self.vehicle_rows.get(vehicle_id)
+        if row is None:
+            row = len(self.vehicle_rows)
+            if row >= self._arrays[0].shape[0]:
+                self._grow(row * 2, 0)
+            self.vehicle_rows[vehicle_id] = row
+        return row
+
+    def _column(self, signal_type):
+        column = self.signal_ids.get(signal_type)
+        if column is None:
+            column = len(self.signal_ids)
+            if column >= self._arrays[0].shape[1]:
+                self._grow(0, column * 2)
+            self.signal_ids[signal_type] = column
+        return column
+
+    def update(self, vehicle_id, signals, timestamp, received_at=None):
+        """프레임 1개의 신호 리스트 반영 (수치가 아닌 신호는 제외)
+
+        timestamp: 프레임 타임스탬프 (소스 시간 영역), received_at: 수신 시각 (clock 영역, 기본: 현재)
+        """
+        received_at = self.clock() if received_at is None else received_at
+        with self._write_lock:
+            row = self._row(vehicle_id)
+            columns = []
+            for signal in signals:
+                value = signal["value"]
+                if isinstance(value, (int, float)):
+                    columns.append((self._column(signal["type"]), value))
+                else:
+                    self.stats["ignored"] += 1
+            if not columns:
+                return
+            values, stamps, received, sequences = self._arrays
+            sequences[row] += 1  # 홀수: 쓰기 중
+            for column, value in columns:
+                values[row, column] = value
+                stamps[row, column] = timestamp
+                received[row, column] = received_at
+            sequences[row] += 1  # 짝수: 쓰기 완료
+            self.stats["updates"] += 1
+
+    def _read_row(self, row, columns):
+        """seqlock 읽기 (columns: 열 번호 또는 목록): 쓰기 중이거나 읽는 동안 시퀀스가 바뀌면 재시도
+        -> (values, timestamps, received)"""
+        for _ in range(self.read_retries):
+            values, stamps, received, sequences = self._arrays
+            before = sequences[row]
+            if not before & 1:
+                row_values = values[row, columns].copy()
+                row_stamps = stamps[row, columns].copy()
+                row_received = received[row, columns].copy()
+                if sequences[row] == before:
+                    return row_values, row_stamps, row_received
+            # 쓰기 스레드가 쓰기 구간 중간에 선점됨: GIL 을 넘겨 쓰기를 끝내게 한 뒤 재시도
+            self.stats["read_retries"] += 1
+            time.sleep(0)
+        raise RuntimeError("스냅샷 읽기 재시도 한도 초과")
+
+    def get(self, vehicle_id, signal_type, now=None):
+        """최신값 1개 -> (value, timestamp, age), 없으면 None (now: clock 영역 현재 시각)"""
+        row = self.vehicle_rows.get(vehicle_id)
+        column = self.signal_ids.get(signal_type)
+        if row is None or column is None:
+            return None
+        value, stamp, received = self._read_row(row, column)
+        received = float(received)
+        if received != received:  # NaN 이면 수신 이력 없음
+            return None
+        now = self.clock() if now is None else now
+        return float(value), float(stamp), now - received
+
+    def snapshot(self, vehicle_id, signal_types=None, now=None):
+        """차량 1대의 일관된 최신값 -> {signal: {"value", "timestamp", "age"}} (수신 이력 없는 신호 제외)"""
+        row = self.vehicle_rows.get(vehicle_id)
+        if row is None:
+            return {}
+        names = list(self.signal_ids) if signal_types is None else [t for t in signal_types if t in self.signal_ids]
+        values, stamps, received = self._read_row(row, [self.signal_ids[name] for name in names])
+        now = self.clock() if now is None else now
+        result = {}
+        for name, value, stamp, received_at in zip(names, values.tolist(), stamps.tolist(), received.tolist()):
+            if received_at == received_at:  # NaN 이면 수신 이력 없음
+                result[name] = {"value": value, "timestamp": stamp, "age": now - received_at}
+        return result
+
+    def fleet_snapshot(self, signal_types=None, now=None):
+        """전체 차량 스냅샷 -> {vehicle_id: snapshot}"""
+        return {vehicle_id: self.snapshot(vehicle_id, signal_types, now) for vehicle_id in list(self.vehicle_rows)}
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+적응형 배치 저장 / 디스크 스풀 테스트 (InfluxDB 없이 가짜 쓰기 함수 사용)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 공용 파이프라인 구성요소 (01_core_engine/data_pipeline)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "01_core_engine" / "data_pipeline"))
+from adaptive_store import AdaptiveBatchStore, is_retryable
+from wal_spool import WriteAheadSpool
+
+
+class FakeStore:
+    """가짜 저장소: down 이면 연결 오류, 'timestamp' 없는 레코드는 KeyError (InfluxRecordWriter 와 같은 실패)"""
+
+    def __init__(self):
+        self.down = False
+        self.written = []
+
+    def __call__(self, batch):
+        if self.down:
+            raise ConnectionError("db down")
+        for record in batch:
+            record["timestamp"]
+        self.written.extend(batch)
+
+
+def make_store(tmp_path, writer, **options):
+    spool = WriteAheadSpool(tmp_path / "spool", segment_bytes=64 * 1024, max_bytes=1024 * 1024, fsync=False)
+    options = dict(latency_budget=0.05, initial_batch=10, min_batch=10, max_batch=10, spool=spool,
+                   replay_rate=None, retry_interval=0.01, max_retry_interval=0.02, **options)
+    return AdaptiveBatchStore(writer, **options), spool
+
+
+def records(start, count, bad=False):
+    return [{"vehicle_id": "V1", "seq": i} if bad else {"vehicle_id": "V1", "seq": i, "timestamp": i}
+            for i in range(start, start + count)]
+
+
+async def wait_recovered(store, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        if not store._spooling:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("스풀 재생이 끝나지 않음")
+
+
+def test_error_classification():
+    class ApiError(Exception):
+        def __init__(self, status):
+            self.status = status
+
+    assert is_retryable(ConnectionError())
+    assert is_retryable(TimeoutError())
+    assert is_retryable(ApiError(503))
+    assert is_retryable(ApiError(429))
+    assert not is_retryable(ApiError(400))
+    assert not is_retryable(KeyError("timestamp"))
+
+
+def test_bad_batch_in_spool_is_dead_lettered(tmp_path):
+    """장애 중 스풀에 들어간 영구 오류 배치가 뒤 배치의 재생을 막지 않음"""
+    writer = FakeStore()
+
+    async def scenario():
+        store, spool = make_store(tmp_path, writer, max_attempts=3)
+        writer.down = True
+        await store.add(records(0, 10))
+        await store.add(records(10, 10, bad=True))
+        await store.add(records(20, 10))
+        await asyncio.sleep(0.05)
+        assert store._spooling
+        writer.down = False
+        await store.add(records(30, 10))
+        await wait_recovered(store)
+        await store.close()
+        return store, spool
+
+    store, spool = asyncio.run(scenario())
+    assert [record["seq"] for record in writer.written] == list(range(0, 10)) + list(range(20, 40))
+    dead = list(spool.iter_dead_letters())
+    assert len(dead) == 1
+    assert "timestamp" in dead[0][0]
+    assert [record["seq"] for record in dead[0][1]] == list(range(10, 20))
+    assert store.stats["dead_lettered"] == 10
+    assert spool.pending_records == 0
+
+
+def test_permanent_live_error_does_not_enter_spool_mode(tmp_path):
+    """실시간 쓰기의 영구 오류는 바로 격리되고 다음 배치는 그대로 저장소에 기록"""
+    writer = FakeStore()
+
+    async def scenario():
+        store, spool = make_store(tmp_path, writer)
+        await store.add(records(0, 10, bad=True))
+        await store.add(records(10, 10))
+        await store.close()
+        return store, spool
+
+    store, spool = asyncio.run(scenario())
+    assert [record["seq"] for record in writer.written] == list(range(10, 20))
+    assert store.stats["spooled"] == 0
+    assert store.stats["dead_lettered"] == 10
+    assert len(list(spool.iter_dead_letters())) == 1
+
+
+def test_outage_preserves_per_vehicle_order(tmp_path):
+    """동시 쓰기 설정에서도 장애 전후 차량별 기록 순서가 유지됨"""
+    import random
+    import time
+
+    rng = random.Random(7)
+    written = []
+    state = {"down": False}
+
+    def writer(batch):
+        time.sleep(rng.uniform(0.001, 0.02))
+        if state["down"]:
+            raise ConnectionError("db down")
+        written.extend(batch)
+
+    async def scenario():
+        store, spool = make_store(tmp_path, writer, max_in_flight=4)
+        seq = 0
+        for tick in range(60):
+            state["down"] = 20 <= tick < 35
+            await store.add([{"vehicle_id": f"V{v}", "seq": seq + v, "timestamp": seq + v} for v in range(5)])
+            seq += 5
+            await asyncio.sleep(0.003)
+        await wait_recovered(store)
+        await store.close()
+        return store
+
+    store = asyncio.run(scenario())
+    assert store.stats["spooled"] > 0
+    assert sorted(record["seq"] for record in written) == list(range(300))
+    last = {}
+    for record in written:
+        assert record["seq"] > last.get(record["vehicle_id"], -1)
+        last[record["vehicle_id"]] = record["seq"]
+
+
+def test_commit_latency_uses_arrival_of_leftover_records():
+    """배치에 못 들어가고 남은 레코드의 커밋 지연은 버퍼 도착 시각부터 측정"""
+    def slow_writer(batch):
+        time.sleep(0.05)
+
+    async def scenario():
+        store = AdaptiveBatchStore(slow_writer, latency_budget=0.01, initial_batch=10, min_batch=10, max_batch=10,
+                                   max_in_flight=1, min_wait=0.001)
+        await store.add(records(0, 25))
+        await store.close()
+        return store
+
+    store = asyncio.run(scenario())
+    latency = store.commit_latency.snapshot()
+    assert store.stats["written"] == 25
+    # 마지막 5건은 앞선 쓰기 2회 (각 0.05초) + 자기 쓰기를 기다림
+    assert latency["max"] >= 0.14
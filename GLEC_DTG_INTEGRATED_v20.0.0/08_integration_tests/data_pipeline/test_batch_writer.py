@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+배치 전송기 테스트 (InfluxDB 없이 가짜 write_api 사용)
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 공용 파이프라인 구성요소 (01_core_engine/data_pipeline)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "01_core_engine" / "data_pipeline"))
+from batch_writer import BatchedInfluxWriter
+
+
+class GatedWriteApi:
+    """gate 가 열릴 때까지 전송을 붙잡는 가짜 write_api"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.written = []
+
+    def write(self, bucket, org, record):
+        self.gate.wait(5.0)
+        self.written.extend(record)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("조건 대기 시간 초과")
+        time.sleep(0.005)
+
+
+def test_close_during_backpressure_wait_counts_records_dropped():
+    """역압 대기 중 close() 된 레코드는 적재하지 않고 폐기로 집계 (적재 = 전송 + 폐기)"""
+    api = GatedWriteApi()
+    writer = BatchedInfluxWriter(api, "bucket", "org", batch_size=10, flush_interval=0.01, max_buffer=20,
+                                 block_timeout=5.0)
+    writer.write(list(range(20)))
+    wait_until(lambda: writer.pending() == 10)  # 첫 배치는 전송 중 (gate 에서 대기)
+    writer.write(list(range(20, 30)))
+
+    result = []
+    producer = threading.Thread(target=lambda: result.append(writer.write(list(range(30, 35)))))
+    producer.start()
+    wait_until(lambda: writer.snapshot()["backpressure_waits"] == 1)
+
+    closer = threading.Thread(target=writer.close)
+    closer.start()
+    producer.join(5.0)
+    api.gate.set()
+    closer.join(5.0)
+
+    stats = writer.snapshot()
+    assert result == [0]
+    assert stats["points_enqueued"] == 30
+    assert stats["points_dropped"] == 5
+    assert stats["points_written"] == 30
+    assert api.written == list(range(30))
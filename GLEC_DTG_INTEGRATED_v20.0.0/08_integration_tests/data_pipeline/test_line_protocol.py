@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+라인 프로토콜 직렬화 테스트 (컬럼 단위 batch == 행 단위 line, 반올림 경계, 이스케이프)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 공용 파이프라인 구성요소 (01_core_engine/data_pipeline)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "01_core_engine" / "data_pipeline"))
+from line_protocol import LineProtocolSerializer
+
+TAG_KEYS = ["vehicle_id", "vehicle_type", "highway", "section", "weather", "urgency_level", "highway_id"]
+FIELD_KEYS = ["vehicle_speed", "position_km", "acceleration", "fuel_rate", "fuel_efficiency_kmpl",
+              "co2_emission", "safety_score", "cargo_weight", "traffic_factor", "total_weight"]
+
+
+def make_columns(n, seed=0):
+    rng = np.random.default_rng(seed)
+    tags = [[f"V{i:05d}" for i in range(n)]] + [
+        list(rng.choice(["대형트럭", "경부 고속도로", "a,b", "x=y", ""], n)) for _ in TAG_KEYS[1:]
+    ]
+    fields = [rng.uniform(0, 150, n) for _ in FIELD_KEYS]
+    return tags, fields
+
+
+def row_lines(serializer, tags, fields, timestamps):
+    """행 단위 line() 으로 만든 기준 결과"""
+    return [serializer.line([column[i] for column in tags], [column[i] for column in fields], timestamps[i])
+            for i in range(len(timestamps))]
+
+
+def test_batch_matches_row_formatting():
+    """컬럼 단위 직렬화 결과가 행 단위 '%.10g' 포맷과 같음 (부호 / 0 / 반올림 올림 / 지수 표기 / NaN 포함)"""
+    n = 3000
+    rng = np.random.default_rng(1)
+    tags, fields = make_columns(n)
+    fields[1] = rng.normal(0, 1e6, n)
+    fields[2] = 10.0 ** rng.uniform(-6, 12, n) * rng.choice([-1, 1], n)
+    fields[3] = rng.choice([0.0, -0.0, 1.5, 999.99999999999, 9.99999999996, 0.0001, np.nan, np.inf], n)
+    timestamps = rng.uniform(1.6e9, 1.7e9, n)
+
+    serializer = LineProtocolSerializer("dtg metrics", TAG_KEYS, FIELD_KEYS, significant_digits=10)
+    assert serializer.batch(tags, fields, timestamps) == row_lines(serializer, tags, fields, timestamps)
+
+
+def test_rounding_ties_match_row_formatting():
+    """반올림 경계 (0.5 근접) 값도 '%.10g' 의 정확한 십진 반올림과 같음"""
+    serializer = LineProtocolSerializer("m", ["vehicle_id"], ["value"], significant_digits=10)
+    edge = [14029.126975, 9.9999999995, 0.50000000005, 123456789.05, 2.5, 1.00000000005]
+    assert serializer.batch([["V"] * len(edge)], [edge], 0) == [serializer.line(["V"], [v], 0) for v in edge]
+
+    # 소수 6자리로 반올림한 적재 중량형 값: 10자리 유효숫자에서 마지막 자리가 경계에 걸리는 값이 많음
+    rng = np.random.default_rng(3)
+    n = 100000
+    values = np.round(rng.uniform(0, 40000, n), 6)
+    negatives = -np.round(rng.uniform(0, 1000, n), 7)
+    tags = [["V"] * n]
+    for column in (values, negatives):
+        lines = serializer.batch(tags, [column], 0)
+        assert lines == [serializer.line(["V"], [v], 0) for v in column.tolist()]
+
+
+def test_changed_tag_column_is_not_reused():
+    """같은 리스트 객체라도 값이 바뀌면 태그 코드를 다시 계산"""
+    serializer = LineProtocolSerializer("m", ["vehicle_id"], ["speed"], significant_digits=10)
+    column = ["V1", "V2"]
+    assert serializer.batch([column], [[1.0, 2.0]], 0)[1] == "m,vehicle_id=V2 speed=2 0"
+    column[1] = "V3"
+    assert serializer.batch([column], [[1.0, 2.0]], 0)[1] == "m,vehicle_id=V3 speed=2 0"
+
+
+def test_newline_is_escaped():
+    """측정값 이름 / 태그 값의 줄바꿈이 라인을 나누지 않음"""
+    serializer = LineProtocolSerializer("dtg\nmetrics", ["vehicle_id"], ["speed"], significant_digits=10)
+    lines = serializer.batch([["V1\nV2"]], [[80.0]], 0)
+    assert lines == ["dtg\\nmetrics,vehicle_id=V1\\nV2 speed=80 0"]
+    assert lines == [serializer.line(["V1\nV2"], [80.0], 0)]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+출력 싱크 테스트: 다른 스레드의 시뮬레이터 -> AsyncQueueSink 폐기 집계
+"""
+
+import asyncio
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "01_core_engine" / "data_pipeline"))
+from output_sinks import AsyncQueueSink
+from ultimate_comprehensive_simulator import ComprehensiveBatchGenerator, build_fleet
+
+TICKS = 50
+VEHICLES = 20
+
+
+def run_threaded_writer(drop_oldest):
+    """시뮬레이터 스레드가 TICKS 번 기록, 이벤트 루프는 소비하지 않음 (큐 용량 100)"""
+
+    async def scenario():
+        queue = asyncio.Queue(maxsize=100)
+        sink = AsyncQueueSink(queue, drop_oldest=drop_oldest)
+        generator = ComprehensiveBatchGenerator(build_fleet(VEHICLES), seed=1)
+        batches = [generator.generate(datetime.now(timezone.utc)) for _ in range(TICKS)]
+
+        def produce():
+            for batch in batches:
+                sink.write(batch)
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)  # 남은 call_soon_threadsafe 콜백 실행
+        return sink, queue
+
+    return asyncio.run(scenario())
+
+
+def test_queue_drops_are_counted_once_on_the_loop_thread():
+    for drop_oldest in (True, False):
+        sink, queue = run_threaded_writer(drop_oldest)
+        # 시뮬레이터 스레드 카운터는 전달 건수만, 큐 폐기는 루프 전용 카운터
+        assert sink.stats["points_written"] == TICKS * VEHICLES
+        assert sink.stats["points_dropped"] == 0
+        assert sink.queue_dropped == TICKS * VEHICLES - 100
+
+        snapshot = sink.snapshot()
+        assert snapshot["points_written"] == queue.qsize() == 100
+        assert snapshot["points_dropped"] == snapshot["queue_dropped"] == TICKS * VEHICLES - 100
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+물리 커널 테스트: 스칼라 생성기와 검증 규칙이 같은 변속 / RPM 테이블을 사용하는지 확인
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 공용 파이프라인 구성요소 (01_core_engine/data_pipeline)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "01_core_engine" / "data_pipeline"))
+import ultimate_comprehensive_simulator as simulator
+from physics_kernel import expected_engine_rpm
+from ultimate_comprehensive_simulator import calculate_physics_based_data, vehicles
+
+
+def test_scalar_generator_matches_validation_rpm():
+    """생성된 RPM 이 검증 규칙의 기대 RPM 과 일치 (변속 경계 근처 포함)"""
+    random.seed(3)
+    for vehicle in vehicles:
+        for speed in (0, 29.9, 30.0, 49.5, 70.0, 89.9, 90.0, 105.0):
+            data = calculate_physics_based_data(vehicle, {"vehicle_speed": speed, "cargo_weight": 500})
+            assert isinstance(data["vehicle_rpm"], float)
+            assert np.isclose(data["vehicle_rpm"], expected_engine_rpm(data["vehicle_speed"]))
+
+
+# 변속 경계 전후 속도 -> (기어, 엔진 RPM): 1단 4.5 / 2단 2.8 / 3단 1.8 / 4단 1.3 / 5단 1.0, 종감속 3.5, 800-2500 rpm
+SHIFT_BOUNDARY_CASES = [
+    (0.0, 1, 800.0),
+    (10.0, 1, 835.6),
+    (29.9, 1, 2498.3),
+    (30.0, 2, 1559.7),
+    (49.9, 2, 2500.0),
+    (50.0, 3, 1671.1),
+    (69.9, 3, 2336.2),
+    (70.0, 4, 1689.7),
+    (89.9, 4, 2170.1),
+    (90.0, 5, 1671.1),
+    (100.0, 5, 1856.8),
+]
+
+
+def test_scalar_generator_gear_and_rpm_at_shift_boundaries(monkeypatch):
+    """목표 속도 = 현재 속도 (가속 0) 일 때 경계 속도별 기어 / RPM 고정값"""
+    vehicle = vehicles[0]
+    for speed, gear, rpm in SHIFT_BOUNDARY_CASES:
+        monkeypatch.setattr(simulator.random, "uniform", lambda low, high: speed)
+        data = calculate_physics_based_data(vehicle, {"vehicle_speed": speed, "cargo_weight": 300})
+        assert round(data["vehicle_speed"], 6) == speed
+        assert (data["gear"], round(data["vehicle_rpm"], 1)) == (gear, rpm), speed
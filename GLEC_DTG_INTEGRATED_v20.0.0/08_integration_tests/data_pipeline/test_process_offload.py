@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+프로세스 풀 오프로드 테스트: 검증 규칙 전달, 시급성 분류, 생산자 컬럼 블록, 취소 시 공유 버퍼 반납
+"""
+
+import asyncio
+import copy
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# 공용 파이프라인 구성요소 (01_core_engine/data_pipeline)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "01_core_engine" / "data_pipeline"))
+import process_offload
+from output_sinks import COLUMN_SOURCE_KEY, AsyncQueueSink
+from physics_kernel import VALIDATION_RULES, expected_engine_rpm
+from process_offload import OFFLOAD_FIELDS, VIOLATION_RPM_MISMATCH, ProcessOffload, gather_columns
+from ultimate_comprehensive_simulator import URGENCY_LEVELS, ComprehensiveBatchGenerator, build_fleet
+
+
+def rpm_records():
+    """기대 RPM 대비 10% / 20% 벗어난 레코드"""
+    rpm = float(expected_engine_rpm(60.0))
+    return [{"vehicle_speed": 60.0, "vehicle_rpm": rpm * 1.1}, {"vehicle_speed": 60.0, "vehicle_rpm": rpm * 1.2}]
+
+
+def run_offload(offload, kernel, records, columns=None):
+    async def scenario():
+        await offload.start()
+        try:
+            return await offload.run(kernel, records, columns)
+        finally:
+            await offload.close()
+
+    return asyncio.run(scenario())
+
+
+def queued_records(generator, ticks):
+    """시뮬레이터 배치 -> 큐 싱크 (생산자 컬럼 블록 포함) -> 큐에 쌓인 레코드"""
+    queue = asyncio.Queue()
+    sink = AsyncQueueSink(queue, column_fields=OFFLOAD_FIELDS)
+    for _ in range(ticks):
+        sink.write(generator.generate(datetime.now(timezone.utc)))
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+def test_validation_uses_engine_rules_in_workers():
+    """허용 오차는 validation_rules 에서 읽고 작업 프로세스에도 같은 값이 전달됨"""
+    rules = copy.deepcopy(VALIDATION_RULES)
+    default = run_offload(ProcessOffload(), "validate", rpm_records())
+    assert (default.astype(int) & VIOLATION_RPM_MISMATCH).tolist() == [0, VIOLATION_RPM_MISMATCH]
+
+    rules["speed_rpm_correlation"]["tolerance"] = 5.0
+    offload = ProcessOffload(workers=1, rules=rules)
+    strict = run_offload(offload, "validate", rpm_records())
+    assert offload.mode == "process"
+    assert (strict.astype(int) & VIOLATION_RPM_MISMATCH).tolist() == [VIOLATION_RPM_MISMATCH] * 2
+
+
+def test_urgency_kernel_matches_generator():
+    generator = ComprehensiveBatchGenerator(build_fleet(200))
+    records = generator.generate(datetime.now(timezone.utc)).to_records()
+    levels = run_offload(ProcessOffload(), "urgency", records + [{"vehicle_speed": 80.0}])
+    assert [URGENCY_LEVELS[int(level)] for level in levels[:-1]] == [r["urgency"] for r in records]
+    assert np.isnan(levels[-1])
+
+
+def test_producer_columns_match_record_columns():
+    """생산자 블록을 모은 컬럼 = 레코드 dict 에서 추출한 컬럼 (배치 경계 / 중간 폐기 포함), 커널 결과도 같음"""
+    records = queued_records(ComprehensiveBatchGenerator(build_fleet(300), seed=4), ticks=3)
+    records = records[:250] + records[260:]  # 큐 폐기로 끊긴 구간
+    sources = [record.pop(COLUMN_SOURCE_KEY) for record in records]
+    columns = gather_columns(sources)
+    expected = np.empty((len(OFFLOAD_FIELDS), len(records)))
+    process_offload.fill_columns(expected, records)
+    np.testing.assert_array_equal(columns, expected)
+
+    assert gather_columns(sources[:5] + [None]) is None
+    for kernel in ("validate", "urgency"):
+        for workers in (0, 1):
+            # capacity 보다 큰 배치 -> 나눠진 청크마다 블록 슬라이스 사용
+            offload = ProcessOffload(workers=workers, capacity=256)
+            result = run_offload(offload, kernel, records, columns)
+            assert offload.mode == ("process" if workers else "inline")
+            np.testing.assert_array_equal(result, run_offload(ProcessOffload(), kernel, records))
+            assert offload.stats["column_batches"] == 1
+
+
+def slow_kernel(columns, thresholds):
+    time.sleep(0.5)
+    return np.zeros(columns["vehicle_speed"].shape[0])
+
+
+def test_cancelled_caller_keeps_buffer_until_worker_finishes(monkeypatch):
+    # fork 로 생성되는 작업 프로세스도 같은 커널 표를 상속
+    monkeypatch.setitem(process_offload.KERNELS, "slow", slow_kernel)
+
+    async def scenario():
+        offload = ProcessOffload(workers=1)
+        await offload.start()
+        assert offload.mode == "process"
+        slots = offload._free.qsize()
+        task = asyncio.create_task(offload.run("slow", rpm_records()))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # 작업 프로세스가 아직 버퍼 사용 중 -> 반납 보류
+        held = offload._free.qsize()
+        await asyncio.sleep(0.6)
+        returned = offload._free.qsize()
+        await offload.close()
+        return slots, held, returned, offload.stats["deferred_returns"]
+
+    slots, held, returned, deferred = asyncio.run(scenario())
+    assert held == slots - 1
+    assert returned == slots
+    assert deferred == 1
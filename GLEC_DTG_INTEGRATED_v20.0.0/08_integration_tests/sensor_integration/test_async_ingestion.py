@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+asyncio CAN 수집기 테스트: 이벤트 루프가 밀릴 때 스레드 -> 루프 전달 버퍼 상한 / 폐기 정책
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "03_sensors_integration" / "can_bus"))
+from async_ingestion import AsyncCANIngestor
+
+FRAMES = 1000
+
+
+class Message:
+    def __init__(self, seq):
+        self.seq = seq
+        self.timestamp = float(seq)
+        self.channel = "can0"
+
+
+class BurstBus:
+    """FRAMES 개 프레임을 즉시 내보낸 뒤 종료"""
+
+    def __init__(self):
+        self.sent = 0
+        self.finished = False
+
+    def recv(self, timeout=None):
+        if self.sent >= FRAMES:
+            self.finished = True
+            return None
+        self.sent += 1
+        return Message(self.sent - 1)
+
+
+class NoTransport:
+    def poll(self):
+        pass
+
+
+class BurstSystem:
+    def __init__(self):
+        self.bus = BurstBus()
+        self.transport = NoTransport()
+
+    def handle_message(self, msg):
+        return [{"type": "speed", "value": float(msg.seq), "seq": msg.seq}]
+
+
+def run_blocked_loop(policy):
+    """수신 스레드가 전부 보내는 동안 이벤트 루프를 막아 둠 -> 전달 버퍼 / 콜백 수 확인"""
+
+    async def scenario():
+        ingestor = AsyncCANIngestor(BurstSystem(), maxsize=10, policy=policy, handoff_size=20)
+        drains = []
+        drain = ingestor._drain
+        ingestor._drain = lambda: (drains.append(len(ingestor._handoff)), drain())
+        queue = await ingestor.start()
+        deadline = time.monotonic() + 5.0
+        while ingestor.can_system.bus.sent < FRAMES and time.monotonic() < deadline:
+            time.sleep(0.01)  # 루프 차단 (콜백 실행 불가)
+        time.sleep(0.05)
+        await asyncio.wait_for(ingestor.finished.wait(), 5.0)
+        await ingestor.stop()
+        return ingestor.snapshot(), [signal["seq"] for signal in queue._queue], drains
+
+    return asyncio.run(scenario())
+
+
+def test_drop_oldest_bounds_handoff_while_loop_is_blocked():
+    stats, seqs, drains = run_blocked_loop("drop_oldest")
+    assert stats["signals"] == FRAMES
+    assert stats["enqueued"] + stats["handoff_dropped"] == FRAMES
+    assert stats["enqueued"] - (stats["dropped"] - stats["handoff_dropped"]) == len(seqs) == 10
+    # 루프가 막힌 동안 예약된 콜백은 1개, 버퍼는 상한 이내
+    assert len(drains) <= 3
+    assert max(drains) <= 20
+    assert seqs == list(range(FRAMES - 10, FRAMES))
+    assert stats["handoff_pending"] == 0
+
+
+def test_drop_newest_keeps_first_signals():
+    stats, seqs, drains = run_blocked_loop("drop_newest")
+    assert stats["enqueued"] == len(seqs) == 10
+    assert stats["dropped"] == FRAMES - 10
+    assert max(drains) <= 20
+    assert seqs == list(range(10))
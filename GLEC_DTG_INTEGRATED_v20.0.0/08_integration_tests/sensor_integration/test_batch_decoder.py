@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+배치 디코더 테스트: 프레임별 J1939Decoder 결과와 같은 값 (미지원 표시값, skip_not_available 설정, 미지원 ID, 짧은 프레임)
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import can
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "03_sensors_integration" / "can_bus"))
+from batch_decoder import J1939BatchDecoder, frames_from_messages
+from j1939_decoder import J1939Decoder
+
+# 기본 테이블 PGN 의 중재 ID (우선순위 / 송신 주소는 매 프레임 달리 조합) + 미지원 ID
+TABLE_PGNS = (0xF004, 0xF003, 0xFEF2, 0xFEE5, 0xFEEE, 0xFEF1, 0xFEEA)
+UNKNOWN_IDS = (0x18FFAA00, 0x1CECFF00, 0x1CEBFF00, 0x18FECA00, 0x0CF00A00)
+
+
+def random_payload(rng):
+    """유효값 / 미지원 표시값 (0xFF..) / 오류 범위 (0xFB..0xFE) 바이트가 섞인 8바이트"""
+    kind = rng.random()
+    if kind < 0.2:
+        return b"\xff" * 8
+    if kind < 0.5:
+        return bytes(rng.choice((rng.randrange(0xFB), rng.randrange(0xFB, 0x100))) for _ in range(8))
+    return bytes(rng.randrange(0xFB) for _ in range(8))
+
+
+def mixed_messages(count=2000, seed=11):
+    rng = random.Random(seed)
+    messages = []
+    for i in range(count):
+        if rng.random() < 0.15:
+            arbitration_id = rng.choice(UNKNOWN_IDS)
+        else:
+            arbitration_id = (rng.choice((3, 6)) << 26) | (rng.choice(TABLE_PGNS) << 8) | rng.randrange(0x100)
+        data = random_payload(rng)
+        if rng.random() < 0.05:
+            data = data[:rng.randrange(8)]  # 짧은 프레임
+        messages.append(can.Message(arbitration_id=arbitration_id, data=data, timestamp=i * 0.001))
+    return messages
+
+
+def expected_columns(decoder, messages):
+    """프레임별 디코더 결과 -> {PGN: 컬럼 dict} (디코더가 뺀 신호는 NaN)"""
+    expected = {}
+    for msg in messages:
+        signals = decoder.decode(msg.arbitration_id, msg.data)
+        if signals is None:
+            continue
+        layout = decoder.layout_for(msg.arbitration_id)
+        columns = expected.setdefault(layout.pgn, {"timestamp": [], "source": [],
+                                                   **{name: [] for name in layout.types}})
+        columns["timestamp"].append(msg.timestamp)
+        columns["source"].append(msg.arbitration_id & 0xFF)
+        values = {signal["type"]: signal["value"] for signal in signals}
+        for name in layout.types:
+            columns[name].append(values.get(name, np.nan))
+    return expected
+
+
+def assert_batch_matches_scalar(skip_not_available):
+    messages = mixed_messages()
+    # TP.CM / TP.DT 는 전송 계층 집계, 나머지 미지원 ID 는 unhandled
+    options = {"skip_not_available": skip_not_available, "transport_pgns": (0xEC00, 0xEB00)}
+    scalar = J1939Decoder(**options)
+    batch = J1939BatchDecoder(J1939Decoder(**options))
+
+    expected = expected_columns(scalar, messages)
+    decoded = batch.decode(frames_from_messages(messages))
+
+    assert sorted(decoded) == sorted(expected) == sorted(TABLE_PGNS)
+    for pgn, columns in expected.items():
+        assert sorted(decoded[pgn]) == sorted(columns)
+        for name, values in columns.items():
+            np.testing.assert_array_equal(decoded[pgn][name], np.array(values), err_msg=f"{pgn:#x} {name}")
+    assert batch.stats == scalar.stats
+    assert batch.stats["transport"] > 0 and batch.stats["unhandled"] > 0 and batch.stats["invalid"] > 0
+    return decoded
+
+
+def test_batch_matches_scalar_skipping_not_available():
+    decoded = assert_batch_matches_scalar(skip_not_available=True)
+    # 미지원 / 오류 표시값이 실제로 섞여 NaN 으로 나옴
+    assert np.isnan(decoded[0xF004]["speed"]).any()
+    assert not np.isnan(decoded[0xF004]["speed"]).all()
+
+
+def test_batch_matches_scalar_keeping_not_available():
+    decoded = assert_batch_matches_scalar(skip_not_available=False)
+    assert not any(np.isnan(column).any() for columns in decoded.values() for column in columns.values())
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+바이너리 CAN 레코더 헤더 / 기록-읽기 왕복 테스트
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "03_sensors_integration" / "can_bus"))
+from can_recorder import _HEADER, CANRecorder, RecordingReader, read_window
+
+
+def test_header_is_64_bytes():
+    assert _HEADER.size == 64
+
+
+def test_recording_round_trip(tmp_path):
+    recorder = CANRecorder(tmp_path, channel="can1", index_interval=4, buffer_records=3)
+    for i in range(10):
+        recorder.record_frame(100.0 + i, 0x18FEF100 + i, bytes([i] * (i % 9)), extended=i % 2 == 0)
+    recorder.close()
+
+    reader = RecordingReader(recorder.path)
+    assert reader.path.stat().st_size == _HEADER.size + 10 * reader.frames.itemsize
+    assert reader.channel == "can1"
+    assert reader.time_range() == (100.0, 109.0)
+    messages = list(reader.messages(103.0, 105.0))
+    assert [m.timestamp for m in messages] == [103.0, 104.0, 105.0]
+    assert [m.is_extended_id for m in messages] == [False, True, False]
+    assert messages[1].arbitration_id == 0x18FEF104
+    assert bytes(messages[1].data) == bytes([4] * 4)
+    assert read_window(tmp_path, "can1", 108.0, 200.0)["arbitration_id"].tolist() == [0x18FEF108, 0x18FEF109]
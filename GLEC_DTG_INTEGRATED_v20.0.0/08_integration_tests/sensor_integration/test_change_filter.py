@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+변화 감지 필터 테스트: 불감대 / 하트비트, DM1 부가 정보 (DTC 목록) 비교
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "03_sensors_integration" / "can_bus"))
+from change_filter import ChangeFilter
+from j1939_transport import DM1_PGN, decode_multipacket
+
+
+def coolant(value):
+    return {"type": "coolant_temp", "value": value, "unit": "°C", "pgn": 0xFEEE, "spn": 110, "source": 0x00}
+
+
+def dm1(*dtcs):
+    """활성 DTC (spn, fmi) 목록 -> DM1 신호 1개"""
+    payload = bytearray([0x04, 0xFF])
+    for spn, fmi in dtcs:
+        payload += bytes([spn & 0xFF, (spn >> 8) & 0xFF, ((spn >> 11) & 0xE0) | fmi, 1])
+    return decode_multipacket(DM1_PGN, 0x00, payload)[0]
+
+
+def test_deadband_and_heartbeat():
+    """불감대 이내 변화는 max_interval 까지 억제, 이후 하트비트로 전달"""
+    change_filter = ChangeFilter()
+    assert change_filter.accept(coolant(90.0), 0.0)
+    assert not change_filter.accept(coolant(90.5), 1.0)
+    assert change_filter.accept(coolant(91.5), 2.0)
+    assert not change_filter.accept(coolant(91.5), 11.0)
+    assert change_filter.accept(coolant(91.5), 12.0)
+    snapshot = change_filter.snapshot()
+    assert snapshot["suppressed"] == 2 and snapshot["heartbeats"] == 1
+    assert snapshot["suppressed_by_type"] == {"coolant_temp": 2}
+
+
+def test_dm1_with_same_count_but_different_dtc_is_emitted():
+    """DTC 개수가 같아도 SPN / FMI 가 바뀌면 전달"""
+    change_filter = ChangeFilter()
+    assert change_filter.accept(dm1((110, 0)), 0.0)
+    assert change_filter.accept(dm1((100, 1)), 0.1)
+    assert change_filter.accept(dm1((100, 3)), 0.2)
+    assert not change_filter.accept(dm1((100, 3)), 0.3)
+    assert change_filter.accept(dm1((100, 3), (110, 0)), 0.4)
+    assert change_filter.accept(dm1(), 0.5)
+
+
+def test_receive_time_is_not_compared():
+    """수신 시각 (received_at) 만 다른 신호는 변화가 아님"""
+    change_filter = ChangeFilter()
+    first = dict(dm1((110, 0)), received_at=1.0)
+    second = dict(dm1((110, 0)), received_at=2.0)
+    assert change_filter.accept(first, 0.0)
+    assert not change_filter.accept(second, 0.1)
+    assert change_filter.accept(dict(coolant(90.0), received_at=1.0), 0.0)
+    assert not change_filter.accept(dict(coolant(90.0), received_at=2.0), 0.1)
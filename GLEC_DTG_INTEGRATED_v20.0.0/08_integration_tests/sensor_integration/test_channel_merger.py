@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+다중 채널 병합기 (ChannelMerger) 역압 / 출력 큐 정책 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "03_sensors_integration" / "can_bus"))
+from async_ingestion import ChannelMerger
+
+
+class StubIngestor:
+    """채널 수집기 대역: 미리 채운 큐만 제공"""
+
+    def __init__(self, channel, count, maxsize):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.finished = asyncio.Event()
+        now = time.monotonic()
+        for i in range(count):
+            self.queue.put_nowait({"channel": channel, "seq": i, "timestamp": float(i), "received_at": now})
+
+    async def stop(self, timeout=5.0):
+        self.finished.set()
+
+    def snapshot(self):
+        return {"queue_size": self.queue.qsize()}
+
+
+def run_merger(policy, count=50, maxsize=50, output_size=10, max_pending=20):
+    async def scenario():
+        ingestors = {channel: StubIngestor(channel, count, maxsize) for channel in ("can0", "can1")}
+        merger = ChannelMerger(ingestors, output=asyncio.Queue(maxsize=output_size), reorder_window=0.005,
+                               policy=policy, max_pending=max_pending)
+        await merger.start()
+        await asyncio.sleep(0.1)
+        state = {
+            "pending": len(merger._pending),
+            "ingestor_backlog": sum(ingestor.queue.qsize() for ingestor in ingestors.values()),
+            "output": [(signal["channel"], signal["seq"]) for signal in list(merger.output._queue)],
+            "stats": dict(merger.stats),
+        }
+        for task in merger._tasks:
+            task.cancel()
+        await asyncio.gather(*merger._tasks, return_exceptions=True)
+        return state
+
+    return asyncio.run(scenario())
+
+
+def test_pending_is_bounded_and_backpressure_reaches_ingestors():
+    state = run_merger("block")
+    # 채널별 pull 태스크가 한 번씩 더 꺼낼 수 있으므로 상한 + 채널 수
+    assert state["pending"] <= 20 + 2
+    assert state["stats"]["pull_waits"] > 0
+    # 병합기가 멈춘 만큼 신호가 채널 큐에 남아 수집기 정책 대상이 됨
+    assert state["ingestor_backlog"] == 100 - state["pending"] - len(state["output"])
+    assert state["ingestor_backlog"] > 0
+    # block: 출력 큐가 가득 차도 폐기 없음
+    assert state["stats"]["dropped"] == 0
+    assert len(state["output"]) == 10
+
+
+def test_output_overflow_drop_newest_keeps_earliest():
+    state = run_merger("drop_newest")
+    assert len(state["output"]) == 10
+    # 처음 내보낸 10개 (가장 이른 타임스탬프) 가 남고 이후 신호가 폐기됨
+    assert max(seq for _, seq in state["output"]) < 10
+    assert state["stats"]["dropped"] > 0
+
+
+def test_output_overflow_drop_oldest_keeps_latest():
+    state = run_merger("drop_oldest")
+    assert len(state["output"]) == 10
+    assert min(seq for _, seq in state["output"]) > 4
+    assert state["stats"]["dropped"] > 0
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+테이블 기반 J1939 디코더 테스트: 기존 if/elif 파서와 같은 환산, 오류 / 미지원 값 처리
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "03_sensors_integration" / "can_bus"))
+from j1939_decoder import J1939Decoder
+
+TSC1_ID = 0x0CF00400
+EEC1_ID = 0x0CF00300
+LFE_ID = 0x18FEF200
+
+
+def frame(offset, raw):
+    data = bytearray(8)
+    struct.pack_into("<H", data, offset, raw)
+    return bytes(data)
+
+
+def values(signals):
+    return [(signal["type"], signal["value"], signal["unit"]) for signal in signals]
+
+
+def test_valid_values_match_previous_parser():
+    decoder = J1939Decoder()
+    for raw in (0, 1, 12345, 0xFAFF):
+        assert values(decoder.decode(TSC1_ID, frame(4, raw))) == [("speed", raw * 0.00390625, "km/h")]
+        assert values(decoder.decode(EEC1_ID, frame(3, raw))) == [("rpm", raw * 0.125, "rpm")]
+        assert values(decoder.decode(LFE_ID, frame(0, raw))) == [("fuel_rate", raw * 0.05, "L/h")]
+
+
+def test_error_and_not_available_values_are_skipped():
+    decoder = J1939Decoder()
+    assert decoder.decode(TSC1_ID, frame(4, 0xFB00)) == []
+    assert decoder.decode(TSC1_ID, frame(4, 0xFFFF)) == []
+    assert decoder.stats["decoded"] == 2
+
+
+def test_previous_behaviour_is_available():
+    """skip_not_available=False: 미지원 표시값도 기존 파서처럼 그대로 환산"""
+    decoder = J1939Decoder(skip_not_available=False)
+    assert values(decoder.decode(TSC1_ID, frame(4, 0xFFFF))) == [("speed", 0xFFFF * 0.00390625, "km/h")]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+J1939 전송 프로토콜 재조립 테스트: BAM / RTS-CTS 재조립 (순서 뒤바뀜 / 중복 TP.DT), TP 프레임이 끊긴 세션의 타이머 정리
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import can
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "03_sensors_integration" / "can_bus"))
+from dtg_can_bus_system import DTGCANBusSystem
+from j1939_transport import DM1_PGN, TP_CM_BAM, TP_CM_CTS, TP_CM_RTS, VI_PGN, J1939TransportReassembler
+
+BAM_ID = 0x1CECFF00  # TP.CM, 송신 주소 0x00 -> 전역
+BAM_DT_ID = 0x1CEBFF00  # TP.DT, 송신 주소 0x00 -> 전역
+RTS_ID = 0x1CECF900  # TP.CM, 송신 주소 0x00 -> 0xF9
+CTS_ID = 0x1CEC00F9  # TP.CM, 0xF9 -> 0x00 (수신 측 응답)
+RTS_DT_ID = 0x1CEBF900  # TP.DT, 0x00 -> 0xF9
+VIN = "KMFZCZ7HAKU123456"
+
+
+def tp_cm(control, size, pgn):
+    packets = (size + 6) // 7
+    return bytes([control, size & 0xFF, size >> 8, packets, 0xFF, pgn & 0xFF, (pgn >> 8) & 0xFF, pgn >> 16])
+
+
+def bam_announce(size=20):
+    return tp_cm(TP_CM_BAM, size, DM1_PGN)
+
+
+def tp_dt(payload, sequence):
+    """1부터 시작하는 순번의 TP.DT 프레임 데이터 (마지막 패킷은 0xFF 채움)"""
+    chunk = payload[(sequence - 1) * 7:sequence * 7]
+    return bytes([sequence]) + chunk + b"\xff" * (7 - len(chunk))
+
+
+def dm1_payload(dtcs):
+    """(spn, fmi, occurrence) 목록 -> DM1 데이터 (램프 바이트 + 예약 + DTC 4바이트씩)"""
+    payload = bytearray([0x44, 0xFF])
+    for spn, fmi, occurrence in dtcs:
+        payload += bytes([spn & 0xFF, (spn >> 8) & 0xFF, ((spn >> 16) << 5) | fmi, occurrence])
+    return bytes(payload)
+
+
+def feed(system, frames):
+    """(중재 ID, 데이터) 목록 -> 프레임별 handle_message 결과"""
+    return [system.handle_message(can.Message(arbitration_id=arbitration_id, data=data, timestamp=i * 0.01))
+            for i, (arbitration_id, data) in enumerate(frames)]
+
+
+def test_bam_reassembles_multi_packet_vin():
+    system = DTGCANBusSystem()
+    payload = (VIN + "*").encode("ascii")
+    frames = [(BAM_ID, tp_cm(TP_CM_BAM, len(payload), VI_PGN))]
+    frames += [(BAM_DT_ID, tp_dt(payload, sequence)) for sequence in (1, 2, 3)]
+    results = feed(system, frames)
+
+    assert results[:-1] == [None, None, None]
+    assert results[-1] == [{"type": "vin", "value": VIN, "unit": "", "pgn": VI_PGN, "spn": 237, "source": 0x00}]
+    assert system.transport.stats["completed"] == 1
+    assert not system.transport.sessions
+    # TP 프레임은 전송 계층이 처리 (디코더 지표에서 미지원으로 집계하지 않음)
+    assert system.decoder.stats["transport"] == 4
+    assert system.decoder.stats["unhandled"] == 0
+
+
+def test_rts_cts_reassembles_dm1_out_of_sequence_with_duplicates():
+    system = DTGCANBusSystem()
+    dtcs = [(110, 0, 1), (100, 1, 3), (520000, 31, 2), (84, 2, 1)]
+    payload = dm1_payload(dtcs)
+    assert len(payload) == 18  # 3 패킷
+    frames = [
+        (RTS_ID, tp_cm(TP_CM_RTS, len(payload), DM1_PGN)),
+        (CTS_ID, bytes([TP_CM_CTS, 3, 1, 0xFF, 0xFF, DM1_PGN & 0xFF, (DM1_PGN >> 8) & 0xFF, DM1_PGN >> 16])),
+        (RTS_DT_ID, tp_dt(payload, 3)),
+        (RTS_DT_ID, tp_dt(payload, 1)),
+        (RTS_DT_ID, tp_dt(payload, 3)),  # 중복
+        (RTS_DT_ID, bytes([4]) + b"\x00" * 7),  # 범위 밖 순번
+        (RTS_DT_ID, tp_dt(payload, 2)),
+        (RTS_DT_ID, tp_dt(payload, 2)),  # 완료 후 중복 (세션 없음)
+    ]
+    results = feed(system, frames)
+
+    assert results[:6] == [None] * 6 and results[7] is None
+    (signal,) = results[6]
+    assert (signal["type"], signal["value"], signal["pgn"], signal["source"]) == ("dtc_count", 4, DM1_PGN, 0x00)
+    assert [(dtc["spn"], dtc["fmi"], dtc["occurrence"]) for dtc in signal["dtcs"]] == dtcs
+    assert signal["lamp_status"] == {"malfunction": 1, "red_stop": 0, "amber_warning": 1, "protect": 0}
+    stats = system.transport.stats
+    assert (stats["completed"], stats["sequence_errors"], stats["sessions_started"]) == (1, 1, 1)
+    assert system.decoder.stats["transport"] == len(frames)
+    assert system.decoder.stats["unhandled"] == 0
+
+
+def test_unknown_pgn_is_still_unhandled():
+    system = DTGCANBusSystem()
+    assert feed(system, [(0x18FFAA00, bytes(8))]) == [None]
+    assert system.decoder.stats["unhandled"] == 1
+    assert system.decoder.stats["transport"] == 0
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_poll_expires_session_without_new_frames():
+    """프레임 타임스탬프가 로컬 시계와 다른 영역이어도 경과 시간으로 정리"""
+    clock = FakeClock(50.0)
+    transport = J1939TransportReassembler(bam_timeout=0.75, clock=clock)
+    transport.feed(BAM_ID, bam_announce(), timestamp=1_000_000.0)
+    assert len(transport.sessions) == 1
+
+    clock.now += 0.5
+    transport.poll()
+    assert len(transport.sessions) == 1
+    clock.now += 0.5
+    transport.poll()
+    assert not transport.sessions
+    assert transport.memory_bytes == 0
+    assert transport.stats["timeouts"] == 1
+
+
+class SilentAfterBAMBus:
+    """BAM 알림 1개 후 아무 프레임도 보내지 않는 버스"""
+
+    def __init__(self, idle_polls):
+        self.frames = [can.Message(arbitration_id=BAM_ID, data=bam_announce(), timestamp=time.monotonic())]
+        self.idle_polls = idle_polls
+        self.finished = False
+
+    def recv(self, timeout=None):
+        if self.frames:
+            return self.frames.pop(0)
+        time.sleep(0.02)
+        self.idle_polls -= 1
+        self.finished = self.idle_polls <= 0
+        return None
+
+
+def test_receive_loop_expires_stalled_session():
+    system = DTGCANBusSystem()
+    system.transport = J1939TransportReassembler(bam_timeout=0.05, sweep_interval=0.01)
+    system.bus = SilentAfterBAMBus(idle_polls=10)
+    assert list(system.collect_can_data()) == []
+    assert system.transport.stats["timeouts"] == 1
+    assert not system.transport.sessions
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+차량별 최신 신호 스냅샷 저장소 테스트: 신호 나이 시간 영역, 통합기 읽기 경로
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "03_sensors_integration" / "can_bus"))
+sys.path.insert(0, str(ROOT / "01_core_engine" / "realtime_inference"))
+from signal_snapshot import SignalSnapshotStore
+from realtime_data_integration import RealTimeDataIntegrator
+
+
+class FakeClock:
+    def __init__(self, now=500.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def speed(value):
+    return [{"type": "vehicle_speed", "value": value}]
+
+
+def test_age_uses_receive_clock_not_frame_timestamp():
+    """재생 로그의 과거 타임스탬프여도 나이는 수신 후 경과 시간"""
+    clock = FakeClock()
+    store = SignalSnapshotStore(clock=clock)
+    store.update("V1", speed(62.5), timestamp=1_000_000.0)
+    clock.now += 2.0
+
+    value, stamp, age = store.get("V1", "vehicle_speed")
+    assert (value, stamp, age) == (62.5, 1_000_000.0, 2.0)
+    entry = store.snapshot("V1")["vehicle_speed"]
+    assert entry == {"value": 62.5, "timestamp": 1_000_000.0, "age": 2.0}
+    assert store.get("V1", "engine_speed") is None
+
+
+def test_integrator_tick_reads_snapshot_store():
+    clock = FakeClock()
+    store = SignalSnapshotStore(clock=clock)
+    store.update("V1", speed(80.0) + [{"type": "engine_speed", "value": 1500.0}], timestamp=10.0)
+    clock.now += 1.0
+    store.update("V1", speed(81.0), timestamp=11.0)
+    clock.now += 0.5
+
+    integrator = RealTimeDataIntegrator(snapshot_store=store, vehicle_id="V1")
+    data = asyncio.run(integrator.collect_sensor_data())
+    assert data["vehicle_speed"] == 81.0
+    assert data["engine_speed"] == 1500.0
+    assert data["max_signal_age"] == 1.5